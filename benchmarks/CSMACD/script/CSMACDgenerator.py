@@ -1,42 +1,353 @@
 #!/usr/bin/python
 # coding=utf8
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: generator of the CSMA/CD benchmark for any number of stations and any backoff bound, with either one location per backoff slot (original encoding) or discrete variables for the backoff slot (compact encoding)
+#
+# File contributors : Étienne André
+# Created           : 2007
+# Last modified     : 2026/10/18
+# ************************************************************
 
+import argparse
+import os
+import sys
 
-#import string
 
+# Size (in bytes) of the output buffer of the generated files
+OUTPUT_BUFFER_SIZE = 1 << 20
 
-def write_bc(station, bc, last):
+SEPARATOR = "(************************************************************)\n"
+
+
+# ************************************************************
+# COMMON PARTS
+# ************************************************************
+
+def header(title):
+	yield "(*******************************************************************************\n"
+	yield " *                                IMITATOR MODEL                               \n"
+	yield " * \n"
+	yield " * Title            : " + title + "\n"
+	yield " * Description      : Non-probabilistic model deduced from the probabilistic model in \"Symbolic Model Checking for Probabilistic Timed Automata\" (M. Kwiatkowska, G. Norman, J. Sproston and F. Wang., FORMATS/FTRTFT'2004). See figures on http://www.prismmodelchecker.org/casestudies/csma.php.\n"
+	yield " * Correctness      : Transmission completed\n"
+	yield " * Scalable         : yes\n"
+	yield " * Generated        : yes\n"
+	yield " * Categories       : Academic ; Industrial ; Protocol ; RTS\n"
+	yield " * Source           : http://www.prismmodelchecker.org/casestudies/csma.php\n"
+	yield " * bibkey           : KNSW07\n"
+	yield " * Author           : M. Kwiatkowska, G. Norman, J. Sproston and F. Wang\n"
+	yield " * Modeling         : M. Kwiatkowska, G. Norman, J. Sproston and F. Wang\n"
+	yield " * Input by         : Étienne André\n"
+	yield " * License          : Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)\n"
+	yield " * \n"
+	yield " * Created          : 2007\n"
+	yield " * Last modified    : 2026/10/18\n"
+	yield " * Model version    : \n"
+	yield " * \n"
+	yield " * IMITATOR version : 3.1\n"
+	yield " ******************************************************************************)\n"
+	yield "\n"
+
+
+def declarations(stations, compact):
+	yield "var\n"
+	yield "\n"
+	yield "(* Clocks *)\n"
+	for station in stations:
+		yield "\tx" + str(station) + ",\n"
+	yield "\ty,\n"
+	yield "\t\t: clock;\n"
+	yield "\n"
+	if compact:
+		yield "(* Discrete variables *)\n"
+		for station in stations:
+			yield "\tslot" + str(station) + ",    (* remaining backoff slots of station " + str(station) + " *)\n"
+			yield "\tslotmax" + str(station) + ", (* largest backoff slot of the current backoff level of station " + str(station) + ", i.e., 2^(bc+1) - 1 *)\n"
+		yield "\t\t: int;\n"
+		yield "\n"
+	yield "(* Parameters *)\n"
+	yield "\tlambda,    (* length of a message *)\n"
+	yield "\tsigma,     (* propagation time of a message *)\n"
+	yield "\ttimeslot,\n"
+	yield "\t\t: parameter;\n"
+	yield "\n"
+	yield "\n"
+	yield "\n"
+
+
+def medium(stations):
+	yield SEPARATOR
+	yield "  automaton medium\n"
+	yield SEPARATOR
+	yield "synclabs: " + ", ".join(["send" + str(station) for station in stations] + ["end" + str(station) for station in stations] + ["busy" + str(station) for station in stations] + ["cd"]) + ";\n"
+	yield "\n"
+	yield "loc Init: invariant True\n"
+	for station in stations:
+		yield "\t\twhen True sync send" + str(station) + " do {y := 0} goto Transmit;\n"
+	yield "\n"
+	yield "loc Transmit: invariant True\n"
+	for station in stations:
+		yield "\t\twhen y <= sigma sync send" + str(station) + " do {y := 0} goto Collide;\n"
+	yield "\n"
+	for station in stations:
+		yield "\t\twhen y >= sigma sync busy" + str(station) + " do {} goto Transmit;\n"
+	yield "\n"
+	for station in stations:
+		yield "\t\twhen True sync end" + str(station) + " do {y := 0} goto Init;\n"
+	yield "\n"
+	yield "loc Collide: invariant y <= sigma\n"
+	yield "\t\twhen y <= sigma sync cd do {y := 0} goto Init;\n"
+	yield "\n"
+	yield "end (* medium *)\n"
+	yield "\n"
+	yield "\n"
+	yield "\n"
+
+
+# Beginning of the automaton of a station, until its transmission location; collide_target is the target location of a collision (with its updates)
+# NOTE: only station 1 may wait before its first transmission
+def station_start(station, collide_target, cd_loops):
+	s = str(station)
+	yield SEPARATOR
+	yield "  automaton sender" + s + "\n"
+	yield SEPARATOR
+	yield "synclabs: send" + s + ", end" + s + ", busy" + s + ", cd, prob" + s + ";\n"
+	yield "\n"
+	if station == 1:
+		yield "loc Init1: invariant True\n"
+		yield "\twhen True sync send1 do {} goto Transmit1;\n"
+	else:
+		yield "loc Init" + s + ": invariant x" + s + " = 0\n"
+		yield "\twhen x" + s + " = 0 sync send" + s + " do {} goto Transmit" + s + ";\n"
+	yield cd_loops("Init" + s)
+	yield "\n"
+	yield "loc Transmit" + s + ": invariant x" + s + " <= lambda\n"
+	yield "\twhen x" + s + " = lambda sync end" + s + " do {x" + s + " := 0} goto Done" + s + ";\n"
+	yield "\twhen True sync cd do {" + collide_target + "\n"
+	yield "\n"
+
+
+def station_end(station, cd_loops):
+	s = str(station)
+	yield "loc Done" + s + ": invariant x" + s + " <= 0\n"
+	yield cd_loops("Done" + s)
+	yield "\t(* when True goto Done" + s + "; *)\n"
+	yield "\n"
+	yield "end (* sender" + s + " *)\n"
+	yield "\n"
+	yield "\n"
+	yield "\n"
+	yield "\n"
+
+
+# With more than two stations, the collision detection (cd) is also possible when a station does not transmit: as all automata declaring cd synchronize on it, the other stations must not block it
+def make_cd_loops(nb_stations):
+	if nb_stations <= 2:
+		return lambda location: ""
+	return lambda location: "\twhen True sync cd goto " + location + ";\n"
+
+
+# ************************************************************
+# ORIGINAL ENCODING: ONE LOCATION PER BACKOFF SLOT
+# ************************************************************
+
+def write_bc(station, bc, last, cd_loops):
 	bcmax = pow (2 , (bc+1))
-	print "\n(* Considering case with bc = " + str(bc) + ", hence from 0 to " + str(bcmax - 1) + " (i.e., 2^(bc+1) - 1) *)"
-	
-	print "loc Collide" + str(station) + "_" + str(bc) + ": invariant x" + str(station) + " <= 0"
+	s = str(station)
+	yield "(* Considering case with bc = " + str(bc) + ", hence from 0 to " + str(bcmax - 1) + " (i.e., 2^(bc+1) - 1) *)\n"
 
+	yield "loc Collide" + s + "_" + str(bc) + ": invariant x" + s + " <= 0\n"
 	for x in range(0, bcmax):
-		print "\twhen True sync prob" + str(station) + " goto Wait" + str(station) + "_" + str(bc) + "_" + str(x) + ";"
-		
+		yield "\twhen True sync prob" + s + " goto Wait" + s + "_" + str(bc) + "_" + str(x) + ";\n"
+	yield cd_loops("Collide" + s + "_" + str(bc))
+
 	next_bc = bc + 1
 	if last:
 		next_bc = bc
-	next_loc = "Collide" + str(station) + "_" + str(next_bc)
-	
+	next_loc = "Collide" + s + "_" + str(next_bc)
+
 	for x in range(0, bcmax):
-		print "\nloc Wait" + str(station) + "_" + str(bc) + "_" + str(x) + ": invariant x" + str(station) + " <= " + str(x) + " timeslot"
-		print "\twhen x" + str(station) + " = " + str(x) + " timeslot sync busy" + str(station) + " do {x" + str(station) + " := 0} goto " + next_loc + ";"
-		print "\twhen x" + str(station) + " = " + str(x) + " timeslot sync send" + str(station) + " do {x" + str(station) + " := 0} goto Transmit" + str(station) + ";"
+		yield "\n"
+		yield "loc Wait" + s + "_" + str(bc) + "_" + str(x) + ": invariant x" + s + " <= " + str(x) + " timeslot\n"
+		yield "\twhen x" + s + " = " + str(x) + " timeslot sync busy" + s + " do {x" + s + " := 0} goto " + next_loc + ";\n"
+		yield "\twhen x" + s + " = " + str(x) + " timeslot sync send" + s + " do {x" + s + " := 0} goto Transmit" + s + ";\n"
+		yield cd_loops("Wait" + s + "_" + str(bc) + "_" + str(x))
+	yield "\n"
 
 
-def write_program_for_station(station, bcmax):
-	print "\n\n\n(* STARTING AUTOMATED PROGRAM FOR CSMA/CD FOR STATION " + str(station) + " WITH BCMAX = " + str(bcmax) + " *)"
+def write_program_for_station(station, bcmax, cd_loops):
+	for chunk in station_start(station, "x" + str(station) + " := 0} goto Collide" + str(station) + "_1;", cd_loops):
+		yield chunk
+	yield "(* STARTING AUTOMATED PROGRAM FOR CSMA/CD FOR STATION " + str(station) + " WITH BCMAX = " + str(bcmax) + " *)\n"
+	yield "\n"
 	# All cases but the last one
 	for bc in range(1, bcmax):
-		write_bc(station, bc, False)
+		for chunk in write_bc(station, bc, False, cd_loops):
+			yield chunk
 	# Last case
-	write_bc(station, bcmax, True)
-	print "\n(* END OF AUTOMATED PROGRAM FOR CSMA/CD *)\n"
+	for chunk in write_bc(station, bcmax, True, cd_loops):
+		yield chunk
+	yield "(* END OF AUTOMATED PROGRAM FOR CSMA/CD *)\n"
+	yield "\n"
+	for chunk in station_end(station, cd_loops):
+		yield chunk
+
+
+# ************************************************************
+# COMPACT ENCODING: DISCRETE VARIABLES FOR THE BACKOFF SLOT
+# ************************************************************
+
+# After a collision, the station draws its backoff slot by incrementing slot (from 0 to slotmax) in zero time, then waits slot timeslots one by one
+# NOTE: Ready is the location reached after the backoff, where the original encoding reaches x = slot timeslot
+def write_compact_program_for_station(station, bcmax, cd_loops):
+	s = str(station)
+	x = "x" + s
+	slot = "slot" + s
+	slotmax = "slotmax" + s
+	largest_slotmax = pow(2, bcmax + 1) - 1
+	for chunk in station_start(station, x + " := 0, " + slot + " := 0, " + slotmax + " := 3} goto Collide" + s + ";", cd_loops):
+		yield chunk
+	yield "(* Backoff with bc from 1 to " + str(bcmax) + ", hence from 0 to " + str(largest_slotmax) + " (i.e., 2^(bc+1) - 1) slots *)\n"
+	yield "loc Collide" + s + ": invariant " + x + " <= 0\n"
+	yield "\twhen " + slot + " < " + slotmax + " sync prob" + s + " do {" + slot + " := " + slot + " + 1} goto Collide" + s + ";\n"
+	yield "\twhen " + slot + " = 0 sync prob" + s + " goto Ready" + s + ";\n"
+	yield "\twhen " + slot + " > 0 sync prob" + s + " goto Wait" + s + ";\n"
+	yield cd_loops("Collide" + s)
+	yield "\n"
+	yield "loc Wait" + s + ": invariant " + x + " <= timeslot\n"
+	yield "\twhen " + x + " = timeslot & " + slot + " > 1 do {" + x + " := 0, " + slot + " := " + slot + " - 1} goto Wait" + s + ";\n"
+	yield "\twhen " + x + " = timeslot & " + slot + " = 1 do {" + x + " := 0, " + slot + " := 0} goto Ready" + s + ";\n"
+	yield cd_loops("Wait" + s)
+	yield "\n"
+	yield "loc Ready" + s + ": invariant " + x + " <= 0\n"
+	yield "\twhen " + x + " = 0 & " + slotmax + " < " + str(largest_slotmax) + " sync busy" + s + " do {" + x + " := 0, " + slotmax + " := 2 * " + slotmax + " + 1} goto Collide" + s + ";\n"
+	yield "\twhen " + x + " = 0 & " + slotmax + " = " + str(largest_slotmax) + " sync busy" + s + " do {" + x + " := 0} goto Collide" + s + ";\n"
+	yield "\twhen " + x + " = 0 sync send" + s + " do {" + x + " := 0} goto Transmit" + s + ";\n"
+	yield cd_loops("Ready" + s)
+	yield "\n"
+	for chunk in station_end(station, cd_loops):
+		yield chunk
+
+
+# ************************************************************
+# MODEL AND PROPERTY
+# ************************************************************
+
+def model_name(nb_stations, bcmax, compact):
+	name = "CSMACD-bc" + str(bcmax)
+	if nb_stations != 2:
+		name = "CSMACD-n" + str(nb_stations) + "-bc" + str(bcmax)
+	if compact:
+		name += "-compact"
+	return name
+
+
+# The text of the model, as a sequence of strings
+def csmacd_model(nb_stations, bcmax, compact):
+	stations = range(1, nb_stations + 1)
+	cd_loops = make_cd_loops(nb_stations)
+	for part in [header(model_name(nb_stations, bcmax, compact)), declarations(stations, compact), medium(stations)]:
+		for chunk in part:
+			yield chunk
+
+	for station in stations:
+		station_program = write_compact_program_for_station if compact else write_program_for_station
+		for chunk in station_program(station, bcmax, cd_loops):
+			yield chunk
+
+	yield SEPARATOR
+	yield "(* Initial state *)\n"
+	yield SEPARATOR
+	yield "\n"
+	yield "init := {\n"
+	yield "\n"
+	yield "\tdiscrete =\n"
+	yield "\t\t(* Initial location *)\n"
+	yield "\t\tloc[medium]  := Init,\n"
+	for station in stations:
+		yield "\t\tloc[sender" + str(station) + "] := Init" + str(station) + ",\n"
+	if compact:
+		yield "\n"
+		yield "\t\t(* Initial discrete variables *)\n"
+		for station in stations:
+			yield "\t\tslot" + str(station) + " := 0,\n"
+			yield "\t\tslotmax" + str(station) + " := 3,\n"
+	yield "\t;\n"
+	yield "\n"
+	yield "\tcontinuous =\n"
+	yield "\t\t(* Initial clock constraints *)\n"
+	for station in stations:
+		yield "\t\t& x" + str(station) + " = 0\n"
+	yield "\t\t& y  = 0\n"
+	yield "\n"
+	yield "\t\t(* Parameter constraints *)\n"
+	yield "\t\t& lambda >=0\n"
+	yield "\t\t& sigma >= 0\n"
+	yield "\t\t& timeslot >= 0\n"
+	yield "\t;\n"
+	yield "}\n"
+	yield "\n"
+	yield "\n"
+	yield SEPARATOR
+	yield "(* The end *)\n"
+	yield SEPARATOR
+	yield "end\n"
+
+
+# Reachability of the end of all transmissions (as in CSMACD-EF.imiprop)
+def csmacd_property(nb_stations):
+	yield SEPARATOR
+	yield "(* Property specification *)\n"
+	yield SEPARATOR
+	yield "\n"
+	yield "property := #synth EF(" + " & ".join("loc[sender" + str(station) + "] = Done" + str(station) for station in range(1, nb_stations + 1)) + ");\n"
+
+
+def write_chunks(file_name, chunks):
+	with open(file_name, "w", OUTPUT_BUFFER_SIZE) as f:
+		f.writelines(chunks)
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def main():
+	parser = argparse.ArgumentParser(description="Generates the CSMA/CD benchmark (model and EF property)")
+	parser.add_argument("-n", "--stations", type=int, default=2, help="Number of stations (default: 2)")
+	parser.add_argument("-b", "--bcmax", type=int, default=10, help="Backoff bound, i.e., largest backoff level bc, with 2^(bc+1) slots (default: 10)")
+	parser.add_argument("--compact", action="store_true", help="Encode the backoff slot with discrete variables instead of one location per slot")
+	parser.add_argument("-o", "--output-dir", default=None, help="Write <name>.imi and <name>.imiprop in this directory (default: print the model)")
+	parser.add_argument("--series", action="store_true", help="Generate the models for 2 to the number of stations, each with backoff bounds from 1 to the backoff bound (requires --output-dir)")
+	args = parser.parse_args()
+
+	if args.stations < 1 or args.bcmax < 1:
+		parser.error("the number of stations and the backoff bound must be at least 1")
+	if args.series and args.output_dir is None:
+		parser.error("--series requires --output-dir")
+
+	if args.output_dir is None:
+		sys.stdout.writelines(csmacd_model(args.stations, args.bcmax, args.compact))
+		return
 
+	if not os.path.isdir(args.output_dir):
+		os.makedirs(args.output_dir)
+	if args.series:
+		configurations = [(nb_stations, bcmax) for nb_stations in range(min(2, args.stations), args.stations + 1) for bcmax in range(1, args.bcmax + 1)]
+	else:
+		configurations = [(args.stations, args.bcmax)]
+	for nb_stations, bcmax in configurations:
+		name = os.path.join(args.output_dir, model_name(nb_stations, bcmax, args.compact))
+		write_chunks(name + ".imi", csmacd_model(nb_stations, bcmax, args.compact))
+		write_chunks(name + ".imiprop", csmacd_property(nb_stations))
+		print(name + ".imi")
 
-def write_program(bcmax):
-	write_program_for_station(1, bcmax)
-	write_program_for_station(2, bcmax)
 
-write_program(10)
+if __name__ == "__main__":
+	main()
@@ -7,25 +7,35 @@
  # Fischer mutual exclusion protocol (parametric timed version with n processes)
  #
  # Description     : Generator for Fischer with n processes. This model has no variable (the global variable is simulated with an untimed PTA); however, the reachability condition is expressed by a global variable that counts the number of processes in the critical sections. If more than n, the observer is going to a special location.
+ #                   With --linear, the global variable is a shared int variable instead of an untimed PTA, so that the model grows linearly with n.
  # Correctness     : No more than 'n' (2, but can be changed) processes in critical section
  # Source          : "SAT-based Unbounded Model Checking of Timed Automata", Fundamatica Informatica 85(1-4): 425-440 (2008), Figure 1.
  # Authors         : Wojciech Penczek, Maciej Szreter
  # Script authors  : Michal Knapick, Étienne André
  #
  # Created         : 2015/05/15
- # Last modified   : 2021/09/01
+ # Last modified   : 2026/10/18
  #
  # IMITATOR version: 3.1
  ############################################################
 
+from __future__ import print_function
+
+import argparse
+import os
 import sys
 
 
-def getVars(n):
+def getVars(n, linear=False):
     print("var")
     print("\t"+", ".join(["x"+str(i) for i in range(1,n+1)]))
     print("\t: clock;\n")
-    print("\tnb\n\t: int;\n")
+    if linear:
+        print("\tnb, (* number of processes in critical section *)")
+        print("\tid (* global variable: 0, or the process that set it *)")
+        print("\t: int;\n")
+    else:
+        print("\tnb\n\t: int;\n")
     print("\tdelta, Delta\n\t: parameter;\n")
 
 
@@ -51,6 +61,28 @@ end (* automaton process{0} *)\n"""
     print(autStr.format(i))
 
 
+# Process reading and writing the shared variable id directly (linear encoding): the untimed automaton "variable" is not needed
+def getLinearProcess(i):
+
+    autStr = """automaton process{0}
+
+\tloc idle{0}: invariant True
+	\twhen id = 0 do {{x{0} := 0}} goto trying{0};
+
+\tloc trying{0}: invariant True
+	\twhen x{0} < delta do {{x{0} := 0, id := {0}}} goto waiting{0};
+
+\tloc waiting{0}: invariant True
+	\twhen x{0} > Delta & id = {0} do {{nb := nb + 1}} goto critical{0};
+
+\tloc critical{0}: invariant True
+	\twhen id = {0} do {{nb := nb - 1, id := 0}} goto idle{0};
+
+end (* automaton process{0} *)\n"""
+
+    print(autStr.format(i))
+
+
 def getVar(n):
 
     templ = "when True sync {0}{1} do {{}} goto Val{2};"
@@ -80,7 +112,7 @@ def getVar(n):
     print("end")
 
 
-def getInit(n):
+def getInit(n, linear=False):
     print("\nautomaton observer")
 
     print("\n\tloc obs_OK: invariant True")
@@ -94,9 +126,12 @@ def getInit(n):
     print("\tdiscrete =")
     for lp in ["\t\tloc[process{0}] := idle{0},".format(i) for i in range(1, n+1)]:
         print(lp)
-    print("\t\tloc[variable] := Val0,")
+    if not linear:
+        print("\t\tloc[variable] := Val0,")
     print("\t\tloc[observer] := obs_OK,")
     print("\t\tnb := 0,")
+    if linear:
+        print("\t\tid := 0,")
 
     print("\t;")
     print("\n\tcontinuous =")
@@ -115,20 +150,58 @@ def getInit(n):
     print ("end")
 
 
-if __name__ == "__main__":
+def getModel(n, linear=False, generator_name="fischer_novar_gen.py"):
+    print("(*** WARNING! This IMITATOR model was automatically generated by " + generator_name + " ***)\n")
 
-    if len(sys.argv) < 2:
-        print("Usage simpMutexGen.py NoOfProcs")
+    getVars(n, linear)
 
-    NoOfProcs = int(sys.argv[1])
+    for i in range(1, n + 1):
+        if linear:
+            getLinearProcess(i)
+        else:
+            getProcess(i)
+
+    if not linear:
+        getVar(n)
+
+    getInit(n, linear)
 
-    print("(*** WARNING! This IMITATOR model was automatically generated by " + sys.argv[0] + " ***)\n")
 
-    getVars(NoOfProcs)
+def getProperty():
+    print("property := #synth AGnot(loc[observer] = obs_BAD);")
 
-    for i in range(1, NoOfProcs + 1):
-        getProcess(i)
 
-    getVar(NoOfProcs)
+# Print into a file instead of the standard output
+def printToFile(file_name, function, *args):
+    orig_stdout = sys.stdout
+    with open(file_name, "w") as f:
+        sys.stdout = f
+        try:
+            function(*args)
+        finally:
+            sys.stdout = orig_stdout
+
+
+if __name__ == "__main__":
 
-    getInit(NoOfProcs)
+    parser = argparse.ArgumentParser(description="Generates the Fischer mutual exclusion protocol with n processes")
+    parser.add_argument("NoOfProcs", type=int, help="Number of processes (largest number of processes with --series)")
+    parser.add_argument("--linear", action="store_true", help="Encode the global variable with a shared int variable instead of an untimed automaton (linear-size model)")
+    parser.add_argument("--series", action="store_true", help="Write the models and properties (.imi, .imiprop) for 2 to NoOfProcs processes")
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory of the series (default: current directory)")
+    args = parser.parse_args()
+
+    generator_name = os.path.basename(sys.argv[0])
+
+    if not args.series:
+        getModel(args.NoOfProcs, args.linear, generator_name)
+        sys.exit(0)
+
+    if not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+    prefix = "FischerPS08-linear-" if args.linear else "FischerPS08-"
+    for n in range(2, args.NoOfProcs + 1):
+        file_name = os.path.join(args.output_dir, prefix + str(n))
+        printToFile(file_name + ".imi", getModel, n, args.linear, generator_name)
+        printToFile(file_name + ".imiprop", getProperty)
+        print(file_name + ".imi")
@@ -0,0 +1,360 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: unified front-end for the benchmark generators: registry of scalable families with typed parameters, deterministic file names, and a manifest of the generated (model, property, size) triples
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import random
+import sys
+
+# Path to the benchmarks directory
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+# Path to the scripts directory
+SCRIPTS_PATH = os.path.join(os.path.dirname(BENCHMARKS_PATH), 'scripts')
+
+sys.path.insert(0, SCRIPTS_PATH)
+import imitator_utilities as iu
+
+# Size (in bytes) of the output buffer of the generated files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Default name of the manifest in the output directory
+MANIFEST_FILE = 'manifest.json'
+
+
+# NOTE: the generators are loaded once, as all instances of a family use the same one
+@functools.lru_cache(maxsize=None)
+def load_generator(path, module_name):
+    return iu.load_script(path, module_name, BENCHMARKS_PATH)
+
+
+@functools.lru_cache(maxsize=None)
+def load_script(file_name, module_name):
+    return iu.load_script(file_name, module_name)
+
+
+# ************************************************************
+# PARAMETERS
+# ************************************************************
+
+# A typed parameter of a family
+#   choices: allowed values (None for any value of the kind)
+class Parameter:
+    def __init__(self, name, kind, default, help, choices=None):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.help = help
+        self.choices = choices
+
+    def parse_value(self, text):
+        if self.kind is bool:
+            if text.lower() in ('true', 'yes', '1'):
+                return True
+            if text.lower() in ('false', 'no', '0'):
+                return False
+            raise ValueError('expected true or false for ' + self.name + ', got "' + text + '"')
+        try:
+            value = self.kind(text)
+        except ValueError:
+            raise ValueError('expected a value of type ' + self.kind.__name__ + ' for ' + self.name + ', got "' + text + '"')
+        if self.choices is not None and value not in self.choices:
+            raise ValueError('expected one of ' + ', '.join(self.choices) + ' for ' + self.name + ', got "' + text + '"')
+        return value
+
+    # Parse a list of values "a,b,c", where each int value can also be a range "min..max"
+    def parse_values(self, text):
+        values = []
+        for item in text.split(','):
+            if self.kind is int and '..' in item:
+                low, high = item.split('..', 1)
+                values.extend(range(self.parse_value(low), self.parse_value(high) + 1))
+            else:
+                values.append(self.parse_value(item))
+        return values
+
+    # Deterministic name fragment for a value
+    def name_fragment(self, value):
+        if self.kind is bool:
+            return self.name if value else ''
+        return self.name + str(value)
+
+
+# A scalable family of benchmarks
+#   parameters: list of Parameter
+#   size      : name of the parameter measuring the size of an instance (the x-axis of scaling studies)
+#   generate  : function (valuation dictionary) => (sequence of strings of the model, sequence of strings of the property)
+#   check     : function (valuation dictionary) => list of errors (checked before generating any file)
+class Family:
+    def __init__(self, name, description, parameters, size, generate, check):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.size = size
+        self.generate = generate
+        self.check = check
+
+    def parameter(self, name):
+        for parameter in self.parameters:
+            if parameter.name == name:
+                return parameter
+        raise KeyError(name)
+
+    # Name of an instance: the family followed by the (non-false) parameters in their declaration order
+    def instance_name(self, valuation):
+        fragments = [parameter.name_fragment(valuation[parameter.name]) for parameter in self.parameters]
+        return '-'.join([self.name] + [fragment for fragment in fragments if fragment])
+
+
+# ************************************************************
+# FAMILIES
+# ************************************************************
+
+def generate_csmacd(valuation):
+    generator = load_generator(os.path.join('CSMACD', 'script', 'CSMACDgenerator.py'), 'CSMACDgenerator')
+    return (generator.csmacd_model(valuation['stations'], valuation['bcmax'], valuation['compact']),
+            generator.csmacd_property(valuation['stations']))
+
+
+def check_csmacd(valuation):
+    errors = []
+    for name in ['stations', 'bcmax']:
+        if valuation[name] < 1:
+            errors.append(name + ' must be at least 1')
+    return errors
+
+
+def generate_fischer(valuation):
+    generator = load_generator(os.path.join('Fischer', 'FischerPS08', 'script', 'fischer_novar_gen.py'), 'fischer_novar_gen')
+    # NOTE: this generator prints the model
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        generator.getModel(valuation['processes'], valuation['linear'])
+    property_output = io.StringIO()
+    with contextlib.redirect_stdout(property_output):
+        generator.getProperty()
+    return [output.getvalue()], [property_output.getvalue()]
+
+
+def check_fischer(valuation):
+    return ['processes must be at least 1'] if valuation['processes'] < 1 else []
+
+
+def generate_scheduling(valuation):
+    json_parser = load_script('json-parser-both.py', 'json_parser_both')
+    taskset_generator = load_script('taskset-generator.py', 'taskset_generator')
+    rng = random.Random(valuation['seed'])
+    nb_tasks = valuation['tasks']
+    task_set = taskset_generator.generate_task_set(rng, valuation['cpus'], valuation['nonpreemptive'], valuation['pipelines'], (nb_tasks, nb_tasks), valuation['utilization'], (10, 1000))
+    cpu_list = json_parser.create_cpus(task_set['CPUS'])
+    pipeline_list = json_parser.create_pipelines(task_set['PIPELINES'])
+    return (json_parser.imitator_model(cpu_list, pipeline_list, json_parser.default_tid_list(pipeline_list), valuation['prune']),
+            [json_parser.SCHEDULABILITY_PROPERTY])
+
+
+def check_scheduling(valuation):
+    errors = []
+    for name in ['pipelines', 'tasks', 'cpus']:
+        if valuation[name] < 1:
+            errors.append(name + ' must be at least 1')
+    if not 0 <= valuation['nonpreemptive'] <= valuation['cpus']:
+        errors.append('nonpreemptive must be between 0 and cpus')
+    if valuation['utilization'] <= 0:
+        errors.append('utilization must be positive')
+    return errors
+
+
+def random_shape(valuation):
+    generator = load_generator('random_nipta.py', 'random_nipta')
+    return generator, generator.Shape(valuation['automata'], valuation['clocks'], valuation['parameters'], valuation['discretes'], valuation['locations'], valuation['transitions'], valuation['actions'], valuation['guard_density'], valuation['invariant_density'])
+
+
+def generate_random(valuation):
+    generator, shape = random_shape(valuation)
+    return (generator.random_model(shape, valuation['seed']),
+            generator.random_property(shape, valuation['property']))
+
+
+def check_random(valuation):
+    return random_shape(valuation)[1].check()
+
+
+FAMILIES = [
+    Family('csmacd', 'CSMA/CD protocol (KNSW07)', [
+        Parameter('stations', int, 2, 'number of stations'),
+        Parameter('bcmax', int, 1, 'backoff bound'),
+        Parameter('compact', bool, False, 'discrete variables for the backoff slot'),
+    ], 'bcmax', generate_csmacd, check_csmacd),
+    Family('fischer', 'Fischer mutual exclusion protocol (PS08)', [
+        Parameter('processes', int, 2, 'number of processes'),
+        Parameter('linear', bool, False, 'shared int variable instead of an untimed automaton'),
+    ], 'processes', generate_fischer, check_fischer),
+    Family('scheduling', 'random task sets with parametric WCETs (taskset-generator.py, json-parser-both.py)', [
+        Parameter('pipelines', int, 2, 'number of pipelines'),
+        Parameter('tasks', int, 2, 'number of tasks per pipeline'),
+        Parameter('cpus', int, 2, 'number of CPUs'),
+        Parameter('nonpreemptive', int, 0, 'number of non-preemptive CPUs'),
+        Parameter('utilization', float, 0.5, 'utilization of each CPU'),
+        Parameter('seed', int, 0, 'random seed'),
+        Parameter('prune', bool, False, 'only the reachable ready sets'),
+    ], 'pipelines', generate_scheduling, check_scheduling),
+    Family('random', 'random networks of parametric timed automata (random_nipta.py)', [
+        Parameter('automata', int, 2, 'number of automata'),
+        Parameter('clocks', int, 2, 'number of clocks'),
+        Parameter('parameters', int, 2, 'number of parameters'),
+        Parameter('discretes', int, 0, 'number of discrete variables'),
+        Parameter('locations', int, 4, 'number of locations per automaton'),
+        Parameter('transitions', int, 6, 'number of transitions per automaton'),
+        Parameter('actions', int, 2, 'number of synchronization actions'),
+        Parameter('guard_density', float, 0.3, 'probability for each variable to appear in a guard'),
+        Parameter('invariant_density', float, 0.3, 'probability for a location to have an invariant'),
+        Parameter('seed', int, 0, 'random seed'),
+        Parameter('property', str, 'EF', 'property: EF, AGnot or Cycle', ['EF', 'AGnot', 'Cycle']),
+    ], 'locations', generate_random, check_random),
+]
+
+REGISTRY = {family.name: family for family in FAMILIES}
+
+
+# ************************************************************
+# GENERATION
+# ************************************************************
+
+# All valuations of the family for the given "name=values" assignments (cartesian product, in a deterministic order)
+def valuations(family, assignments):
+    values = {parameter.name: [parameter.default] for parameter in family.parameters}
+    for assignment in assignments:
+        if '=' not in assignment:
+            raise ValueError('expected name=values, got "' + assignment + '"')
+        name, text = assignment.split('=', 1)
+        try:
+            parameter = family.parameter(name)
+        except KeyError:
+            raise ValueError('unknown parameter "' + name + '" for family ' + family.name)
+        values[name] = parameter.parse_values(text)
+    names = [parameter.name for parameter in family.parameters]
+    return [dict(zip(names, combination)) for combination in itertools.product(*[values[name] for name in names])]
+
+
+def write_chunks(file_name, chunks):
+    with open(file_name, 'w', OUTPUT_BUFFER_SIZE) as f:
+        f.writelines(chunks)
+
+
+# Generate one instance; returns its entry in the manifest
+# NOTE: size is the parameter measuring the size of the instance (default: the one of the family)
+def generate_instance(family, valuation, output_dir, size=None):
+    size = size or family.size
+    name = family.instance_name(valuation)
+    model_file = os.path.join(output_dir, name + '.imi')
+    property_file = os.path.join(output_dir, name + '.imiprop')
+    model_chunks, property_chunks = family.generate(valuation)
+    write_chunks(model_file, model_chunks)
+    write_chunks(property_file, property_chunks)
+    return {
+        'family': family.name,
+        'name': name,
+        'model': os.path.relpath(model_file, output_dir),
+        'property': os.path.relpath(property_file, output_dir),
+        'size_parameter': size,
+        'size': valuation[size],
+        'parameters': valuation,
+        'model_bytes': os.path.getsize(model_file),
+    }
+
+
+# Add the entries to the manifest of the output directory (an entry with the same name is replaced)
+def update_manifest(manifest_file, entries):
+    manifest = []
+    if os.path.isfile(manifest_file):
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    names = {entry['name'] for entry in entries}
+    manifest = [entry for entry in manifest if entry['name'] not in names] + entries
+    manifest.sort(key=lambda entry: (entry['family'], entry['name']))
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+
+# Read a manifest; the paths of the model and property are made absolute
+def load_manifest(manifest_file):
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    for entry in manifest:
+        entry['model'] = os.path.join(base_dir, entry['model'])
+        entry['property'] = os.path.join(base_dir, entry['property'])
+    return manifest
+
+
+def print_families():
+    for family in FAMILIES:
+        print(family.name + ': ' + family.description + ' (size: ' + family.size + ')')
+        for parameter in family.parameters:
+            print('    %s (%s, default: %s): %s' % (parameter.name, parameter.kind.__name__, parameter.default, parameter.help))
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Generates scalable benchmark families (models, properties and manifest)', epilog='Example: generate.py fischer processes=2..8 linear=true,false -o fischer-series')
+    parser.add_argument('family', nargs='?', help='Family to generate (see --list)')
+    parser.add_argument('assignments', nargs='*', help='Parameter values, as name=v1,v2,... (int ranges as name=min..max)')
+    parser.add_argument('-o', '--output-dir', default='generated', help='Output directory (default: generated)')
+    parser.add_argument('--size', default=None, help='Parameter measuring the size of the instances in the manifest (default: the one of the family)')
+    parser.add_argument('--list', action='store_true', help='List the families and their parameters')
+    args = parser.parse_args()
+
+    if args.list or args.family is None:
+        print_families()
+        return
+
+    if args.family not in REGISTRY:
+        parser.error('unknown family "' + args.family + '" (known: ' + ', '.join(sorted(REGISTRY)) + ')')
+    family = REGISTRY[args.family]
+    try:
+        instances = valuations(family, args.assignments)
+    except ValueError as e:
+        parser.error(str(e))
+    # NOTE: all the valuations are checked before writing any file
+    errors = []
+    for valuation in instances:
+        errors += [error for error in family.check(valuation) if error not in errors]
+    if errors:
+        parser.error('; '.join(errors))
+    if args.size is not None and args.size not in [parameter.name for parameter in family.parameters]:
+        parser.error('unknown parameter "' + args.size + '" for family ' + family.name)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    entries = []
+    for valuation in instances:
+        entry = generate_instance(family, valuation, args.output_dir, args.size)
+        print('%s (%d bytes)' % (entry['model'], entry['model_bytes']))
+        entries.append(entry)
+
+    manifest_file = os.path.join(args.output_dir, MANIFEST_FILE)
+    update_manifest(manifest_file, entries)
+    print('%d instance(s); manifest: %s' % (len(entries), manifest_file))
+
+
+if __name__ == '__main__':
+    __main__()
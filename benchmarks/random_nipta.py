@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: generator of random networks of parametric timed automata (models and EF, AGnot and Cycle properties), with a controlled number of automata, clocks, parameters, discrete variables, locations, transitions and density of guards and invariants
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import os
+import random
+
+# Size (in bytes) of the output buffer of the generated files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+SEPARATOR = '(************************************************************)\n'
+
+# Supported properties
+PROPERTIES = ['EF', 'AGnot', 'Cycle']
+
+# Comparison operators of the guards
+GUARD_OPERATORS = ['<', '<=', '>=', '>']
+
+
+# ************************************************************
+# STRUCTURE
+# ************************************************************
+
+# Shape of a random network; the densities are probabilities (between 0 and 1)
+#   guard_density    : probability for each clock (resp. discrete variable) to be constrained in the guard of a transition
+#   invariant_density: probability for a location to have a (non-trivial) invariant
+#   reset_density    : probability for each clock to be reset by a transition
+#   sync_density     : probability for a transition to be labeled by an action shared by the automata
+class Shape:
+    def __init__(self, automata=2, clocks=2, parameters=2, discretes=0, locations=4, transitions=6, actions=2, guard_density=0.3, invariant_density=0.3, reset_density=0.3, sync_density=0.2, max_constant=10):
+        self.automata = automata
+        self.clocks = clocks
+        self.parameters = parameters
+        self.discretes = discretes
+        self.locations = locations
+        self.transitions = transitions
+        self.actions = actions
+        self.guard_density = guard_density
+        self.invariant_density = invariant_density
+        self.reset_density = reset_density
+        self.sync_density = sync_density
+        self.max_constant = max_constant
+
+    def check(self):
+        errors = []
+        for name in ['automata', 'clocks', 'locations', 'actions', 'max_constant']:
+            if getattr(self, name) < 1:
+                errors.append(name + ' must be at least 1')
+        for name in ['parameters', 'discretes', 'transitions']:
+            if getattr(self, name) < 0:
+                errors.append(name + ' must be non-negative')
+        for name in ['guard_density', 'invariant_density', 'reset_density', 'sync_density']:
+            if not 0 <= getattr(self, name) <= 1:
+                errors.append(name + ' must be between 0 and 1')
+        return errors
+
+
+def clock_name(k):
+    return 'x' + str(k)
+
+
+def parameter_name(k):
+    return 'p' + str(k)
+
+
+def discrete_name(k):
+    return 'd' + str(k)
+
+
+def location_name(automaton, k):
+    return 'l' + str(automaton) + '_' + str(k)
+
+
+def automaton_name(automaton):
+    return 'pta' + str(automaton)
+
+
+# Bound compared to a clock: a constant, a parameter, or a parameter plus a constant
+def random_bound(rng, shape, minimum=0):
+    constant = rng.randint(minimum, shape.max_constant)
+    if shape.parameters == 0 or rng.random() < 1.0 / 3:
+        return str(constant)
+    parameter = parameter_name(rng.randint(1, shape.parameters))
+    if rng.random() < 0.5:
+        return parameter
+    return parameter + ' + ' + str(constant)
+
+
+def random_transition(rng, shape, source, target):
+    guard = []
+    updates = []
+    for k in range(1, shape.clocks + 1):
+        if rng.random() < shape.guard_density:
+            guard.append(clock_name(k) + ' ' + rng.choice(GUARD_OPERATORS) + ' ' + random_bound(rng, shape))
+    for k in range(1, shape.discretes + 1):
+        if rng.random() < shape.guard_density:
+            # NOTE: the discrete variables remain between 0 and max_constant, so that they do not make the state space infinite
+            if rng.random() < 0.5:
+                guard.append(discrete_name(k) + ' < ' + str(shape.max_constant))
+                updates.append(discrete_name(k) + ' := ' + discrete_name(k) + ' + 1')
+            else:
+                guard.append(discrete_name(k) + ' >= ' + str(rng.randint(0, shape.max_constant)))
+                updates.append(discrete_name(k) + ' := 0')
+    for k in range(1, shape.clocks + 1):
+        if rng.random() < shape.reset_density:
+            updates.append(clock_name(k) + ' := 0')
+    action = None
+    if rng.random() < shape.sync_density:
+        action = 'a' + str(rng.randint(1, shape.actions))
+    return {'source': source, 'target': target, 'guard': guard, 'updates': updates, 'action': action}
+
+
+# Random network (list of automata, each with its invariants and transitions)
+# NOTE: the first transitions of each automaton form a path through its locations, so that all locations are syntactically reachable
+def random_network(rng, shape):
+    network = []
+    for automaton in range(1, shape.automata + 1):
+        invariants = []
+        for _ in range(shape.locations):
+            if rng.random() < shape.invariant_density:
+                invariants.append(clock_name(rng.randint(1, shape.clocks)) + ' <= ' + random_bound(rng, shape, 1))
+            else:
+                invariants.append(None)
+        transitions = []
+        for k in range(shape.transitions):
+            if k < shape.locations - 1:
+                source, target = k, k + 1
+            else:
+                source, target = rng.randrange(shape.locations), rng.randrange(shape.locations)
+            transitions.append(random_transition(rng, shape, source, target))
+        network.append({'invariants': invariants, 'transitions': transitions})
+    return network
+
+
+# ************************************************************
+# PRINTING
+# ************************************************************
+
+def header(title, description):
+    yield '(************************************************************\n'
+    yield ' *                                IMITATOR MODEL\n'
+    yield ' *\n'
+    yield ' * Title            : ' + title + '\n'
+    yield ' * Description      : ' + description + '\n'
+    yield ' * Correctness      : random\n'
+    yield ' * Scalable         : yes\n'
+    yield ' * Generated        : yes\n'
+    yield ' * Categories       : Toy\n'
+    yield ' * Source           : random_nipta.py\n'
+    yield ' * License          : Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)\n'
+    yield ' *\n'
+    yield ' * IMITATOR version : 3.3\n'
+    yield ' ************************************************************)\n'
+    yield '\n'
+
+
+def declarations(shape):
+    yield 'var\n'
+    yield '\n'
+    yield '(* Clocks *)\n'
+    for k in range(1, shape.clocks + 1):
+        yield '\t' + clock_name(k) + ',\n'
+    yield '\t\t: clock;\n'
+    yield '\n'
+    if shape.discretes > 0:
+        yield '(* Discrete *)\n'
+        for k in range(1, shape.discretes + 1):
+            yield '\t' + discrete_name(k) + ',\n'
+        yield '\t\t: int;\n'
+        yield '\n'
+    if shape.parameters > 0:
+        yield '(* Parameters *)\n'
+        for k in range(1, shape.parameters + 1):
+            yield '\t' + parameter_name(k) + ',\n'
+        yield '\t\t: parameter;\n'
+        yield '\n'
+    yield '\n'
+    yield '\n'
+
+
+def automaton_text(automaton, description):
+    name = automaton_name(automaton)
+    actions = sorted(set(transition['action'] for transition in description['transitions'] if transition['action'] is not None), key=lambda action: int(action[1:]))
+    yield SEPARATOR
+    yield '  automaton ' + name + '\n'
+    yield SEPARATOR
+    if actions:
+        yield 'synclabs: ' + ', '.join(actions) + ';\n'
+    yield '\n'
+    outgoing = {}
+    for transition in description['transitions']:
+        outgoing.setdefault(transition['source'], []).append(transition)
+    for k, invariant in enumerate(description['invariants']):
+        yield 'loc ' + location_name(automaton, k) + ': invariant ' + (invariant or 'True') + '\n'
+        for transition in outgoing.get(k, []):
+            text = '\twhen ' + (' & '.join(transition['guard']) or 'True')
+            if transition['action'] is not None:
+                text += ' sync ' + transition['action']
+            text += ' do {' + ', '.join(transition['updates']) + '} goto ' + location_name(automaton, transition['target']) + ';\n'
+            yield text
+        yield '\n'
+    yield 'end (* ' + name + ' *)\n'
+    yield '\n'
+    yield '\n'
+    yield '\n'
+
+
+def initial_state(shape):
+    yield SEPARATOR
+    yield '(* Initial state *)\n'
+    yield SEPARATOR
+    yield '\n'
+    yield 'init := {\n'
+    yield '\n'
+    yield '\tdiscrete =\n'
+    yield '\t\t(* Initial location *)\n'
+    for automaton in range(1, shape.automata + 1):
+        yield '\t\tloc[' + automaton_name(automaton) + '] := ' + location_name(automaton, 0) + ',\n'
+    if shape.discretes > 0:
+        yield '\n'
+        yield '\t\t(* Initial discrete variables assignments *)\n'
+        for k in range(1, shape.discretes + 1):
+            yield '\t\t' + discrete_name(k) + ' := 0,\n'
+    yield '\t;\n'
+    yield '\n'
+    yield '\tcontinuous =\n'
+    yield '\t\t(* Initial clock constraints *)\n'
+    for k in range(1, shape.clocks + 1):
+        yield '\t\t& ' + clock_name(k) + ' = 0\n'
+    if shape.parameters > 0:
+        yield '\n'
+        yield '\t\t(* Parameter constraints *)\n'
+        for k in range(1, shape.parameters + 1):
+            yield '\t\t& ' + parameter_name(k) + ' >= 0\n'
+    yield '\t;\n'
+    yield '}\n'
+    yield '\n'
+    yield '\n'
+    yield SEPARATOR
+    yield '(* The end *)\n'
+    yield SEPARATOR
+    yield 'end\n'
+
+
+def describe_shape(shape, seed):
+    return 'random network (seed %d): %d automata, %d clocks, %d parameters, %d discrete variables, %d locations and %d transitions per automaton, %d actions, densities: guards %.2f, invariants %.2f, resets %.2f, synchronization %.2f' % (seed, shape.automata, shape.clocks, shape.parameters, shape.discretes, shape.locations, shape.transitions, shape.actions, shape.guard_density, shape.invariant_density, shape.reset_density, shape.sync_density)
+
+
+# The text of a random model, as a sequence of strings
+# NOTE: the network is built before the text is produced, so that the model only depends on the seed and the shape
+def random_model(shape, seed, title='random'):
+    network = random_network(random.Random(seed), shape)
+    for chunk in header(title, describe_shape(shape, seed)):
+        yield chunk
+    for chunk in declarations(shape):
+        yield chunk
+    for automaton, description in enumerate(network, 1):
+        for chunk in automaton_text(automaton, description):
+            yield chunk
+    for chunk in initial_state(shape):
+        yield chunk
+
+
+# The text of a property: reachability (EF) or safety (AGnot) of the last location of the first automaton, or existence of an infinite run (Cycle)
+def random_property(shape, kind):
+    target = 'loc[' + automaton_name(1) + '] = ' + location_name(1, shape.locations - 1)
+    yield SEPARATOR
+    yield '(* Property specification *)\n'
+    yield SEPARATOR
+    yield '\n'
+    if kind == 'EF':
+        yield 'property := #synth EF(' + target + ');\n'
+    elif kind == 'AGnot':
+        yield 'property := #synth AGnot(' + target + ');\n'
+    elif kind == 'Cycle':
+        yield 'property := #synth Cycle;\n'
+    else:
+        raise ValueError('unknown property ' + kind)
+
+
+def write_chunks(file_name, chunks):
+    with open(file_name, 'w', OUTPUT_BUFFER_SIZE) as f:
+        f.writelines(chunks)
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    defaults = Shape()
+    parser = argparse.ArgumentParser(description='Generates random networks of parametric timed automata, with EF, AGnot and Cycle properties')
+    parser.add_argument('--automata', type=int, default=defaults.automata, help='Number of automata (default: %(default)s)')
+    parser.add_argument('--clocks', type=int, default=defaults.clocks, help='Number of clocks (default: %(default)s)')
+    parser.add_argument('--parameters', type=int, default=defaults.parameters, help='Number of parameters (default: %(default)s)')
+    parser.add_argument('--discretes', type=int, default=defaults.discretes, help='Number of discrete (int) variables (default: %(default)s)')
+    parser.add_argument('--locations', type=int, default=defaults.locations, help='Number of locations per automaton (default: %(default)s)')
+    parser.add_argument('--transitions', type=int, default=defaults.transitions, help='Number of transitions per automaton (default: %(default)s)')
+    parser.add_argument('--actions', type=int, default=defaults.actions, help='Number of synchronization actions (default: %(default)s)')
+    parser.add_argument('--guard-density', type=float, default=defaults.guard_density, help='Probability for each variable to appear in a guard (default: %(default)s)')
+    parser.add_argument('--invariant-density', type=float, default=defaults.invariant_density, help='Probability for a location to have an invariant (default: %(default)s)')
+    parser.add_argument('--reset-density', type=float, default=defaults.reset_density, help='Probability for each clock to be reset by a transition (default: %(default)s)')
+    parser.add_argument('--sync-density', type=float, default=defaults.sync_density, help='Probability for a transition to synchronize (default: %(default)s)')
+    parser.add_argument('--max-constant', type=int, default=defaults.max_constant, help='Largest constant (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the first model (default: 0)')
+    parser.add_argument('--count', type=int, default=1, help='Number of models, with consecutive seeds (default: 1)')
+    parser.add_argument('-o', '--output-dir', default='.', help='Output directory (default: current directory)')
+    parser.add_argument('--prefix', default='random', help='Prefix of the file names (default: random)')
+    args = parser.parse_args()
+
+    shape = Shape(args.automata, args.clocks, args.parameters, args.discretes, args.locations, args.transitions, args.actions, args.guard_density, args.invariant_density, args.reset_density, args.sync_density, args.max_constant)
+    errors = shape.check()
+    if errors:
+        parser.error('; '.join(errors))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for seed in range(args.seed, args.seed + args.count):
+        name = args.prefix + '-seed' + str(seed)
+        base_name = os.path.join(args.output_dir, name)
+        write_chunks(base_name + '.imi', random_model(shape, seed, name))
+        for kind in PROPERTIES:
+            write_chunks(base_name + '-' + kind + '.imiprop', random_property(shape, kind))
+        print(base_name + '.imi')
+
+
+if __name__ == '__main__':
+    __main__()
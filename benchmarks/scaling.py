@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: scaling study of generated benchmark families: runs the instances of a manifest (generate.py) with increasing sizes for one or several IMITATOR builds, fits growth curves (polynomial or exponential) on the time and numbers of states, and flags the builds whose fitted growth gets worse
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+
+import generate
+import imitator_utilities as iu
+
+# Measures read in the result files: key in the report => key in iu.parse_res
+METRICS = {
+    'time': 'total_time',
+    'states': 'states',
+    'computed_states': 'computed_states',
+}
+
+# Pseudo-metric of the regressions on the largest completed size
+METRIC_COMPLETION = 'completion'
+
+# Growth models: y = a * n^b (polynomial) and y = a * e^(b n) (exponential), both fitted by least squares on log(y)
+MODEL_POLYNOMIAL = 'polynomial'
+MODEL_EXPONENTIAL = 'exponential'
+
+
+# ************************************************************
+# FITTING
+# ************************************************************
+
+# Least squares fit of y = intercept + slope * x; returns (intercept, slope, coefficient of determination)
+def linear_regression(xs, ys):
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    r2 = 1.0 if syy == 0 else (sxy * sxy) / (sxx * syy)
+    return intercept, slope, r2
+
+
+# Fit both growth models on the points (size, value) with a positive value; returns None if fewer than min_points points
+#   polynomial : the rate is the degree b
+#   exponential: the rate is b (the value is multiplied by e^b when the size increases by 1)
+def fit_growth(points, min_points=3):
+    points = [(size, value) for size, value in points if value is not None and value > 0 and size > 0]
+    if len(points) < min_points or len(set(size for size, _ in points)) < 2:
+        return None
+    log_values = [math.log(value) for _, value in points]
+    fits = {}
+    intercept, rate, r2 = linear_regression([math.log(size) for size, _ in points], log_values)
+    fits[MODEL_POLYNOMIAL] = {'rate': rate, 'coefficient': math.exp(intercept), 'r2': r2}
+    intercept, rate, r2 = linear_regression([float(size) for size, _ in points], log_values)
+    fits[MODEL_EXPONENTIAL] = {'rate': rate, 'coefficient': math.exp(intercept), 'r2': r2}
+    best = max(fits, key=lambda model: fits[model]['r2'])
+    return {'best': best, 'points': len(points), 'fits': fits}
+
+
+def describe_fit(fit):
+    if fit is None:
+        return 'not enough points'
+    model = fit['best']
+    parameters = fit['fits'][model]
+    if model == MODEL_POLYNOMIAL:
+        return 'n^%.2f (R2 = %.3f)' % (parameters['rate'], parameters['r2'])
+    return 'e^(%.3f n) (R2 = %.3f)' % (parameters['rate'], parameters['r2'])
+
+
+# ************************************************************
+# RUNNING
+# ************************************************************
+
+# Key of the series of an instance: its family and all its parameters but the size
+def series_key(entry):
+    others = sorted((name, value) for name, value in entry['parameters'].items() if name != entry['size_parameter'])
+    return entry['family'] + '(' + ', '.join('%s=%s' % (name, value) for name, value in others) + ')'
+
+
+# Group the entries of a manifest into series sorted by size
+def make_series(manifest, families=None):
+    series = {}
+    for entry in manifest:
+        if families and entry['family'] not in families:
+            continue
+        series.setdefault(series_key(entry), []).append(entry)
+    for entries in series.values():
+        entries.sort(key=lambda entry: entry['size'])
+    return series
+
+
+# Run one series with one build by increasing size; stops at the first timeout or failure (larger sizes are assumed to fail too)
+def run_series(entries, binary, options, timeout):
+    runs = []
+    for entry in entries:
+        sandbox_dir = iu.create_sandbox(prefix='scaling_')
+        try:
+            execution = iu.run_imitator(sandbox_dir, entry['name'], model_file=entry['model'], property_file=entry['property'], options=options, binary=binary, timeout=timeout)
+            result = execution.result() if execution.status == iu.STATUS_OK else None
+        finally:
+            shutil.rmtree(sandbox_dir)
+        run = {'name': entry['name'], 'size': entry['size'], 'status': execution.status, 'wall_time': round(execution.wall_time, 3)}
+        if result is not None:
+            for metric, key in METRICS.items():
+                run[metric] = result[key]
+        runs.append(run)
+        print('    %s: %s (%.1f s)' % (entry['name'], execution.status, execution.wall_time), flush=True)
+        if execution.status != iu.STATUS_OK:
+            break
+    return runs
+
+
+def fit_runs(runs, min_time):
+    fits = {}
+    for metric in METRICS:
+        points = [(run['size'], run.get(metric)) for run in runs]
+        if metric == 'time':
+            # NOTE: times below the resolution are noise
+            points = [(size, value) for size, value in points if value is not None and value >= min_time]
+        fits[metric] = fit_growth(points)
+    return fits
+
+
+# ************************************************************
+# REGRESSIONS
+# ************************************************************
+
+# Compare the fitted growth of a build with the reference one: the rate of the model that best fits the reference is compared (for both builds)
+# Returns the list of regressions (metric, model, reference rate, rate)
+def compare_fits(reference_fits, fits, tolerance):
+    regressions = []
+    for metric, reference_fit in reference_fits.items():
+        fit = fits.get(metric)
+        if reference_fit is None or fit is None:
+            continue
+        model = reference_fit['best']
+        reference_rate = reference_fit['fits'][model]['rate']
+        rate = fit['fits'][model]['rate']
+        if rate > reference_rate + tolerance * max(abs(reference_rate), 1e-9):
+            regressions.append({'metric': metric, 'model': model, 'reference_rate': reference_rate, 'rate': rate})
+    return regressions
+
+
+# Largest size completed by a series of runs (None if none)
+def largest_completed_size(runs):
+    sizes = [run['size'] for run in runs if run['status'] == iu.STATUS_OK]
+    return max(sizes) if sizes else None
+
+
+# Compare the sizes completed by a build with the reference: stopping (timeout or failure) at a size that the reference completes is a regression, even when too few points remain to fit the growth
+# Returns the regression, or None
+def compare_completion(reference_runs, runs):
+    reference_largest = largest_completed_size(reference_runs)
+    largest = largest_completed_size(runs)
+    if reference_largest is None or (largest is not None and largest >= reference_largest):
+        return None
+    stopped = [run for run in runs if run['status'] != iu.STATUS_OK]
+    return {'metric': METRIC_COMPLETION, 'reference_largest_size': reference_largest, 'largest_size': largest, 'stopped_at': stopped[0]['size'] if stopped else None, 'status': stopped[0]['status'] if stopped else None}
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def parse_build(text):
+    if '=' in text:
+        name, binary = text.split('=', 1)
+        return name, binary
+    return os.path.basename(os.path.dirname(os.path.abspath(text))) or text, text
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Scaling study of generated benchmark families, with detection of growth regressions between IMITATOR builds')
+    parser.add_argument('manifest', help='Manifest of the instances (see generate.py)')
+    parser.add_argument('--imitator', action='append', default=None, help='IMITATOR build as [name=]binary; can be repeated, the first build is the reference (default: bin/imitator)')
+    parser.add_argument('--family', action='append', default=None, help='Only run this family (can be repeated)')
+    parser.add_argument('--options', nargs=argparse.REMAINDER, default=[], help='Additional options for IMITATOR (must come last: all the following arguments are passed to IMITATOR)')
+    parser.add_argument('--timeout', type=float, default=60, help='Time limit for each run (in seconds; default: 60)')
+    parser.add_argument('--min-time', type=float, default=0.01, help='Ignore the times below this value in the fit (default: 0.01)')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Flag a regression when a growth rate exceeds the reference one by this ratio (default: 0.1)')
+    parser.add_argument('--baseline', default=None, help='Previous report whose reference build is the reference of this study')
+    parser.add_argument('--output', default='scaling-report.json', help='Report file (default: scaling-report.json)')
+    args = parser.parse_args()
+
+    builds = [parse_build(text) for text in (args.imitator or [iu.find_binary()])]
+    series = make_series(generate.load_manifest(args.manifest), args.family)
+    if not series:
+        print('No instance to run')
+        sys.exit(1)
+
+    report = {'builds': [name for name, _ in builds], 'series': {}}
+    for key in sorted(series):
+        print(key)
+        report['series'][key] = {}
+        for name, binary in builds:
+            print('  ' + name)
+            runs = run_series(series[key], binary, iu.split_options(args.options), args.timeout)
+            report['series'][key][name] = {'runs': runs, 'fits': fit_runs(runs, args.min_time)}
+
+    # Reference fits: the first build, or the reference build of the baseline report
+    reference = {key: results[builds[0][0]] for key, results in report['series'].items()}
+    reference_name = builds[0][0]
+    compared_builds = builds[1:]
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        reference_name = 'baseline (' + baseline['builds'][0] + ')'
+        reference = {key: results[baseline['builds'][0]] for key, results in baseline['series'].items()}
+        compared_builds = builds
+
+    report['regressions'] = []
+    print('')
+    print('series; build; metric; growth')
+    for key in sorted(report['series']):
+        for name, _ in builds:
+            for metric, fit in report['series'][key][name]['fits'].items():
+                print('%s; %s; %s; %s' % (key, name, metric, describe_fit(fit)))
+        if key not in reference:
+            continue
+        for name, _ in compared_builds:
+            regressions = compare_fits(reference[key]['fits'], report['series'][key][name]['fits'], args.tolerance)
+            completion = compare_completion(reference[key]['runs'], report['series'][key][name]['runs'])
+            if completion is not None:
+                regressions.insert(0, completion)
+            for regression in regressions:
+                regression.update({'series': key, 'build': name, 'reference': reference_name})
+                report['regressions'].append(regression)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    print('')
+    for regression in report['regressions']:
+        if regression['metric'] == METRIC_COMPLETION:
+            print('REGRESSION: %s, build %s: stopped at size %s (%s), largest completed size %s instead of %s for %s' % (regression['series'], regression['build'], regression['stopped_at'], regression['status'], regression['largest_size'], regression['reference_largest_size'], regression['reference']))
+            continue
+        print('REGRESSION: %s, build %s: %s growth rate %.3f (%s) instead of %.3f for %s' % (regression['series'], regression['build'], regression['metric'], regression['rate'], regression['model'], regression['reference_rate'], regression['reference']))
+    print('%d regression(s); report written to %s' % (len(report['regressions']), args.output))
+    sys.exit(1 if report['regressions'] else 0)
+
+
+if __name__ == '__main__':
+    __main__()
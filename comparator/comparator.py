@@ -10,7 +10,7 @@
 # 
 # File contributors : Étienne André
 # Created           : 2016/08/08
-# Last modified     : 2018/06/01
+# Last modified     : 2026/10/18
 #************************************************************
 
 
@@ -55,6 +55,9 @@ BINARY_NAME = 'imitator'
 # Result files prefix
 RESULT_FILES_PATH = IMITATOR_PATH + 'comparator/results/'
 
+# Script comparing the constraints synthesized by two versions
+CONSTRAINT_DIFF_SCRIPT = IMITATOR_PATH + 'scripts/constraint-diff.py'
+
 LOG_EXTENSION = '.benchlog'
 
 #ADDED
@@ -357,6 +360,9 @@ def make_file(file_name) :
 def make_log_file(benchmark, version):
 	return RESULT_FILES_PATH + benchmark['log_prefix'] +  versions[version]['files_suffix'] + LOG_EXTENSION
 
+def make_res_file(benchmark, version):
+	return RESULT_FILES_PATH + benchmark['log_prefix'] +  versions[version]['files_suffix'] + ".res"
+
 def fail_with(text) :
 	print_to_screen(bcolors.FAIL + 'Fatal error!' + bcolors.ENDC)
 	print_to_screen(bcolors.FAIL + text + bcolors.ENDC)
@@ -559,12 +565,46 @@ def run(benchmark, versions_to_test):
 
 			
 			# TODO: test whether the termination is ok
+	
+	# Compare the constraints synthesized by the versions
+	compare_constraints(benchmark, versions_to_test)
+	
 	# Print the current benchmark
 	print_line(versions_to_test, benchmark['benchmark_name'], results[benchmark['log_prefix']])
 	write_line(WEBGEN_PATH + HTML_DATA, versions_to_test, benchmark['benchmark_name'], results[benchmark['log_prefix']])
 
 
 
+# Compare the constraint synthesized by each version with the one of the last version (using the sampling of constraint-diff.py), and warn in case of difference
+def compare_constraints(benchmark, versions_to_test):
+	# NOTE: the cartography results contain several tiles, not compared here
+	if OPT_MODE_COVER in benchmark['options']:
+		return
+	
+	# Versions that produced a result file
+	compared_versions = [version for version in versions_to_test if results[benchmark['log_prefix']].get(version, ANALYSIS_NOT_RUN) not in [ANALYSIS_NOT_RUN, ANALYSIS_FAILED] and os.path.isfile(make_res_file(benchmark, version))]
+	if len(compared_versions) < 2:
+		return
+	
+	reference = compared_versions[-1]
+	
+	# Sample within the parameter box of the input files of the reference version (model bounds, then v0 or pi0 of the property)
+	input_files = benchmark['input_files']
+	if 'input_files_v' in benchmark.keys() and reference in benchmark['input_files_v'].keys():
+		input_files = benchmark['input_files_v'][reference]
+	box_options = ['--model', make_file(input_files[0])]
+	if len(input_files) > 1:
+		box_options += ['--property', make_file(input_files[1])]
+	
+	for version in compared_versions[:-1]:
+		process = subprocess.Popen(['python3', CONSTRAINT_DIFF_SCRIPT, make_res_file(benchmark, reference), make_res_file(benchmark, version), '--quiet'] + box_options, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+		output = process.communicate()[0].strip()
+		if process.returncode == 1:
+			print_warning('Constraint of version ' + versions[version]['version_name'] + ' differs from version ' + versions[reference]['version_name'] + ': ' + output)
+		elif process.returncode != 0:
+			print_warning('Could not compare the constraints of versions ' + versions[version]['version_name'] + ' and ' + versions[reference]['version_name'] + ': ' + output)
+
+
 def print_line(versions_to_test, benchmark_name, result):
 	# Create text line
 	line = benchmark_name + "; "
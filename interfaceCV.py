@@ -10,7 +10,7 @@
 # 
 # File contributors : Étienne André
 # Created           : 2016/11/07
-# Last modified     : 2017/02/20
+# Last modified     : 2026/10/18
 #************************************************************
 
 # ###
@@ -18,6 +18,7 @@
 # 1) file name of the model
 # 2) parameter valuation in the form "param1=value1,param2=value2…" (WARNING: no check is made here!)
 				# 2) expected name of the transformed model (abstraction or counter-example) # NOTE: removed (for now)
+# Batch mode (see the end of this file): '-batch', then the file name of the model, a file with one parameter valuation per line, and the name of the report
 # NOTE: the major assumptions for this interface to work are:
 # - for each event a, a clock clock_a is defined; this clock must be reset everytime a is taken
 # - parameter names should not overlap each other (nor should they overlap any other string in the model)
@@ -35,6 +36,12 @@ import os
 import sys
 import subprocess
 import re
+import hashlib
+import tempfile
+import shutil
+import json
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 
 
@@ -54,8 +61,8 @@ LEARNING_BINARY_NAME = LEARNING_BINARY_PATH + 'Compositional_Verifier'
 # Option to inform the learning binary that the input format is .imi
 LEARNING_BINARY_OPTION = '-imi'
 
-# Dir in which the files will be created
-LEARNING_TMP_DIR = LEARNING_BINARY_PATH + 'tmp/'
+# Dir (relative to the working directory of LEARNING_BINARY_NAME) in which the files will be created
+LEARNING_TMP_DIR = 'tmp/'
 
 # File that will be generated by LEARNING_BINARY_NAME in case of an assumption
 LEARNING_OUTPUT_FILE_ASSUMPTION = LEARNING_TMP_DIR + 'assumption.imi'
@@ -63,6 +70,20 @@ LEARNING_OUTPUT_FILE_ASSUMPTION = LEARNING_TMP_DIR + 'assumption.imi'
 # File that will be generated by LEARNING_BINARY_NAME in case of a counter-example
 LEARNING_OUTPUT_FILE_COUNTEREXAMPLE = LEARNING_TMP_DIR + 'counterexample.imi'
 
+# Dir in which one private copy of LEARNING_BINARY_PATH is created for each call to LEARNING_BINARY_NAME
+# NOTE: this allows several calls (batch workers, instances of this script) to run at the same time
+LEARNING_JOBS_DIR = LEARNING_BINARY_PATH + 'jobs/'
+
+# Dir in which the learning results are cached (keyed on the hash of the model sent to LEARNING_BINARY_NAME)
+LEARNING_CACHE_DIR = LEARNING_BINARY_PATH + 'cache/'
+
+# Set to False to always call LEARNING_BINARY_NAME
+USE_LEARNING_CACHE = True
+
+# Extensions for cached results
+CACHE_EXTENSION_ASSUMPTION = '.assumption.imi'
+CACHE_EXTENSION_COUNTEREXAMPLE = '.counterexample.imi'
+
 # Init definition for abstraction output by learning
 LEARNING_INIT_DEFINITION = 'loc[AbstractERA] = AbstractERA_init'
 
@@ -165,6 +186,23 @@ def write_file_content(file_name, content):
 	file.close()
 	return
 
+# Write a file so that concurrent readers never see it half-written (write to a temporary file in the same dir, then rename)
+def write_file_content_atomically(file_name, content):
+	(fd, tmp_file_name) = tempfile.mkstemp(dir=os.path.dirname(file_name), prefix='.tmp_')
+	os.write(fd, content)
+	os.close(fd)
+	# NOTE: rename is atomic on POSIX systems (and silently replaces any existing file)
+	os.rename(tmp_file_name, file_name)
+	return
+
+# Create a directory if it does not exist yet (possibly concurrently with another instance of this script)
+def make_dir(dir_name):
+	try:
+		os.makedirs(dir_name)
+	except OSError:
+		if not os.path.isdir(dir_name):
+			raise
+
 # Find the content of a string between two delimiters; aborts if substring not found
 def find_substring_within_delimiters(string, delimiter_start, delimiter_end):
 	# NOTE: 're.DOTALL' allows to match newline characters inside '.'
@@ -366,332 +404,635 @@ def format_abstraction(abstraction):
 
 
 #************************************************************
-# PRELIMINARY CHECKS
-#************************************************************
-
-print_to_screen('*-**--***---****---***--**-*')
-print_to_screen('Hello, this is ' + THIS_SCRIPT_NAME + '!')
-
-
-# Check that the learning binary exists
-if not binary_exists(LEARNING_BINARY_NAME) :
-	fail_with('Binary "' + LEARNING_BINARY_NAME + '" does not exist')
-
-
-if len(sys.argv) <> 4:
-	fail_with("Exactly 3 arguments are expected")
-
-
-#************************************************************
-# MAIN FUNCTION
+# LEARNING FUNCTIONS
 #************************************************************
 
-# Get the IMITATOR model name
-original_model_name = sys.argv[1]
-
-# Get the expected transformed model name
-new_model_name = sys.argv[2]
-
-# Get pi0 (as a string)
-pi0_string = sys.argv[3]
-
-
-if DEBUG_MODE:
-	print "\nArgument 1 = original model name:"
-	print original_model_name
-	print "\nArgument 2 = new model name:"
-	print new_model_name
-	print "\nArgument 3 = pi0:"
-	print pi0_string
-
-
 #------------------------------------------------------------
-# Load model
+# Compute the key under which the learning result for a model (v(A) + B + specification + analysis line) is cached
 #------------------------------------------------------------
-if not os.path.isfile(original_model_name):
-	fail_with('Original model "' + original_model_name + '" does not exist')
-
-model = read_file_content(original_model_name)
-
-if DEBUG_MODE:
-	print "\nModel:"
-	print model
+def compute_cache_key(model_content):
+	return hashlib.sha1(LEARNING_BINARY_OPTION + '\n' + model_content).hexdigest()
 
 
 #------------------------------------------------------------
-# Find components
+# Look for a cached learning result; returns a pair (is_assumption, learning output) or None
 #------------------------------------------------------------
-if DEBUG_MODE:
-	print "Finding header…"
-header = get_header(model)
-if DEBUG_MODE:
-	print "Finding components A and B…"
-component_A = get_component_A(model)
-component_B = get_component_B(model)
-if DEBUG_MODE:
-	print "Finding specification…"
-specification = get_specification(model)
-if DEBUG_MODE:
-	print "Finding init definition…"
-init_definition = get_init_definition(model)
-
-if DEBUG_MODE:
-	print "\nComponent A:"
-	print component_A
-	print "\nComponent B:"
-	print component_B
-	print "\nSpecification:"
-	print specification
-	print "\nInit definition:"
-	print init_definition
+def get_cached_learning_result(cache_key):
+	cache_file_assumption = LEARNING_CACHE_DIR + cache_key + CACHE_EXTENSION_ASSUMPTION
+	cache_file_counterexample = LEARNING_CACHE_DIR + cache_key + CACHE_EXTENSION_COUNTEREXAMPLE
+	
+	if file_exists(cache_file_assumption):
+		return (True, read_file_content(cache_file_assumption))
+	if file_exists(cache_file_counterexample):
+		return (False, read_file_content(cache_file_counterexample))
+	return None
 
-#------------------------------------------------------------
-# Find automata names
-#------------------------------------------------------------
-if DEBUG_MODE:
-	print "Finding automata names…"
-automata_names_in_A = get_automata_names(component_A)
-if DEBUG_MODE:
-	print '    In A: ' + str(automata_names_in_A)
-automata_names_in_B = get_automata_names(component_B)
-if DEBUG_MODE:
-	print '    In B: ' + str(automata_names_in_B)
-automata_names_in_specification = get_automata_names(specification)
-if DEBUG_MODE:
-	print '    In the specification: ' + str(automata_names_in_specification)
 
 #------------------------------------------------------------
-# Find initial locations
+# Store a learning result in the cache
 #------------------------------------------------------------
-if DEBUG_MODE:
-	print "Gathering initial locations…"
-# Compute dictionary automaton_name => initial location_name
-initial_locations = compute_initial_locations(init_definition)
+def cache_learning_result(cache_key, is_assumption, learning_output):
+	make_dir(LEARNING_CACHE_DIR)
+	if is_assumption:
+		cache_file = LEARNING_CACHE_DIR + cache_key + CACHE_EXTENSION_ASSUMPTION
+	else:
+		cache_file = LEARNING_CACHE_DIR + cache_key + CACHE_EXTENSION_COUNTEREXAMPLE
+	write_file_content_atomically(cache_file, learning_output)
 
-if DEBUG_MODE:
-	for automaton_name, location_name in initial_locations.items():
-		print '    loc[' + automaton_name + ']=' + location_name + ''
 
+# Raised when the learning tool fails
+# NOTE: not handled with fail_with, as the learning tool may be called from a worker thread (batch mode)
+class LearningError(Exception):
+	pass
 
-#fail_with('bye for now')
 
 #------------------------------------------------------------
-# Find and analyse pi0
+# Create a private copy of LEARNING_BINARY_PATH, with its own LEARNING_TMP_DIR; returns its path
+# NOTE: the binary is copied (so that its own directory is the private one), the other files are symbolic links; the jobs, cache and tmp dirs are not reproduced
 #------------------------------------------------------------
-print "Building reference valuation…"
+def make_learning_job_dir():
+	make_dir(LEARNING_JOBS_DIR)
+	# NOTE: absolute, as LEARNING_BINARY_NAME is called from it
+	job_dir = os.path.abspath(tempfile.mkdtemp(prefix='job_', dir=LEARNING_JOBS_DIR))
+	
+	excluded_entries = [os.path.basename(os.path.normpath(dir_name)) for dir_name in [LEARNING_JOBS_DIR, LEARNING_CACHE_DIR, LEARNING_TMP_DIR]]
+	for entry in os.listdir(LEARNING_BINARY_PATH):
+		if entry in excluded_entries:
+			continue
+		source = os.path.abspath(os.path.join(LEARNING_BINARY_PATH, entry))
+		if source == os.path.abspath(LEARNING_BINARY_NAME):
+			shutil.copy2(source, os.path.join(job_dir, entry))
+		else:
+			os.symlink(source, os.path.join(job_dir, entry))
+	make_dir(os.path.join(job_dir, LEARNING_TMP_DIR))
+	
+	return job_dir
 
-# Split into assignments
-pi0_assignments = re.split(SEPARATOR_PI0_PAIRS , pi0_string)
 
-# Build up a list of pairs (parameter, valuation)
-pi0_pairs = []
-for idx, pair in enumerate(pi0_assignments):
-	#print pair
-	split_pair = re.split(SEPARATOR_PI0_ASSIGNEMENT, pair)
-	# Check that this is a pair
-	if len(split_pair) <> 2:
-		fail_with('Pair "' + str(split_pair) + '" should be of the form "parameter' + SEPARATOR_PI0_ASSIGNEMENT + 'valuation"')
-	# Get pair elements
-	parameter = split_pair[0]
-	valuation = split_pair[1]
-	# Add pair to the new list
-	pi0_pairs.append((parameter , valuation))
+#------------------------------------------------------------
+# Call the learning tool on a model in a private copy of its directory; returns a pair (is_assumption, learning output)
+# NOTE: the private copy is removed afterwards (except in debug mode and in case of failure)
+#------------------------------------------------------------
+def call_learning_tool(model_content, exported_file_name):
+	job_dir = make_learning_job_dir()
+	
+	# Prepare the command (using a list form)
+	cmd = [os.path.join(job_dir, os.path.basename(LEARNING_BINARY_NAME))] + [LEARNING_BINARY_OPTION] + [os.path.abspath(exported_file_name)]
+	
+	print_to_screen('Executing "' + ' '.join(cmd) + '" in "' + job_dir + '"…')
+	
+	# Call
+	if DEBUG_MODE:
+		result = subprocess.call(cmd, cwd=job_dir)
+	else:
+		# Mute output of the call
+		result = subprocess.call(cmd, cwd=job_dir, stdout=open(os.devnull, 'wb'))
+	
+	# Check that everything was fine
+	if result <> 0:
+		raise LearningError('Call to "' + LEARNING_BINARY_NAME + '" failed. Error code: ' + str(result) + '. Working directory: "' + job_dir + '"')
+	
+	# Retrieve the result
+	output_file_assumption = os.path.join(job_dir, LEARNING_OUTPUT_FILE_ASSUMPTION)
+	output_file_counterexample = os.path.join(job_dir, LEARNING_OUTPUT_FILE_COUNTEREXAMPLE)
+	
+	if file_exists(output_file_assumption):
+		learning_result = (True, read_file_content(output_file_assumption))
+	elif file_exists(output_file_counterexample):
+		learning_result = (False, read_file_content(output_file_counterexample))
+	else:
+		raise LearningError('Files "' + output_file_assumption + '" and "' + output_file_counterexample + '" not found')
+	
+	if not DEBUG_MODE:
+		shutil.rmtree(job_dir, ignore_errors=True)
+	
+	return learning_result
 
-# Print pi0
-print 'Pi0:'
-for (parameter, valuation) in pi0_pairs:
-	print '    v(' + parameter + ') = ' + str(valuation)
 
 #------------------------------------------------------------
-# Prepare the model for the learning tool
+# Get the learning result for a model, either from the cache or by calling the learning tool; returns a pair (is_assumption, learning output)
 #------------------------------------------------------------
-print "Valuating component A with pi0…"
+def learn(model_content, exported_file_name):
+	# NOTE: the model is written next to the original model even if the learning result is cached
+	print 'Writing content to "' + exported_file_name + '"…'
+	write_file_content(exported_file_name, model_content)
+	
+	if not USE_LEARNING_CACHE:
+		return call_learning_tool(model_content, exported_file_name)
+	
+	cache_key = compute_cache_key(model_content)
+	cached_result = get_cached_learning_result(cache_key)
+	if cached_result is not None:
+		print_to_screen('Learning result found in cache (key ' + cache_key + ')')
+		return cached_result
+	
+	(is_assumption, learning_output) = call_learning_tool(model_content, exported_file_name)
+	cache_learning_result(cache_key, is_assumption, learning_output)
+	return (is_assumption, learning_output)
 
-# Replace parameters with their valuation defined in pi0
-component_vA = valuate_component(component_A, pi0_pairs)
 
-if DEBUG_MODE:
-	print "\nv(A):"
-	print component_vA
+#************************************************************
+# MODEL TRANSFORMATION FUNCTIONS
+#************************************************************
 
-## HACK: we need to "valuate" B (although it is not parametric), because there may be some constants in the model, that need to be "valuated" too
-#component_vB = valuate_component(component_B, pi0_pairs)
+# Raised when a pi0 cannot be parsed
+# NOTE: not handled with fail_with, as a malformed pi0 must not abort the whole batch
+class Pi0ParseError(Exception):
+	pass
 
-#if DEBUG_MODE:
-	#print "\nv(B):"
-	#print component_vB
 
-## HACK: we need to "valuate" the spec (although it is not parametric), because there may be some constants in the model, that need to be "valuated" too
-#vspec = valuate_component(specification, pi0_pairs)
+#------------------------------------------------------------
+# Parse pi0 in the form "param1=value1,param2=value2…" into a list of pairs (parameter, valuation)
+#------------------------------------------------------------
+def parse_pi0(pi0_string):
+	# Split into assignments
+	pi0_assignments = re.split(SEPARATOR_PI0_PAIRS , pi0_string)
+	
+	# Build up a list of pairs (parameter, valuation)
+	pi0_pairs = []
+	for idx, pair in enumerate(pi0_assignments):
+		#print pair
+		split_pair = re.split(SEPARATOR_PI0_ASSIGNEMENT, pair)
+		# Check that this is a pair
+		if len(split_pair) <> 2:
+			raise Pi0ParseError('Pair "' + str(split_pair) + '" should be of the form "parameter' + SEPARATOR_PI0_ASSIGNEMENT + 'valuation"')
+		# Get pair elements
+		parameter = split_pair[0]
+		valuation = split_pair[1]
+		# Add pair to the new list
+		pi0_pairs.append((parameter , valuation))
+	
+	return pi0_pairs
 
-#if DEBUG_MODE:
-	#print "\nv(B):"
-	#print component_vB
 
-# Prepare the analysis line
-analysis_line = create_analysis_line(automata_names_in_A, automata_names_in_B, automata_names_in_specification)
+#------------------------------------------------------------
+# Cut the model into its components; returns a dictionary
+# NOTE: done once, even when several pi0 are considered (batch mode)
+#------------------------------------------------------------
+def split_model(model):
+	parts = {}
+	
+	#------------------------------------------------------------
+	# Find components
+	#------------------------------------------------------------
+	if DEBUG_MODE:
+		print "Finding header…"
+	parts['header'] = get_header(model)
+	if DEBUG_MODE:
+		print "Finding components A and B…"
+	parts['component_A'] = get_component_A(model)
+	parts['component_B'] = get_component_B(model)
+	if DEBUG_MODE:
+		print "Finding specification…"
+	parts['specification'] = get_specification(model)
+	if DEBUG_MODE:
+		print "Finding init definition…"
+	parts['init_definition'] = get_init_definition(model)
+	
+	if DEBUG_MODE:
+		print "\nComponent A:"
+		print parts['component_A']
+		print "\nComponent B:"
+		print parts['component_B']
+		print "\nSpecification:"
+		print parts['specification']
+		print "\nInit definition:"
+		print parts['init_definition']
+	
+	#------------------------------------------------------------
+	# Find automata names
+	#------------------------------------------------------------
+	if DEBUG_MODE:
+		print "Finding automata names…"
+	parts['automata_names_in_A'] = get_automata_names(parts['component_A'])
+	if DEBUG_MODE:
+		print '    In A: ' + str(parts['automata_names_in_A'])
+	parts['automata_names_in_B'] = get_automata_names(parts['component_B'])
+	if DEBUG_MODE:
+		print '    In B: ' + str(parts['automata_names_in_B'])
+	parts['automata_names_in_specification'] = get_automata_names(parts['specification'])
+	if DEBUG_MODE:
+		print '    In the specification: ' + str(parts['automata_names_in_specification'])
+	
+	#------------------------------------------------------------
+	# Find initial locations
+	#------------------------------------------------------------
+	if DEBUG_MODE:
+		print "Gathering initial locations…"
+	# Compute dictionary automaton_name => initial location_name
+	parts['initial_locations'] = compute_initial_locations(parts['init_definition'])
+	
+	if DEBUG_MODE:
+		for automaton_name, location_name in parts['initial_locations'].items():
+			print '    loc[' + automaton_name + ']=' + location_name + ''
+	
+	#------------------------------------------------------------
+	# Prepare the non-parametric part of the model for the learning tool
+	#------------------------------------------------------------
+	# Prepare the analysis line
+	parts['analysis_line'] = create_analysis_line(parts['automata_names_in_A'], parts['automata_names_in_B'], parts['automata_names_in_specification'])
+	
+	# Create B + the specification; also add initial locations and accepting locations
+	modified_B = add_INIT_locations(parts['component_B'], parts['automata_names_in_B'], parts['initial_locations'])
+	parts['modified_B'] = add_ACCEPTING_locations(modified_B, parts['automata_names_in_B'])
+	modified_spec = add_INIT_locations(parts['specification'], parts['automata_names_in_specification'], parts['initial_locations'])
+	parts['modified_spec'] = add_ACCEPTING_locations(modified_spec, parts['automata_names_in_specification'])
+	
+	return parts
 
-# Create v(A) + B + the analysis line; also add initial locations and accepting locations
-modified_vA = add_INIT_locations(component_vA, automata_names_in_A, initial_locations)
-modified_vA = add_ACCEPTING_locations(modified_vA, automata_names_in_A)
-modified_B = add_INIT_locations(component_B, automata_names_in_B, initial_locations)
-modified_B = add_ACCEPTING_locations(modified_B, automata_names_in_B)
-modified_spec = add_INIT_locations(specification, automata_names_in_specification, initial_locations)
-modified_spec = add_ACCEPTING_locations(modified_spec, automata_names_in_specification)
 
-model_content = modified_vA + modified_B + modified_spec + analysis_line
+#------------------------------------------------------------
+# Create the model for the learning tool, i.e., v(A) + B + the specification + the analysis line
+#------------------------------------------------------------
+def create_learning_model(parts, pi0_pairs):
+	# Replace parameters with their valuation defined in pi0
+	component_vA = valuate_component(parts['component_A'], pi0_pairs)
+	
+	if DEBUG_MODE:
+		print "\nv(A):"
+		print component_vA
+	
+	## HACK: we need to "valuate" B (although it is not parametric), because there may be some constants in the model, that need to be "valuated" too
+	#component_vB = valuate_component(component_B, pi0_pairs)
+	
+	## HACK: we need to "valuate" the spec (although it is not parametric), because there may be some constants in the model, that need to be "valuated" too
+	#vspec = valuate_component(specification, pi0_pairs)
+	
+	# Add initial locations and accepting locations to v(A)
+	modified_vA = add_INIT_locations(component_vA, parts['automata_names_in_A'], parts['initial_locations'])
+	modified_vA = add_ACCEPTING_locations(modified_vA, parts['automata_names_in_A'])
+	
+	model_content = modified_vA + parts['modified_B'] + parts['modified_spec'] + parts['analysis_line']
+	
+	if DEBUG_MODE:
+		print "\nTransformed model:"
+		print model_content
+	
+	return model_content
 
-if DEBUG_MODE:
-	print "\nTransformed model:"
-	print model_content
 
+#------------------------------------------------------------
+# Build the exported file name: if original_model_name is 'file_name.imi', then it becomes 'file_name' + suffix + '.cv'; if original_model_name is 'model', then 'model' + suffix + '.cv'
+#------------------------------------------------------------
+def make_exported_file_name(original_model_name, suffix):
+	# Try to find a pattern file_name.imi
+	m = re.search('(.+?)' + IMI_EXTENSION + '$', original_model_name)
+	if m:
+		return m.group(1) + suffix + CV_EXTENSION
+	else:
+		return original_model_name + suffix + CV_EXTENSION
 
 
 #------------------------------------------------------------
-# Building the exported file name: if original_model_name is 'file_name.imi', then it becomes 'file_name.cv'; if original_model_name is 'model', then 'model.cv'
+# Create the model to be sent back to IMITATOR from the learning result
 #------------------------------------------------------------
-exported_file_name = ''
-
-# Try to find a pattern file_name.imi
-m = re.search('(.+?)' + IMI_EXTENSION + '$', original_model_name)
-if m:
-	exported_file_name = m.group(1) + CV_EXTENSION
-else:
-	exported_file_name = original_model_name + CV_EXTENSION
+def create_result_model(parts, is_assumption, learning_output):
+	init_definition = parts['init_definition']
+	
+	#------------------------------------------------------------
+	# Case: abstraction
+	#------------------------------------------------------------
+	if is_assumption:
+		# Get the abstraction and format it to IMITATOR input
+		abstraction = format_abstraction(learning_output)
+	
+		# Remove all "& loc[automaton_name] = location_name" for automata in B
+		if DEBUG_MODE:
+			print_to_screen('Removing location names in the init definition…')
+		init_definition = remove_component_from_init_definition(parts['automata_names_in_B'], parts['initial_locations'], init_definition)
+		if DEBUG_MODE:
+			print "\nUpdated init definition:"
+			print init_definition
+		
+		# Add "& loc[Babs] = location_name"
+		if DEBUG_MODE:
+			print 'Adding the abstraction to the init definition…'
+		new_init_definition = re.sub('init\s+:=', 'init := ' + LEARNING_INIT_DEFINITION, init_definition)
+		# Check
+		if new_init_definition == init_definition:
+			fail_with('Could not find pattern "init :=" in the init definition')
+		init_definition = new_init_definition
+		if DEBUG_MODE:
+			print "\nUpdated init definition:"
+			print init_definition
+		
+		
+		# Build tag + header + A + Babs + specification + specification + updated init_definition
+		abstracted_model = '(*' + TAG_ABSTRACTION + "*)\n" + parts['header'] + parts['component_A'] + abstraction + parts['specification'] + init_definition
+		if DEBUG_MODE:
+			print "\nFull abstracted model:"
+			print abstracted_model
+	
+	#------------------------------------------------------------
+	# Case: counter-example
+	#------------------------------------------------------------
+	else:
+		# Get the abstraction and format it to IMITATOR input
+		abstraction = format_abstraction(learning_output)
+	
+		# Add "& loc[Babs] = location_name"
+		if DEBUG_MODE:
+			print 'Adding the abstraction to the init definition…'
+		new_init_definition = re.sub('init\s+:=', 'init := ' + LEARNING_INIT_DEFINITION, init_definition)
+		# Check
+		if new_init_definition == init_definition:
+			fail_with('Could not find pattern "init :=" in the init definition')
+		init_definition = new_init_definition
+		if DEBUG_MODE:
+			print "\nUpdated init definition:"
+			print init_definition
+		
+		# TODO: Build tag + header + A + B + trace-automaton + specification + updated init_definition
+		abstracted_model = '(*' + TAG_COUNTEREXAMPLE + "*)\n" + parts['header'] + parts['component_A'] + parts['component_B'] + abstraction + parts['specification'] + init_definition
+		if DEBUG_MODE:
+			print "\nModel to replay the counter-example trace:"
+			print abstracted_model
+	
+	return abstracted_model
 
 
 #------------------------------------------------------------
-# Writing content to file
+# Load the model from a file
 #------------------------------------------------------------
-print 'Writing content to "' + exported_file_name + '"…'
-write_file_content(exported_file_name, model_content)
+def load_model(original_model_name):
+	if not os.path.isfile(original_model_name):
+		fail_with('Original model "' + original_model_name + '" does not exist')
+	
+	model = read_file_content(original_model_name)
+	
+	if DEBUG_MODE:
+		print "\nModel:"
+		print model
+	
+	return model
 
 
+#************************************************************
+# SINGLE MODE (called by IMITATOR)
+#************************************************************
 
+def run_single(original_model_name, new_model_name, pi0_string):
+	if DEBUG_MODE:
+		print "\nArgument 1 = original model name:"
+		print original_model_name
+		print "\nArgument 2 = new model name:"
+		print new_model_name
+		print "\nArgument 3 = pi0:"
+		print pi0_string
+	
+	parts = split_model(load_model(original_model_name))
+	
+	#------------------------------------------------------------
+	# Find and analyse pi0
+	#------------------------------------------------------------
+	print "Building reference valuation…"
+	
+	try:
+		pi0_pairs = parse_pi0(pi0_string)
+	except Pi0ParseError as e:
+		fail_with(str(e))
+	
+	# Print pi0
+	print 'Pi0:'
+	for (parameter, valuation) in pi0_pairs:
+		print '    v(' + parameter + ') = ' + str(valuation)
+	
+	#------------------------------------------------------------
+	# Prepare the model for the learning tool
+	#------------------------------------------------------------
+	print "Valuating component A with pi0…"
+	
+	model_content = create_learning_model(parts, pi0_pairs)
+	
+	exported_file_name = make_exported_file_name(original_model_name, '')
+	
+	#------------------------------------------------------------
+	# Call the learning tool (or retrieve its result from the cache)
+	#------------------------------------------------------------
+	try:
+		(is_assumption, learning_output) = learn(model_content, exported_file_name)
+	except LearningError as e:
+		fail_with(str(e))
+	
+	if is_assumption:
+		print_to_screen('Abstraction detected')
+	else:
+		print_to_screen('Counter-example detected')
+	
+	abstracted_model = create_result_model(parts, is_assumption, learning_output)
+	
+	#------------------------------------------------------------
+	# Copy the learning result to an archive location
+	#------------------------------------------------------------
+	new_location = new_model_name + '-output' + CV_EXTENSION
+	print_to_screen('Copying learning result to "' + new_location + '"…')
+	write_file_content(new_location, learning_output)
+	
+	#------------------------------------------------------------
+	# Create file for IMITATOR
+	#------------------------------------------------------------
+	print_to_screen('Copying abstract model into "' + new_model_name + '"…')
+	write_file_content(new_model_name, abstracted_model)
 
 
+#************************************************************
+# BATCH MODE
+#************************************************************
 
-#------------------------------------------------------------
-# Call the learning tool
-#------------------------------------------------------------
-# Prepare the command (using a list form)
-cmd = [LEARNING_BINARY_NAME] + [LEARNING_BINARY_OPTION] + [exported_file_name]
+# Option selecting the batch mode
+OPTION_BATCH = '-batch'
 
-print_to_screen('Executing "' + ' '.join(cmd) + '"…')
+# Option (batch mode only) to set the number of concurrent calls to the learning tool
+OPTION_JOBS = '-jobs'
 
-# Call
-if DEBUG_MODE:
-	result = subprocess.call(cmd)
-else:
-	# Mute output of the call
-	result = subprocess.call(cmd, stdout=open(os.devnull, 'wb'))
+# Comment character in the pi0 list file
+PI0_FILE_COMMENT = '#'
 
+# Names of the learning results in the report
+RESULT_ASSUMPTION = 'assumption'
+RESULT_COUNTEREXAMPLE = 'counterexample'
+RESULT_ERROR = 'error'
 
 
 #------------------------------------------------------------
-# Check that everything was fine
+# Read a list of pi0 (one per line, in the form "param1=value1,param2=value2…"); empty lines and lines starting with PI0_FILE_COMMENT are ignored
 #------------------------------------------------------------
-if result <> 0:
-	fail_with('Call to "' + LEARNING_BINARY_NAME + '" failed. Error code: ' + str(result))
+def read_pi0_list(pi0_file_name):
+	if not os.path.isfile(pi0_file_name):
+		fail_with('Pi0 list "' + pi0_file_name + '" does not exist')
+	
+	pi0_strings = []
+	for line in read_file_content(pi0_file_name).splitlines():
+		# Remove blanks
+		line = re.sub('\s', '', line)
+		if line == '' or line.startswith(PI0_FILE_COMMENT):
+			continue
+		pi0_strings.append(line)
+	return pi0_strings
 
 
 #------------------------------------------------------------
-# Retrieve the result
+# Learning function executed by the worker pool; returns a pair (is_assumption, learning output), or a pair (None, error message) in case of failure
 #------------------------------------------------------------
-is_assumption = False
-output_file = ''
-
-if file_exists(LEARNING_OUTPUT_FILE_ASSUMPTION):
-	is_assumption = True
-	output_file = LEARNING_OUTPUT_FILE_ASSUMPTION
-else:
-	if file_exists(LEARNING_OUTPUT_FILE_COUNTEREXAMPLE):
-		is_assumption = False
-		output_file = LEARNING_OUTPUT_FILE_COUNTEREXAMPLE
-	else:
-		fail_with('Files "' + LEARNING_OUTPUT_FILE_ASSUMPTION + '" and "' + LEARNING_OUTPUT_FILE_COUNTEREXAMPLE + '" not found')
+def learn_job(job):
+	(model_content, exported_file_name) = job
+	try:
+		return learn(model_content, exported_file_name)
+	except (LearningError, OSError) as e:
+		return (None, str(e))
 
 
 #------------------------------------------------------------
-# Case: abstraction
+# Valuate the model for each pi0 of the list, learn all valuated models using a pool of nb_jobs workers, and write a report (JSON)
 #------------------------------------------------------------
-if is_assumption:
-	print_to_screen('Abstraction detected')
+def run_batch(original_model_name, pi0_file_name, report_file_name, nb_jobs):
+	# Parse the model once for all
+	parts = split_model(load_model(original_model_name))
 	
-	# Get the abstraction and format it to IMITATOR input
-	abstraction = format_abstraction(read_file_content(output_file))
-
-	# Remove all "& loc[automaton_name] = location_name" for automata in B
-	if DEBUG_MODE:
-		print_to_screen('Removing location names in the init definition…')
-	init_definition = remove_component_from_init_definition(automata_names_in_B, initial_locations, init_definition)
-	if DEBUG_MODE:
-		print "\nUpdated init definition:"
-		print init_definition
+	pi0_strings = read_pi0_list(pi0_file_name)
+	print_to_screen('Read ' + str(len(pi0_strings)) + ' reference valuation(s) from "' + pi0_file_name + '"')
 	
-	# Add "& loc[Babs] = location_name"
-	if DEBUG_MODE:
-		print 'Adding the abstraction to the init definition…'
-	new_init_definition = re.sub('init\s+:=', 'init := ' + LEARNING_INIT_DEFINITION, init_definition)
-	# Check
-	if new_init_definition == init_definition:
-		fail_with('Could not find pattern "init :=" in the init definition')
-	init_definition = new_init_definition
-	if DEBUG_MODE:
-		print "\nUpdated init definition:"
-		print init_definition
+	# NOTE: the output directory is named after the report file
+	output_dir = os.path.splitext(report_file_name)[0] + '-models/'
+	make_dir(output_dir)
 	
+	#------------------------------------------------------------
+	# Produce all valuated models
+	#------------------------------------------------------------
+	entries = []
+	jobs = []
+	for pi0_index, pi0_string in enumerate(pi0_strings):
+		try:
+			pi0_pairs = parse_pi0(pi0_string)
+		except Pi0ParseError as e:
+			print_warning('Reference valuation "' + pi0_string + '" skipped: ' + str(e))
+			entries.append({
+				'pi0'			: pi0_string,
+				'result'		: RESULT_ERROR,
+				'error'			: str(e),
+			})
+			continue
+		model_content = create_learning_model(parts, pi0_pairs)
+		
+		suffix = '-' + str(pi0_index)
+		exported_file_name = output_dir + os.path.basename(make_exported_file_name(original_model_name, suffix))
+		
+		entries.append({
+			'pi0'			: pi0_string,
+			'cv_file'		: exported_file_name,
+			'cache_key'		: compute_cache_key(model_content),
+			'output_model'	: output_dir + os.path.basename(os.path.splitext(original_model_name)[0]) + suffix + IMI_EXTENSION,
+		})
+		jobs.append((model_content, exported_file_name))
 	
-	# Build tag + header + A + Babs + specification + specification + updated init_definition
-	abstracted_model = '(*' + TAG_ABSTRACTION + "*)\n" + header + component_A + abstraction + specification + init_definition
-	if DEBUG_MODE:
-		print "\nFull abstracted model:"
-		print abstracted_model
+	#------------------------------------------------------------
+	# Learn all valuated models
+	#------------------------------------------------------------
+	# NOTE: identical valuated models are only learnt once (the others are then retrieved from the cache)
+	unique_jobs = []
+	first_job_index = {}
+	for entry, job in zip([entry for entry in entries if 'cache_key' in entry], jobs):
+		if entry['cache_key'] not in first_job_index:
+			first_job_index[entry['cache_key']] = len(unique_jobs)
+			unique_jobs.append(job)
+		else:
+			# NOTE: the model of a unique job is written by learn
+			(model_content, exported_file_name) = job
+			write_file_content(exported_file_name, model_content)
+	
+	print_to_screen('Learning ' + str(len(unique_jobs)) + ' distinct valuated model(s) using ' + str(nb_jobs) + ' worker(s)…')
+	
+	# NOTE: the work is done by external processes, so threads are sufficient
+	pool = ThreadPool(nb_jobs)
+	try:
+		learning_results = pool.map(learn_job, unique_jobs)
+	finally:
+		pool.close()
+		pool.join()
+	
+	#------------------------------------------------------------
+	# Classify the results
+	#------------------------------------------------------------
+	nb_results = {RESULT_ASSUMPTION : 0, RESULT_COUNTEREXAMPLE : 0, RESULT_ERROR : 0}
+	
+	for entry in entries:
+		# Malformed pi0
+		if 'cache_key' not in entry:
+			nb_results[RESULT_ERROR] += 1
+			print '    ' + entry['pi0'] + ': ' + entry['result']
+			continue
+		
+		(is_assumption, learning_output) = learning_results[first_job_index[entry['cache_key']]]
+		
+		if is_assumption is None:
+			entry['result'] = RESULT_ERROR
+			entry['error'] = learning_output
+			del entry['output_model']
+		else:
+			if is_assumption:
+				entry['result'] = RESULT_ASSUMPTION
+			else:
+				entry['result'] = RESULT_COUNTEREXAMPLE
+			write_file_content(entry['output_model'], create_result_model(parts, is_assumption, learning_output))
+		
+		nb_results[entry['result']] += 1
+		print '    ' + entry['pi0'] + ': ' + entry['result']
+	
+	report = {
+		'model'		: original_model_name,
+		'pi0_file'	: pi0_file_name,
+		'summary'	: nb_results,
+		'results'	: entries,
+	}
+	write_file_content(report_file_name, json.dumps(report, indent=1, sort_keys=True) + '\n')
+	
+	print_to_screen(str(nb_results[RESULT_ASSUMPTION]) + ' assumption(s), ' + str(nb_results[RESULT_COUNTEREXAMPLE]) + ' counter-example(s), ' + str(nb_results[RESULT_ERROR]) + ' error(s)')
+	print_to_screen('Report written to "' + report_file_name + '"')
 	
+	if nb_results[RESULT_ERROR] > 0:
+		fail_with('Learning failed for ' + str(nb_results[RESULT_ERROR]) + ' reference valuation(s)')
 
-#------------------------------------------------------------
-# Case: counter-example
-#------------------------------------------------------------
-else:
-	print_to_screen('Counter-example detected')
 
-	# Get the abstraction and format it to IMITATOR input
-	abstraction = format_abstraction(read_file_content(output_file))
+#************************************************************
+# PRELIMINARY CHECKS
+#************************************************************
 
-	# Add "& loc[Babs] = location_name"
-	if DEBUG_MODE:
-		print 'Adding the abstraction to the init definition…'
-	new_init_definition = re.sub('init\s+:=', 'init := ' + LEARNING_INIT_DEFINITION, init_definition)
-	# Check
-	if new_init_definition == init_definition:
-		fail_with('Could not find pattern "init :=" in the init definition')
-	init_definition = new_init_definition
-	if DEBUG_MODE:
-		print "\nUpdated init definition:"
-		print init_definition
-	
-	# TODO: Build tag + header + A + B + trace-automaton + specification + updated init_definition
-	abstracted_model = '(*' + TAG_COUNTEREXAMPLE + "*)\n" + header + component_A + component_B + abstraction + specification + init_definition
-	if DEBUG_MODE:
-		print "\nModel to replay the counter-example trace:"
-		print abstracted_model
+print_to_screen('*-**--***---****---***--**-*')
+print_to_screen('Hello, this is ' + THIS_SCRIPT_NAME + '!')
 
 
+# Check that the learning binary exists
+if not binary_exists(LEARNING_BINARY_NAME) :
+	fail_with('Binary "' + LEARNING_BINARY_NAME + '" does not exist')
 
-#------------------------------------------------------------
-# Move the result file to an archive location
-#------------------------------------------------------------
-# NOTE: otherwise, it will still be there at the next call
-new_location = new_model_name + '-output' + CV_EXTENSION
-print_to_screen('Moving learning result from "' + output_file + '" to "' + new_location + '"…')
-os.rename(output_file, new_location)
 
+#************************************************************
+# MAIN FUNCTION
+#************************************************************
+
+# NOTE: usages:
+#   interfaceCV.py <model> <new model name> <pi0>
+#   interfaceCV.py -batch <model> <pi0 list file> <report file (JSON)> [-jobs <number of workers>]
+
+if len(sys.argv) > 1 and sys.argv[1] == OPTION_BATCH:
+	arguments = sys.argv[2:]
+	nb_jobs = multiprocessing.cpu_count()
+	if len(arguments) == 5 and arguments[3] == OPTION_JOBS:
+		try:
+			nb_jobs = int(arguments[4])
+		except ValueError:
+			fail_with('Expected a number of workers after "' + OPTION_JOBS + '"')
+		if nb_jobs < 1:
+			fail_with('The number of workers must be positive')
+		arguments = arguments[:3]
+	if len(arguments) <> 3:
+		fail_with('Usage: ' + sys.argv[0] + ' ' + OPTION_BATCH + ' <model> <pi0 list file> <report file> [' + OPTION_JOBS + ' <number of workers>]')
+	run_batch(arguments[0], arguments[1], arguments[2], nb_jobs)
 
-#------------------------------------------------------------
-# Create file for IMITATOR
-#------------------------------------------------------------
-print_to_screen('Copying abstract model into "' + new_model_name + '"…')
-write_file_content(new_model_name, abstracted_model)
+else:
+	if len(sys.argv) <> 4:
+		fail_with("Exactly 3 arguments are expected")
+	run_single(sys.argv[1], sys.argv[2], sys.argv[3])
 
 
 #************************************************************
@@ -0,0 +1,434 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: parallel behavioral cartography (BCcover) without MPI: the reference parameter domain (v0) of the property is split into subdomains weighted by their predicted cost, a plain IMITATOR runs BCcover on each subdomain (local workers with work stealing), and the tiles are merged into a single result file
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from fractions import Fraction
+
+import imitator_utilities as iu
+
+# Cartography properties that can be split: their domain is the last argument
+SPLITTABLE_PROPERTIES = ['BCcover', 'PRPC']
+
+COMMENT_PATTERN = re.compile(r'\(\*.*?\*\)', re.DOTALL)
+PROPERTY_PATTERN = re.compile(r'property\s*:=\s*#synth\s+(\w+)\s*\((.*)\)\s*;', re.DOTALL)
+RANGE_PATTERN = re.compile(r'^&?\s*(\w+)\s*=\s*([-0-9/.]+)\s*\.\.\s*([-0-9/.]+)\s*$')
+POINT_PATTERN = re.compile(r'^&?\s*(\w+)\s*=\s*([-0-9/.]+)\s*$')
+STEP_PATTERN = re.compile(r'^\s*step\s*=\s*([0-9/.]+)\s*$')
+
+SEPARATOR = '(' + '*' * 60 + ')'
+TILE_PATTERN = re.compile(r'\(\*{60}\)\n Tile #(\d+)\n(.*?)\n\(\*{60}\)\n', re.DOTALL)
+TILE_CONSTRAINT_PATTERN = re.compile(r'\n K\d+:\n(.*?)\n\n-{60}', re.DOTALL)
+TILE_STATES_PATTERN = re.compile(r'^Local number of states\s*:\s*(\d+)', re.MULTILINE)
+
+# Coverages of BC, from the best to the worst
+COVERAGES = ['full', 'integer-complete', 'unknown', 'empty']
+
+
+# ************************************************************
+# PARAMETER DOMAIN
+# ************************************************************
+
+# Cartography property: kind, text of the arguments before the domain (e.g., the property of PRPC), domain, step
+#   domain: list of (parameter, lower bound, upper bound) (the bounds are equal for fixed parameters)
+class CartographyProperty:
+    def __init__(self, kind, prefix, domain, step):
+        self.kind = kind
+        self.prefix = prefix
+        self.domain = domain
+        self.step = step
+
+    # Text of the property restricted to a subdomain
+    def text(self, domain):
+        lines = []
+        for parameter, lower, upper in domain:
+            lines.append('\t%s = %s' % (parameter, lower) if lower == upper else '\t%s = %s..%s' % (parameter, lower, upper))
+        text = 'property := #synth ' + self.kind + '(\n'
+        if self.prefix:
+            text += self.prefix + '\n\t,\n'
+        text += '\n'.join(lines) + '\n'
+        if self.step != 1:
+            text += '\t,\n\tstep = ' + str(self.step) + '\n'
+        return text + ');\n'
+
+
+def parse_property_file(property_file):
+    with open(property_file) as f:
+        content = COMMENT_PATTERN.sub('', f.read())
+    m = PROPERTY_PATTERN.search(content)
+    if not m or m.group(1) not in SPLITTABLE_PROPERTIES:
+        raise ValueError('The property must be one of: ' + ', '.join('#synth ' + kind for kind in SPLITTABLE_PROPERTIES))
+    kind = m.group(1)
+    arguments = [argument.strip() for argument in m.group(2).split(',')]
+    step = Fraction(1)
+    if arguments and STEP_PATTERN.match(arguments[-1]):
+        step = Fraction(STEP_PATTERN.match(arguments.pop()).group(1))
+    prefix = ',\n'.join(arguments[:-1])
+    domain = []
+    for line in arguments[-1].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        m = RANGE_PATTERN.match(line)
+        if m:
+            domain.append((m.group(1), Fraction(m.group(2)), Fraction(m.group(3))))
+            continue
+        m = POINT_PATTERN.match(line)
+        if m:
+            domain.append((m.group(1), Fraction(m.group(2)), Fraction(m.group(2))))
+            continue
+        raise ValueError('Cannot parse the domain line "' + line + '"')
+    return CartographyProperty(kind, prefix, domain, step)
+
+
+# Values of one dimension of a domain
+def dimension_values(lower, upper, step):
+    values = []
+    value = lower
+    while value <= upper:
+        values.append(value)
+        value += step
+    return values
+
+
+def domain_size(domain, step):
+    return math.prod(len(dimension_values(lower, upper, step)) for _, lower, upper in domain)
+
+
+# ************************************************************
+# COST PREDICTION
+# ************************************************************
+
+# Predicted cost of the points: number of states of the tile of a previous result containing the point (or the average number of states if no tile contains it); uniform without previous result
+class CostModel:
+    def __init__(self, tiles=()):
+        self.tiles = []
+        for tile in tiles:
+            try:
+                # NOTE: a tile with good and bad valuations covers both
+                self.tiles.append((iu.parse_constraint(tile['constraint'].replace('<good|bad>', 'OR')), tile['states']))
+            except iu.ConstraintParseError:
+                pass
+        self.default = sum(states for _, states in self.tiles) / len(self.tiles) if self.tiles else 1
+
+    def point_cost(self, valuation):
+        for constraint, states in self.tiles:
+            if iu.satisfies(constraint, valuation):
+                return states
+        return self.default
+
+    def cost(self, domain, step):
+        if not self.tiles:
+            return domain_size(domain, step)
+        dimensions = [(parameter, dimension_values(lower, upper, step)) for parameter, lower, upper in domain]
+        return sum(self.point_cost(valuation) for valuation in iter_valuations(dimensions))
+
+    # Cost of each slice of the domain along one dimension
+    def slice_costs(self, domain, step, dimension):
+        parameter, lower, upper = domain[dimension]
+        costs = []
+        for value in dimension_values(lower, upper, step):
+            costs.append(self.cost(domain[:dimension] + [(parameter, value, value)] + domain[dimension + 1:], step))
+        return costs
+
+
+def iter_valuations(dimensions):
+    if not dimensions:
+        yield {}
+        return
+    parameter, values = dimensions[0]
+    for valuation in iter_valuations(dimensions[1:]):
+        for value in values:
+            valuation[parameter] = value
+            yield dict(valuation)
+
+
+# Split a domain in two parts of close costs, along the dimension with the most values; None if the domain is a single point
+def split_domain(domain, step, cost_model):
+    sizes = [len(dimension_values(lower, upper, step)) for _, lower, upper in domain]
+    dimension = max(range(len(domain)), key=lambda d: sizes[d])
+    if sizes[dimension] < 2:
+        return None
+    parameter, lower, upper = domain[dimension]
+    values = dimension_values(lower, upper, step)
+    costs = cost_model.slice_costs(domain, step, dimension) if cost_model.tiles else [1] * len(values)
+    # Cut minimizing the difference between both parts
+    total = sum(costs)
+    best_cut, best_difference, left = 1, None, 0
+    for cut in range(1, len(values)):
+        left += costs[cut - 1]
+        difference = abs(total - 2 * left)
+        if best_difference is None or difference < best_difference:
+            best_cut, best_difference = cut, difference
+    first = domain[:dimension] + [(parameter, values[0], values[best_cut - 1])] + domain[dimension + 1:]
+    second = domain[:dimension] + [(parameter, values[best_cut], values[-1])] + domain[dimension + 1:]
+    return first, second
+
+
+# Split the domain into (at least) nb_subdomains subdomains by repeatedly splitting the most costly one
+def split_into_subdomains(domain, step, cost_model, nb_subdomains):
+    subdomains = [(cost_model.cost(domain, step), domain)]
+    while len(subdomains) < nb_subdomains:
+        subdomains.sort(key=lambda subdomain: subdomain[0], reverse=True)
+        for i, (_, subdomain) in enumerate(subdomains):
+            parts = split_domain(subdomain, step, cost_model)
+            if parts is not None:
+                subdomains[i:i + 1] = [(cost_model.cost(part, step), part) for part in parts]
+                break
+        else:
+            break
+    return sorted(subdomains, key=lambda subdomain: subdomain[0], reverse=True)
+
+
+# ************************************************************
+# SCHEDULING
+# ************************************************************
+
+# Work stealing: each worker has its own deque of subdomains (cost, domain), initially balanced by predicted cost; it takes the most costly subdomain of its deque, and once empty steals the least costly subdomain of the most loaded worker (splitting it if it is the last one)
+class WorkStealingScheduler:
+    def __init__(self, subdomains, nb_workers, step, cost_model):
+        self.step = step
+        self.cost_model = cost_model
+        self.lock = threading.Lock()
+        self.deques = [deque() for _ in range(nb_workers)]
+        loads = [0] * nb_workers
+        # Longest processing time first
+        for cost, domain in subdomains:
+            worker = loads.index(min(loads))
+            self.deques[worker].append((cost, domain))
+            loads[worker] += cost
+        self.nb_steals = 0
+
+    def load(self, worker):
+        return sum(cost for cost, _ in self.deques[worker])
+
+    def next_subdomain(self, worker):
+        with self.lock:
+            if self.deques[worker]:
+                return self.deques[worker].popleft()
+            victims = [w for w in range(len(self.deques)) if self.deques[w]]
+            if not victims:
+                return None
+            victim = max(victims, key=self.load)
+            cost, domain = self.deques[victim].pop()
+            if not self.deques[victim]:
+                # NOTE: the last subdomain of the victim is shared between both workers
+                parts = split_domain(domain, self.step, self.cost_model)
+                if parts is not None:
+                    self.deques[victim].append((self.cost_model.cost(parts[0], self.step), parts[0]))
+                    cost, domain = self.cost_model.cost(parts[1], self.step), parts[1]
+            self.nb_steals += 1
+            return cost, domain
+
+
+# Run BC on the subdomains with nb_workers workers; returns the list of runs (domain, execution, content of the result file)
+def run_workers(cartography, model_file, subdomains, nb_workers, cost_model, options, binary, timeout, work_dir):
+    scheduler = WorkStealingScheduler(subdomains, nb_workers, cartography.step, cost_model)
+    runs = []
+    runs_lock = threading.Lock()
+
+    def worker(index):
+        while True:
+            item = scheduler.next_subdomain(index)
+            if item is None:
+                return
+            _, domain = item
+            with runs_lock:
+                number = len(runs)
+                runs.append(None)
+            sandbox_dir = os.path.join(work_dir, 'subdomain%d' % number)
+            os.makedirs(sandbox_dir)
+            execution = iu.run_imitator(sandbox_dir, 'bc', model_file=model_file, property_text=cartography.text(domain), options=options, binary=binary, timeout=timeout)
+            content = None
+            if execution.status == iu.STATUS_OK and os.path.isfile(execution.res_file):
+                with open(execution.res_file) as f:
+                    content = f.read()
+            with runs_lock:
+                runs[number] = (domain, execution, content)
+                print('  [worker %d] %s: %s (%.1f s)' % (index + 1, describe_domain(domain), execution.status, execution.wall_time), flush=True)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(nb_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return runs, scheduler.nb_steals
+
+
+def describe_domain(domain):
+    return ', '.join('%s = %s' % (parameter, lower) if lower == upper else '%s = %s..%s' % (parameter, lower, upper) for parameter, lower, upper in domain)
+
+
+# ************************************************************
+# MERGING
+# ************************************************************
+
+# Tiles of a BC result file: list of dictionaries with keys 'text' (block after the title), 'constraint', 'states'
+def parse_tiles(content):
+    tiles = []
+    for m in TILE_PATTERN.finditer(content):
+        text = m.group(2)
+        constraint = TILE_CONSTRAINT_PATTERN.search(text)
+        states = TILE_STATES_PATTERN.search(text)
+        tiles.append({
+            'number': int(m.group(1)),
+            'text': text,
+            'constraint': constraint.group(1).strip() if constraint else '',
+            'states': int(states.group(1)) if states else 0,
+        })
+    return tiles
+
+
+def bc_statistic(content, label):
+    m = re.search('^' + re.escape(label) + r'\s*:\s*(.+?)\s*$', content, re.MULTILINE)
+    return m.group(1) if m else None
+
+
+# NOTE: the tiles of neighbouring subdomains may be identical (a tile is not restricted to its subdomain): the tiles are identified by their sorted inequalities
+def tile_key(tile):
+    return tuple(sorted(line.lstrip('& ').strip() for line in tile['constraint'].splitlines()))
+
+
+# Renumber a tile (title, Pi and K)
+def renumber_tile(tile, number):
+    text = re.sub(r'^ Pi\d+:', ' Pi%d:' % number, tile['text'], flags=re.MULTILINE)
+    text = re.sub(r'^ K\d+:', ' K%d:' % number, text, flags=re.MULTILINE)
+    return SEPARATOR + '\n Tile #%d\n' % number + text + '\n' + SEPARATOR + '\n'
+
+
+def merge_results(cartography, runs, wall_time, nb_workers, nb_steals):
+    tiles = []
+    keys = set()
+    nb_duplicates = 0
+    coverage = 'full'
+    terminations = set()
+    nb_unsuccessful = 0
+    failed = []
+    for domain, _, content in runs:
+        if content is None:
+            failed.append(domain)
+            coverage = 'unknown'
+            continue
+        for tile in parse_tiles(content):
+            key = tile_key(tile)
+            if key in keys:
+                nb_duplicates += 1
+                continue
+            keys.add(key)
+            tiles.append(tile)
+        run_coverage = bc_statistic(content, 'Coverage') or 'unknown'
+        if run_coverage in COVERAGES and COVERAGES.index(run_coverage) > COVERAGES.index(coverage):
+            coverage = run_coverage
+        terminations.add(bc_statistic(content, 'Termination') or 'unknown')
+        nb_unsuccessful += int(bc_statistic(content, 'Number of unsuccessful points') or 0)
+    # NOTE: each run only covers its own closed subdomain, and the (non-integer) gaps between adjacent subdomains (e.g., a in (4, 5) between a=0..4 and a=5..10) are never explored: a full coverage of each subdomain only implies an integer-complete coverage of v0
+    if coverage == 'full' and len(runs) > 1:
+        coverage = 'integer-complete'
+
+    average_states = sum(tile['states'] for tile in tiles) / len(tiles) if tiles else 0
+    text = SEPARATOR + '\n Parallel behavioral cartography (bc-parallel.py)\n' + SEPARATOR + '\n'
+    text += '\n------------------------------------------------------------'
+    text += '\n Reference parameter domain:\n' + describe_domain(cartography.domain).replace(', ', '\n')
+    text += '\n------------------------------------------------------------\n'
+    text += '\n' + '\n'.join(renumber_tile(tile, number + 1) for number, tile in enumerate(tiles)) + '\n'
+    text += '\n' + SEPARATOR + '\nGENERAL STATISTICS\n' + SEPARATOR
+    text += '\n------------------------------------------------------------'
+    text += '\nNumber of integers in v0                : %d' % domain_size(cartography.domain, cartography.step)
+    text += '\nNumber of tiles computed                : %d' % len(tiles)
+    text += '\nCoverage                                : ' + coverage
+    text += '\nTermination                             : ' + (terminations.pop() if len(terminations) == 1 else 'unknown')
+    text += '\nNumber of unsuccessful points           : %d' % nb_unsuccessful
+    text += '\nAverage number of states                : %.1f' % average_states
+    text += '\nTotal computation time                  : %.3f seconds' % wall_time
+    text += '\nNumber of subdomains                    : %d' % len(runs)
+    text += '\nNumber of failed subdomains             : %d' % len(failed)
+    text += '\nNumber of duplicate tiles removed       : %d' % nb_duplicates
+    text += '\nNumber of workers                       : %d' % nb_workers
+    text += '\nNumber of steals                        : %d' % nb_steals
+    text += '\n------------------------------------------------------------\n'
+    for domain in failed:
+        text += 'Failed subdomain: ' + describe_domain(domain) + '\n'
+    return text, tiles, failed
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Parallel behavioral cartography (BCcover, PRPC) on a single machine, without MPI')
+    parser.add_argument('model', help='Model (.imi)')
+    parser.add_argument('property', help='Property (.imiprop) with #synth BCcover or #synth PRPC')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of IMITATOR processes in parallel (default: number of cores)')
+    parser.add_argument('--subdomains-per-worker', type=int, default=4, help='Initial number of subdomains per worker (default: 4)')
+    parser.add_argument('--previous', default=None, help='Result of a previous cartography of the model, used to predict the cost of the points')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator)')
+    parser.add_argument('--options', nargs=argparse.REMAINDER, default=[], help='Additional options for IMITATOR (must come last: all the following arguments are passed to IMITATOR)')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit for each subdomain (in seconds)')
+    parser.add_argument('--output', default=None, help='Merged result file (default: <model>-bc-parallel.res)')
+    parser.add_argument('--draw', default=None, help='Also draw the cartography in this image (.svg or .png) with cartography-render.py')
+    parser.add_argument('--keep', action='store_true', help='Keep the directories of the subdomains')
+    args = parser.parse_args()
+
+    try:
+        cartography = parse_property_file(args.property)
+    except ValueError as e:
+        print('Error: %s' % e)
+        sys.exit(1)
+
+    cost_model = CostModel()
+    if args.previous is not None:
+        with open(args.previous) as f:
+            cost_model = CostModel(parse_tiles(f.read()))
+        print('Cost model: %d tiles of %s' % (len(cost_model.tiles), args.previous))
+
+    nb_workers = max(1, args.workers)
+    subdomains = split_into_subdomains(cartography.domain, cartography.step, cost_model, nb_workers * args.subdomains_per_worker)
+    print('%s over %d points: %d subdomains, %d workers' % (cartography.kind, domain_size(cartography.domain, cartography.step), len(subdomains), nb_workers), flush=True)
+
+    work_dir = iu.create_sandbox(prefix='bc_parallel_')
+    start = time.time()
+    try:
+        runs, nb_steals = run_workers(cartography, args.model, subdomains, nb_workers, cost_model, iu.split_options(args.options), args.imitator, args.timeout, work_dir)
+        wall_time = time.time() - start
+        text, tiles, failed = merge_results(cartography, runs, wall_time, nb_workers, nb_steals)
+    finally:
+        if args.keep:
+            print('Subdomains kept in ' + work_dir)
+        else:
+            shutil.rmtree(work_dir)
+
+    output = args.output or os.path.splitext(args.model)[0] + '-bc-parallel' + iu.RES_EXTENSION
+    with open(output, 'w') as f:
+        f.write(text)
+    print('%d tiles (%d steals) in %.1f s; result written to %s' % (len(tiles), nb_steals, wall_time, output))
+    if args.draw is not None:
+        subprocess.call([sys.executable, os.path.join(iu.SCRIPTS_PATH, 'cartography-render.py'), output, '--output', args.draw, '--property', args.property])
+    if failed:
+        print('%d subdomain(s) failed' % len(failed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    __main__()
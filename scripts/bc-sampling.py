@@ -0,0 +1,322 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: adaptive cartography by point sampling: uncovered integer points of the reference parameter domain (v0) are sampled (randomly or with a low-discrepancy sequence), point-based synthesis (IM, PRP) is run on them by local workers, and the tiles are rasterized into a coverage bitmap of v0 until a target coverage or a time budget is reached
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import concurrent.futures
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+import imitator_utilities as iu
+
+bc_parallel = iu.load_script('bc-parallel.py', 'bc_parallel')
+
+# Point-based algorithm used for each cartography property
+POINT_ALGORITHMS = {
+    'BCcover': 'IM',
+    'PRPC': 'PRP',
+}
+
+SAMPLING_RANDOM = 'random'
+SAMPLING_HALTON = 'halton'
+
+# Number of consecutive covered (or already run) samples after which the next uncovered point is searched in the bitmap
+MAX_REJECTIONS = 100
+
+
+# ************************************************************
+# COVERAGE BITMAP
+# ************************************************************
+
+# Coverage of the integer points of v0: one byte per point (1 if covered), the last dimension varying fastest
+# NOTE: a second bitmap records the points either covered or already run (even unsuccessfully), so that they are not sampled again
+class CoverageGrid:
+    def __init__(self, domain, step):
+        self.dimensions = [(parameter, bc_parallel.dimension_values(lower, upper, step)) for parameter, lower, upper in domain]
+        self.step = step
+        self.sizes = [len(values) for _, values in self.dimensions]
+        self.size = math.prod(self.sizes)
+        self.bitmap = bytearray(self.size)
+        self.attempted = bytearray(self.size)
+        self.nb_covered = 0
+
+    def coverage(self):
+        return self.nb_covered / self.size
+
+    def is_covered(self, index):
+        return self.bitmap[index] == 1
+
+    def is_attempted(self, index):
+        return self.attempted[index] == 1
+
+    def valuation(self, index):
+        positions = []
+        for size in reversed(self.sizes):
+            index, position = divmod(index, size)
+            positions.append(position)
+        return {parameter: values[position] for (parameter, values), position in zip(self.dimensions, reversed(positions))}
+
+    def index(self, positions):
+        index = 0
+        for position, size in zip(positions, self.sizes):
+            index = index * size + position
+        return index
+
+    # Mark the points [start, end) of a row (last dimension) as covered
+    def cover_row(self, start, end):
+        if start >= end:
+            return
+        self.nb_covered += self.bitmap.count(0, start, end)
+        self.bitmap[start:end] = b'\x01' * (end - start)
+        self.attempted[start:end] = b'\x01' * (end - start)
+
+    # Mark a point as run (not covered unless inside a tile)
+    def attempt_point(self, index):
+        self.attempted[index] = 1
+
+    # Mark the points satisfying a constraint (list of convex disjuncts) as covered
+    # NOTE: for each row of the last dimension, the interval of the last parameter is computed once and the whole row segment is filled; only the endpoints are checked exactly (strict inequalities)
+    def rasterize(self, constraint):
+        parameter, values = self.dimensions[-1]
+        first = values[0]
+        last_size = self.sizes[-1]
+        nb_rows = self.size // last_size
+        for disjunct in constraint:
+            for row in range(nb_rows):
+                valuation = self.valuation(row * last_size)
+                interval = iu.parameter_interval(disjunct, parameter, valuation)
+                if interval is None:
+                    continue
+                lower, upper = interval
+                low = 0 if lower is None else max(0, math.ceil((lower - first) / self.step))
+                high = last_size - 1 if upper is None else min(last_size - 1, math.floor((upper - first) / self.step))
+                while low <= high and not self.point_satisfies(disjunct, valuation, parameter, values[low]):
+                    low += 1
+                while high >= low and not self.point_satisfies(disjunct, valuation, parameter, values[high]):
+                    high -= 1
+                self.cover_row(row * last_size + low, row * last_size + high + 1)
+
+    @staticmethod
+    def point_satisfies(disjunct, valuation, parameter, value):
+        valuation[parameter] = value
+        return all(iu.satisfies_inequality(inequality, valuation) for inequality in disjunct)
+
+    # First point neither covered nor run from the index (wrapping around), or None if there is none
+    def find_unattempted(self, start=0):
+        index = self.attempted.find(0, start)
+        if index < 0:
+            index = self.attempted.find(0, 0, start)
+        return None if index < 0 else index
+
+
+# ************************************************************
+# SAMPLING
+# ************************************************************
+
+FIRST_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+
+# i-th element of the van der Corput sequence in the given base
+def van_der_corput(i, base):
+    value, denominator = 0.0, 1.0
+    while i > 0:
+        i, digit = divmod(i, base)
+        denominator *= base
+        value += digit / denominator
+    return value
+
+
+# Generator of candidate points (indexes in the grid), neither covered, nor run, nor pending
+class Sampler:
+    def __init__(self, grid, method, seed):
+        self.grid = grid
+        self.method = method
+        self.rng = random.Random(seed)
+        self.halton_index = 0
+        if method == SAMPLING_HALTON and len(grid.sizes) > len(FIRST_PRIMES):
+            raise ValueError('Halton sampling supports at most %d dimensions' % len(FIRST_PRIMES))
+
+    def candidate(self):
+        if self.method == SAMPLING_RANDOM:
+            return self.rng.randrange(self.grid.size)
+        self.halton_index += 1
+        return self.grid.index([min(size - 1, int(van_der_corput(self.halton_index, base) * size)) for size, base in zip(self.grid.sizes, FIRST_PRIMES)])
+
+    # Next point to run, or None if none is available
+    def next_point(self, pending):
+        for _ in range(MAX_REJECTIONS):
+            index = self.candidate()
+            if not self.grid.is_attempted(index) and index not in pending:
+                return index
+        # NOTE: most of the candidates are covered: search the bitmap
+        index = self.grid.find_unattempted(self.rng.randrange(self.grid.size))
+        nb_pending_found = 0
+        while index is not None and index in pending:
+            nb_pending_found += 1
+            # All the uncovered points are pending
+            if nb_pending_found > len(pending):
+                return None
+            index = self.grid.find_unattempted((index + 1) % self.grid.size)
+        return index
+
+
+# ************************************************************
+# RUNNING
+# ************************************************************
+
+def point_property(cartography, algorithm, valuation):
+    text = 'property := #synth ' + algorithm + '(\n'
+    if cartography.prefix:
+        text += cartography.prefix + '\n\t,\n'
+    text += '\n'.join('\t& %s = %s' % (parameter, value) for parameter, value in valuation.items())
+    return text + '\n);\n'
+
+
+# Run the point-based algorithm on one point; returns the parsed result file (or None) and the execution
+def run_point(work_dir, number, model_file, property_text, options, binary, timeout):
+    sandbox_dir = os.path.join(work_dir, 'point%d' % number)
+    os.makedirs(sandbox_dir)
+    execution = iu.run_imitator(sandbox_dir, 'point', model_file=model_file, property_text=property_text, options=options, binary=binary, timeout=timeout)
+    result = execution.result() if execution.status == iu.STATUS_OK else None
+    shutil.rmtree(sandbox_dir)
+    return result, execution
+
+
+def describe_valuation(valuation):
+    return '\n& '.join('%s = %s' % (parameter, value) for parameter, value in valuation.items())
+
+
+def tile_text(number, valuation, result):
+    return (bc_parallel.SEPARATOR + '\n Tile #%d\n' % number
+        + '\n Pi%d:\n  %s\n' % (number, describe_valuation(valuation))
+        + '\n K%d:\n %s\n' % (number, result['constraint'])
+        + '\n------------------------------------------------------------'
+        + '\nConstraint soundness          : %s' % result['soundness']
+        + '\nTermination                   : %s' % result['termination']
+        + '\nConstraint nature             : %s' % result['nature']
+        + '\n------------------------------------------------------------'
+        + '\nLocal number of states        : %s' % result['states']
+        + '\nLocal number of transitions   : %s' % result['transitions']
+        + '\n------------------------------------------------------------'
+        + '\n' + bc_parallel.SEPARATOR + '\n')
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Adaptive cartography by sampling uncovered points of the parameter domain, with local workers')
+    parser.add_argument('model', help='Model (.imi)')
+    parser.add_argument('property', help='Property (.imiprop) with #synth BCcover or #synth PRPC (defining v0)')
+    parser.add_argument('--sampling', choices=[SAMPLING_RANDOM, SAMPLING_HALTON], default=SAMPLING_HALTON, help='Sampling of the points (default: halton)')
+    parser.add_argument('--coverage', type=float, default=1.0, help='Stop when this ratio of the integer points is covered (default: 1.0)')
+    parser.add_argument('--budget', type=float, default=None, help='Stop launching points after this time (in seconds)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of IMITATOR processes in parallel (default: number of cores)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random sampling (default: 0)')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator)')
+    parser.add_argument('--options', nargs=argparse.REMAINDER, default=[], help='Additional options for IMITATOR (must come last: all the following arguments are passed to IMITATOR)')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit for each point (in seconds)')
+    parser.add_argument('--draw', default=None, help='Also draw the cartography in this image (.svg or .png) with cartography-render.py')
+    parser.add_argument('--output', default=None, help='Result file (default: <model>-bc-sampling.res)')
+    args = parser.parse_args()
+
+    try:
+        cartography = bc_parallel.parse_property_file(args.property)
+        grid = CoverageGrid(cartography.domain, cartography.step)
+        sampler = Sampler(grid, args.sampling, args.seed)
+    except ValueError as e:
+        print('Error: %s' % e)
+        sys.exit(1)
+    algorithm = POINT_ALGORITHMS[cartography.kind]
+    print('%s over %d points with %s (%s sampling, %d workers)' % (cartography.kind, grid.size, algorithm, args.sampling, args.workers), flush=True)
+
+    work_dir = iu.create_sandbox(prefix='bc_sampling_')
+    tiles = []
+    nb_unsuccessful = 0
+    start = time.time()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            # Future => index of the point
+            pending = {}
+            nb_launched = 0
+            while True:
+                stop = grid.coverage() >= args.coverage or (args.budget is not None and time.time() - start >= args.budget)
+                while not stop and len(pending) < args.workers:
+                    index = sampler.next_point(set(pending.values()))
+                    if index is None:
+                        break
+                    valuation = grid.valuation(index)
+                    future = executor.submit(run_point, work_dir, nb_launched, args.model, point_property(cartography, algorithm, valuation), iu.split_options(args.options), args.imitator, args.timeout)
+                    pending[future] = index
+                    nb_launched += 1
+                if not pending:
+                    break
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    valuation = grid.valuation(index)
+                    result, execution = future.result()
+                    constraint = None
+                    if result is not None and result['constraint'] is not None:
+                        try:
+                            # NOTE: a constraint with good and bad valuations covers both
+                            constraint = iu.parse_constraint(result['constraint'].replace('<good|bad>', 'OR'))
+                        except iu.ConstraintParseError:
+                            constraint = None
+                    if constraint is None:
+                        nb_unsuccessful += 1
+                    else:
+                        grid.rasterize(constraint)
+                        tiles.append(tile_text(len(tiles) + 1, valuation, result))
+                    # NOTE: the point is not sampled again, but it is only covered if inside a tile
+                    grid.attempt_point(index)
+                    print('  %s: %s (%.1f s), coverage %.1f%%' % (', '.join('%s = %s' % item for item in valuation.items()), execution.status, execution.wall_time, 100 * grid.coverage()), flush=True)
+    finally:
+        shutil.rmtree(work_dir)
+    wall_time = time.time() - start
+
+    text = bc_parallel.SEPARATOR + '\n Cartography by sampling (bc-sampling.py)\n' + bc_parallel.SEPARATOR + '\n'
+    text += '\n------------------------------------------------------------'
+    text += '\n Reference parameter domain:\n' + bc_parallel.describe_domain(cartography.domain).replace(', ', '\n')
+    text += '\n------------------------------------------------------------\n'
+    text += '\n' + '\n'.join(tiles) + '\n'
+    text += '\n' + bc_parallel.SEPARATOR + '\nGENERAL STATISTICS\n' + bc_parallel.SEPARATOR
+    text += '\n------------------------------------------------------------'
+    text += '\nNumber of integers in v0                : %d' % grid.size
+    text += '\nNumber of tiles computed                : %d' % len(tiles)
+    text += '\nCoverage                                : ' + ('integer-complete' if grid.nb_covered == grid.size and nb_unsuccessful == 0 else 'unknown')
+    text += '\nCoverage ratio                          : %.4f' % grid.coverage()
+    text += '\nNumber of unsuccessful points           : %d' % nb_unsuccessful
+    text += '\nTotal computation time                  : %.3f seconds' % wall_time
+    text += '\nSampling                                : ' + args.sampling
+    text += '\nNumber of workers                       : %d' % args.workers
+    text += '\n------------------------------------------------------------\n'
+
+    output = args.output or os.path.splitext(args.model)[0] + '-bc-sampling' + iu.RES_EXTENSION
+    with open(output, 'w') as f:
+        f.write(text)
+    print('%d tiles, coverage %.1f%% in %.1f s; result written to %s' % (len(tiles), 100 * grid.coverage(), wall_time, output))
+    if args.draw is not None:
+        subprocess.call([sys.executable, os.path.join(iu.SCRIPTS_PATH, 'cartography-render.py'), output, '--output', args.draw, '--property', args.property])
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: benchmark of the JSON scheduling-model generator (json-parser-both.py)
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Path to the generator
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'json-parser-both.py')
+
+
+# Task set with n pipelines of two tasks: the first task of each pipeline runs on a preemptive CPU, the second one on a non-preemptive CPU
+# NOTE: both CPUs then run n tasks, which is the worst case for the size of the generated model
+def make_task_set(n):
+    pipelines = []
+    for p in range(1, n + 1):
+        tasks = [
+            {'id': str(10 * p + 1), 'wcet': '2', 'prio': str(p), 'cpu': '1', 'seq': '0'},
+            {'id': str(10 * p + 2), 'wcet': '3', 'prio': str(n + 1 - p), 'cpu': '2', 'seq': '1'},
+        ]
+        pipelines.append({'id': str(p), 'period': str(100 * n), 'dline': str(100 * n), 'TASKS': tasks})
+    return {
+        'CPUS': [{'id': '1', 'type': 'preemptive'}, {'id': '2', 'type': 'nonpreemptive'}],
+        'PIPELINES': pipelines,
+    }
+
+
+# Generate the IMITATOR model for n tasks per CPU; returns (time in seconds, size of the model in bytes)
+def run_generator(sandbox_dir, n, prune):
+    input_file = os.path.join(sandbox_dir, 'taskset' + str(n) + '.json')
+    with open(input_file, 'w') as f:
+        json.dump(make_task_set(n), f)
+
+    start = time.time()
+    cmd = [sys.executable, GENERATOR, input_file, '11', '21', '--imitator']
+    if prune:
+        cmd.append('--prune')
+    subprocess.run(cmd, cwd=sandbox_dir, stdout=subprocess.DEVNULL, check=True)
+    duration = time.time() - start
+
+    model_file = os.path.splitext(input_file)[0] + '.imi'
+    size = os.path.getsize(model_file)
+    # Do not keep large models
+    os.remove(model_file)
+    return duration, size
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Benchmark of the JSON scheduling-model generator')
+    parser.add_argument('--min-tasks', type=int, default=2, help='Smallest number of tasks per CPU')
+    parser.add_argument('--max-tasks', type=int, default=14, help='Largest number of tasks per CPU')
+    parser.add_argument('--prune', action='store_true', help='Only generate the reachable ready sets')
+    parser.add_argument('--time-limit', type=float, default=None, help='Fail if generating one model takes more than this time (in seconds)')
+    args = parser.parse_args()
+
+    sandbox_dir = tempfile.mkdtemp(prefix='benchmark_json_parser_')
+
+    print('tasks per CPU; time (s); model size (bytes)')
+    failed = False
+    try:
+        for n in range(args.min_tasks, args.max_tasks + 1):
+            duration, size = run_generator(sandbox_dir, n, args.prune)
+            print('%d; %.3f; %d' % (n, duration, size))
+            if args.time_limit is not None and duration > args.time_limit:
+                print('Time limit of %.1f s exceeded for %d tasks per CPU' % (args.time_limit, n))
+                failed = True
+                break
+    finally:
+        shutil.rmtree(sandbox_dir)
+
+    sys.exit(1 if failed else 0)
+
+
+__main__()
@@ -0,0 +1,503 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: fast rendering of a cartography from the tiles of result files (BC results, -tiles-files outputs, or results of bc-parallel.py / bc-sampling.py): the tile constraints are projected onto two parameters, clipped into polygons and drawn in SVG or PNG (good tiles in green, bad tiles in red), possibly as a pyramid of image tiles with several levels of detail
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import math
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from fractions import Fraction
+
+import imitator_utilities as iu
+
+bc_parallel = iu.load_script('bc-parallel.py', 'bc_parallel')
+
+
+# ************************************************************
+# CONFIGURATION
+# ************************************************************
+
+NATURE_GOOD = 'good'
+NATURE_BAD = 'bad'
+NATURE_UNKNOWN = 'unknown'
+
+# Nature => (fill colour, outline colour)
+COLOURS = {
+    NATURE_GOOD: ((144, 210, 144), (46, 125, 50)),
+    NATURE_BAD: ((240, 138, 138), (198, 40, 40)),
+    NATURE_UNKNOWN: ((200, 200, 200), (117, 117, 117)),
+}
+BACKGROUND = (255, 255, 255)
+
+# Outlines are drawn only for tiles of at least this size (in pixels)
+MIN_OUTLINE_SIZE = 6
+
+# Default size of the images (in pixels)
+DEFAULT_SIZE = 800
+
+TILE_NATURE_PATTERN = re.compile(r'^Constraint nature\s*:\s*(\S+)', re.MULTILINE)
+
+
+# ************************************************************
+# READING THE TILES
+# ************************************************************
+
+# A tile to draw: constraint (of imitator_utilities) and nature
+class Tile:
+    def __init__(self, constraint, nature):
+        self.constraint = constraint
+        self.nature = nature
+
+
+# Parsed inequalities shared by the tiles
+inequality_cache = {}
+
+
+# Tiles of a constraint text with its nature; a constraint with good and bad valuations gives a good tile and a bad tile
+def constraint_tiles(text, nature):
+    if '<good|bad>' in text:
+        good, bad = text.split('<good|bad>', 1)
+        return [Tile(iu.parse_constraint(good, inequality_cache), NATURE_GOOD), Tile(iu.parse_constraint(bad, inequality_cache), NATURE_BAD)]
+    if nature not in COLOURS:
+        nature = NATURE_UNKNOWN
+    return [Tile(iu.parse_constraint(text, inequality_cache), nature)]
+
+
+# Tiles of a result file: the tiles of a cartography result, or the constraint of a single result file (e.g., one of -tiles-files)
+def read_tiles(res_file):
+    with open(res_file) as f:
+        content = f.read()
+    tiles = []
+    cartography_tiles = bc_parallel.parse_tiles(content)
+    if cartography_tiles:
+        for tile in cartography_tiles:
+            m = TILE_NATURE_PATTERN.search(tile['text'])
+            tiles += constraint_tiles(tile['constraint'], m.group(1) if m else NATURE_UNKNOWN)
+        return tiles
+    result = iu.parse_res(content)
+    if result['constraint'] is None:
+        return []
+    return constraint_tiles(result['constraint'], result['nature'])
+
+
+# Result files given on the command line (directories are replaced with their result files)
+def result_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(iu.RES_EXTENSION))
+        else:
+            files.append(path)
+    return files
+
+
+# ************************************************************
+# PROJECTION
+# ************************************************************
+
+# Substitute a value to a parameter in an inequality; returns the new inequality
+def substitute(inequality, parameter, value):
+    coefficients, constant, operator = inequality
+    if parameter not in coefficients:
+        return inequality
+    coefficients = dict(coefficients)
+    constant = constant + coefficients.pop(parameter) * value
+    return (coefficients, constant, operator)
+
+
+# Fourier-Motzkin elimination of a parameter from a conjunction of inequalities (strictness is ignored, as for the closure)
+def eliminate(disjunct, parameter):
+    # An equality containing the parameter is used to substitute it: parameter = -(sum of the other terms + constant) / coefficient
+    for k, (coefficients, constant, operator) in enumerate(disjunct):
+        if operator == iu.OP_EQ and parameter in coefficients:
+            coefficient = coefficients[parameter]
+            result = []
+            for other_coefficients, other_constant, other_operator in disjunct[:k] + disjunct[k + 1:]:
+                factor = other_coefficients.get(parameter, 0) / coefficient
+                if factor != 0:
+                    names = (set(other_coefficients) | set(coefficients)) - {parameter}
+                    other_coefficients = {name: other_coefficients.get(name, 0) - factor * coefficients.get(name, 0) for name in names}
+                    other_coefficients = {name: value for name, value in other_coefficients.items() if value != 0}
+                    other_constant = other_constant - factor * constant
+                result.append((other_coefficients, other_constant, other_operator))
+            return result
+    lowers, uppers, others = [], [], []
+    for inequality in disjunct:
+        coefficient = inequality[0].get(parameter, 0)
+        (lowers if coefficient > 0 else uppers if coefficient < 0 else others).append(inequality)
+    for lower_coefficients, lower_constant, _ in lowers:
+        for upper_coefficients, upper_constant, _ in uppers:
+            # Positive combination cancelling the parameter
+            a, b = -upper_coefficients[parameter], lower_coefficients[parameter]
+            coefficients = {}
+            for name in set(lower_coefficients) | set(upper_coefficients):
+                value = a * lower_coefficients.get(name, 0) + b * upper_coefficients.get(name, 0)
+                if value != 0:
+                    coefficients[name] = value
+            others.append((coefficients, a * lower_constant + b * upper_constant, iu.OP_GE))
+    return others
+
+
+# Projection of a disjunct onto (x, y): the sliced parameters are replaced with their values, and the other parameters are eliminated
+def project(disjunct, x, y, slices):
+    for parameter, value in slices.items():
+        disjunct = [substitute(inequality, parameter, value) for inequality in disjunct]
+    for parameter in iu.constraint_parameters([disjunct]):
+        if parameter not in (x, y):
+            disjunct = eliminate(disjunct, parameter)
+    return disjunct
+
+
+# ************************************************************
+# POLYGONS
+# ************************************************************
+
+# Clip a convex polygon (list of (x, y)) by the half-plane a*x + b*y + c >= 0 (Sutherland-Hodgman)
+def clip(polygon, a, b, c):
+    result = []
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        value1 = a * x1 + b * y1 + c
+        value2 = a * x2 + b * y2 + c
+        if value1 >= 0:
+            result.append((x1, y1))
+        if (value1 >= 0) != (value2 >= 0):
+            ratio = value1 / (value1 - value2)
+            result.append((x1 + ratio * (x2 - x1), y1 + ratio * (y2 - y1)))
+    return result
+
+
+# Polygon of the closure of a projected disjunct within the frame (x_min, x_max, y_min, y_max); empty list if empty
+# NOTE: the bounds on a single parameter are first gathered into a box (most tiles are boxes), then the polygon of the box is clipped by the other inequalities; an equality gives a degenerate polygon (segment or point)
+def disjunct_polygon(disjunct, x, y, frame):
+    x_min, x_max, y_min, y_max = frame
+    others = []
+    for coefficients, constant, operator in disjunct:
+        a, b, c = float(coefficients.get(x, 0)), float(coefficients.get(y, 0)), float(constant)
+        if b == 0 and a != 0:
+            bound = -c / a
+            if a > 0 or operator == iu.OP_EQ:
+                x_min = max(x_min, bound)
+            if a < 0 or operator == iu.OP_EQ:
+                x_max = min(x_max, bound)
+        elif a == 0 and b != 0:
+            bound = -c / b
+            if b > 0 or operator == iu.OP_EQ:
+                y_min = max(y_min, bound)
+            if b < 0 or operator == iu.OP_EQ:
+                y_max = min(y_max, bound)
+        elif a == 0 and b == 0:
+            if c < 0 or (operator == iu.OP_EQ and c != 0):
+                return []
+        else:
+            others.append((a, b, c, operator))
+    if x_min > x_max or y_min > y_max:
+        return []
+    polygon = [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
+    for a, b, c, operator in others:
+        polygon = clip(polygon, a, b, c)
+        if operator == iu.OP_EQ and polygon:
+            polygon = clip(polygon, -a, -b, -c)
+        if not polygon:
+            return []
+    return polygon
+
+
+# Polygons of all tiles, as a list of (nature, polygon)
+def tile_polygons(tiles, x, y, slices, frame):
+    polygons = []
+    for tile in tiles:
+        for disjunct in tile.constraint:
+            polygon = disjunct_polygon(project(disjunct, x, y, slices), x, y, frame)
+            if polygon:
+                polygons.append((tile.nature, polygon))
+    return polygons
+
+
+# Polygons clipped into a smaller frame
+def clip_polygons(polygons, frame):
+    x_min, x_max, y_min, y_max = frame
+    clipped = []
+    for nature, polygon in polygons:
+        for a, b, c in ((1, 0, -x_min), (-1, 0, x_max), (0, 1, -y_min), (0, -1, y_max)):
+            polygon = clip(polygon, a, b, c)
+            if not polygon:
+                break
+        else:
+            clipped.append((nature, polygon))
+    return clipped
+
+
+# Frame used to clip the unbounded tiles before the frame of the image is known
+LARGE_FRAME = (-1e9, 1e9, -1e9, 1e9)
+
+
+# Default frame: the bounding box of the polygons (clipped in LARGE_FRAME) that do not touch LARGE_FRAME, with a margin of 1 (as in the cartography of IMITATOR)
+def automatic_frame(polygons):
+    points = [point for _, polygon in polygons for point in polygon if abs(point[0]) < LARGE_FRAME[1] and abs(point[1]) < LARGE_FRAME[3]]
+    if not points:
+        return (0.0, 50.0, 0.0, 50.0)
+    return (min(p[0] for p in points) - 1, max(p[0] for p in points) + 1, min(p[1] for p in points) - 1, max(p[1] for p in points) + 1)
+
+
+# ************************************************************
+# RASTER IMAGES
+# ************************************************************
+
+# RGB image as one bytearray per row (row 0 at the top)
+class Raster:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rows = [bytearray(BACKGROUND) * width for _ in range(height)]
+
+    # Fill the pixels of row y from column first to column last (included)
+    def fill_span(self, y, first, last, colour):
+        first, last = max(first, 0), min(last, self.width - 1)
+        if 0 <= y < self.height and first <= last:
+            self.rows[y][3 * first:3 * (last + 1)] = bytes(colour) * (last - first + 1)
+
+    def set_pixel(self, x, y, colour):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.rows[y][3 * x:3 * x + 3] = bytes(colour)
+
+    def draw_line(self, x1, y1, x2, y2, colour):
+        steps = int(max(abs(x2 - x1), abs(y2 - y1))) + 1
+        for k in range(steps + 1):
+            self.set_pixel(int(x1 + (x2 - x1) * k / steps), int(y1 + (y2 - y1) * k / steps), colour)
+
+    # Fill a convex polygon given in pixel coordinates: the pixels whose centre is inside (scanline); a polygon covering no pixel centre is drawn as one pixel (level of detail: no tile disappears)
+    def fill_polygon(self, polygon, colour, outline):
+        ys = [point[1] for point in polygon]
+        first_row, last_row = max(int(math.ceil(min(ys) - 0.5)), 0), min(int(math.floor(max(ys) - 0.5)), self.height - 1)
+        drawn = False
+        n = len(polygon)
+        for row in range(first_row, last_row + 1):
+            centre = row + 0.5
+            left, right = math.inf, -math.inf
+            for i in range(n):
+                x1, y1 = polygon[i]
+                x2, y2 = polygon[(i + 1) % n]
+                if (y1 <= centre <= y2) or (y2 <= centre <= y1):
+                    if y1 == y2:
+                        left, right = min(left, x1, x2), max(right, x1, x2)
+                    else:
+                        crossing = x1 + (centre - y1) * (x2 - x1) / (y2 - y1)
+                        left, right = min(left, crossing), max(right, crossing)
+            first, last = int(math.ceil(left - 0.5)), int(math.floor(right - 0.5))
+            if first <= last:
+                self.fill_span(row, first, last, colour)
+                drawn = True
+        if not drawn:
+            if n <= 2 or max(ys) - min(ys) < 1 or max(p[0] for p in polygon) - min(p[0] for p in polygon) < 1:
+                # Degenerate or sub-pixel polygon
+                for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+                    self.draw_line(x1, y1, x2, y2, outline)
+            return
+        if outline is not None and max(ys) - min(ys) >= MIN_OUTLINE_SIZE and max(p[0] for p in polygon) - min(p[0] for p in polygon) >= MIN_OUTLINE_SIZE:
+            for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+                self.draw_line(x1, y1, x2, y2, outline)
+
+    # Part of the raster
+    def crop(self, x, y, width, height):
+        cropped = Raster.__new__(Raster)
+        cropped.width, cropped.height = width, height
+        background = bytes(BACKGROUND)
+        cropped.rows = []
+        for row in range(y, y + height):
+            line = self.rows[row][3 * x:3 * (x + width)] if row < self.height else bytearray()
+            cropped.rows.append(bytearray(line) + background * (width - len(line) // 3))
+        return cropped
+
+    def write_png(self, png_file):
+        def chunk(kind, data):
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+        # Filter type 0 (none) for each row
+        data = b''.join(b'\x00' + bytes(row) for row in self.rows)
+        with open(png_file, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)))
+            f.write(chunk(b'IDAT', zlib.compress(data, 6)))
+            f.write(chunk(b'IEND', b''))
+
+
+# Conversion from parameter coordinates to pixel coordinates (y axis upwards)
+def to_pixels(polygon, frame, width, height):
+    x_min, x_max, y_min, y_max = frame
+    x_scale = width / (x_max - x_min)
+    y_scale = height / (y_max - y_min)
+    return [((px - x_min) * x_scale, (y_max - py) * y_scale) for px, py in polygon]
+
+
+def render_raster(polygons, frame, width, height):
+    raster = Raster(width, height)
+    for nature, polygon in polygons:
+        fill, outline = COLOURS[nature]
+        raster.fill_polygon(to_pixels(polygon, frame, width, height), fill, outline)
+    return raster
+
+
+# Pyramid of PNG tiles: level z has 2^z x 2^z tiles of tile_size pixels, written to directory/z/column_row.png
+# NOTE: each tile is rendered alone from the polygons clipped to its window, so that the memory does not grow with the level; the window is enlarged by a margin, so that the clipping adds no visible outline and keeps the outlines of the polygons crossing the border of the tile
+def write_pyramid(polygons, frame, directory, nb_levels, tile_size):
+    x_min, x_max, y_min, y_max = frame
+    for level in range(nb_levels):
+        nb_tiles = 2 ** level
+        tile_width, tile_height = (x_max - x_min) / nb_tiles, (y_max - y_min) / nb_tiles
+        margin_x, margin_y = tile_width * (MIN_OUTLINE_SIZE + 1) / tile_size, tile_height * (MIN_OUTLINE_SIZE + 1) / tile_size
+        level_directory = os.path.join(directory, str(level))
+        os.makedirs(level_directory, exist_ok=True)
+        for row in range(nb_tiles):
+            # Row 0 at the top
+            bottom = y_max - (row + 1) * tile_height
+            top = y_max - row * tile_height
+            row_polygons = clip_polygons(polygons, (x_min - margin_x, x_max + margin_x, bottom - margin_y, top + margin_y))
+            for column in range(nb_tiles):
+                left = x_min + column * tile_width
+                right = x_min + (column + 1) * tile_width
+                window_polygons = clip_polygons(row_polygons, (left - margin_x, right + margin_x, bottom - margin_y, top + margin_y))
+                render_raster(window_polygons, (left, right, bottom, top), tile_size, tile_size).write_png(os.path.join(level_directory, '%d_%d.png' % (column, row)))
+
+
+# ************************************************************
+# SVG
+# ************************************************************
+
+def svg_colour(colour):
+    return '#%02x%02x%02x' % colour
+
+
+# SVG image: one path per nature (all polygons of a nature in a single path element), with axes and parameter names
+# NOTE: level of detail: the coordinates are rounded to 1/10 pixel, the polygons smaller than a pixel are drawn as a pixel, and the outlines are only drawn if the tiles are large enough
+def write_svg(svg_file, polygons, frame, width, height, x, y):
+    margin = 50
+    paths = {nature: [] for nature in COLOURS}
+    sizes = []
+    for nature, polygon in polygons:
+        pixels = to_pixels(polygon, frame, width, height)
+        xs, ys = [p[0] for p in pixels], [p[1] for p in pixels]
+        sizes.append(min(max(xs) - min(xs), max(ys) - min(ys)))
+        if max(xs) - min(xs) < 1 and max(ys) - min(ys) < 1:
+            paths[nature].append('M%.1f %.1fh1v1h-1Z' % (min(xs), min(ys)))
+            continue
+        points = []
+        for px, py in pixels:
+            point = '%.1f %.1f' % (px, py)
+            if not points or points[-1] != point:
+                points.append(point)
+        paths[nature].append('M' + 'L'.join(points) + 'Z')
+    sizes.sort()
+    outlined = sizes and sizes[len(sizes) // 2] >= MIN_OUTLINE_SIZE
+    x_min, x_max, y_min, y_max = frame
+    with open(svg_file, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="%d %d %d %d">\n' % (width + 2 * margin, height + 2 * margin, -margin, -margin, width + 2 * margin, height + 2 * margin))
+        f.write('<rect x="0" y="0" width="%d" height="%d" fill="%s" stroke="black"/>\n' % (width, height, svg_colour(BACKGROUND)))
+        for nature, path in paths.items():
+            if path:
+                fill, outline = COLOURS[nature]
+                stroke = ' stroke="%s" stroke-width="0.5"' % svg_colour(outline) if outlined else ''
+                f.write('<path fill="%s"%s d="%s"/>\n' % (svg_colour(fill), stroke, ''.join(path)))
+        f.write('<g font-family="sans-serif" font-size="12">\n')
+        f.write('<text x="0" y="%d">%g</text><text x="%d" y="%d" text-anchor="end">%g</text>\n' % (height + 15, x_min, width, height + 15, x_max))
+        f.write('<text x="-5" y="%d" text-anchor="end">%g</text><text x="-5" y="10" text-anchor="end">%g</text>\n' % (height, y_min, y_max))
+        f.write('<text x="%d" y="%d" text-anchor="middle">%s</text>\n' % (width // 2, height + 35, x))
+        f.write('<text x="-35" y="%d" text-anchor="middle" transform="rotate(-90 -35 %d)">%s</text>\n' % (height // 2, height // 2, y))
+        f.write('</g>\n</svg>\n')
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def parse_range(text):
+    lower, upper = text.split('..')
+    return float(Fraction(lower)), float(Fraction(upper))
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Rendering of a cartography from the tiles of IMITATOR result files')
+    parser.add_argument('results', nargs='+', help='Result files (.res) of a cartography, or of single tiles (-tiles-files); directories are replaced with their result files')
+    parser.add_argument('--output', required=True, help='Output image (.svg or .png), or directory of the pyramid of PNG tiles with --levels')
+    parser.add_argument('--x', default=None, help='Parameter of the x axis (default: the first parameter)')
+    parser.add_argument('--y', default=None, help='Parameter of the y axis (default: the second parameter)')
+    parser.add_argument('--slice', action='append', default=[], help='Fix the value of another parameter, e.g., "p3=5" (the parameters neither drawn nor fixed are projected away)')
+    parser.add_argument('--x-range', default=None, help='Range of the x axis, e.g., "0..20" (default: from the tiles)')
+    parser.add_argument('--y-range', default=None, help='Range of the y axis, e.g., "0..20" (default: from the tiles)')
+    parser.add_argument('--property', default=None, help='Property file of the cartography (BCcover or PRPC), from which the ranges of the axes are taken')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='Width and height of the image in pixels (default: %d)' % DEFAULT_SIZE)
+    parser.add_argument('--levels', type=int, default=None, help='Write a pyramid of PNG tiles with this number of levels of detail into the output directory')
+    parser.add_argument('--tile-size', type=int, default=256, help='Size of the PNG tiles of the pyramid in pixels (default: 256)')
+    args = parser.parse_args()
+
+    start = time.time()
+    tiles = []
+    for res_file in result_files(args.results):
+        try:
+            tiles += read_tiles(res_file)
+        except (OSError, iu.ConstraintParseError) as e:
+            print('Warning: cannot read %s (%s)' % (res_file, e))
+    parameters = sorted(set().union(*(iu.constraint_parameters(tile.constraint) for tile in tiles))) if tiles else []
+    slices = {}
+    for item in args.slice:
+        name, value = item.split('=')
+        slices[name.strip()] = Fraction(value.strip())
+    free_parameters = [parameter for parameter in parameters if parameter not in slices]
+    x = args.x or (free_parameters[0] if free_parameters else 'p1')
+    y = args.y or next((parameter for parameter in free_parameters if parameter != x), 'p2')
+    print('%d tile(s) read in %.2f s; drawing %s and %s' % (len(tiles), time.time() - start, x, y))
+
+    polygons = tile_polygons(tiles, x, y, slices, LARGE_FRAME)
+    frame = None
+    if args.property is not None:
+        try:
+            domain = dict((dimension[0], dimension[1:]) for dimension in bc_parallel.parse_property_file(args.property).domain)
+        except (OSError, ValueError) as e:
+            parser.error('cannot read the property %s (%s)' % (args.property, e))
+        if x in domain and y in domain:
+            # Margin of 1 around the reference domain (as in the cartography of IMITATOR)
+            frame = (float(domain[x][0]) - 1, float(domain[x][1]) + 1, float(domain[y][0]) - 1, float(domain[y][1]) + 1)
+    if frame is None:
+        frame = automatic_frame(polygons)
+    if args.x_range:
+        frame = parse_range(args.x_range) + frame[2:]
+    if args.y_range:
+        frame = frame[:2] + parse_range(args.y_range)
+    if frame[0] >= frame[1] or frame[2] >= frame[3]:
+        print('Error: empty range for the axes')
+        sys.exit(1)
+
+    polygons = clip_polygons(polygons, frame)
+    print('%d polygon(s) computed in %.2f s' % (len(polygons), time.time() - start))
+
+    if args.levels is not None:
+        write_pyramid(polygons, frame, args.output, args.levels, args.tile_size)
+    elif args.output.endswith('.svg'):
+        write_svg(args.output, polygons, frame, args.size, args.size, x, y)
+    elif args.output.endswith('.png'):
+        render_raster(polygons, frame, args.size, args.size).write_png(args.output)
+    else:
+        print('Error: unknown image format for ' + args.output + ' (expected .svg or .png)')
+        sys.exit(1)
+    print('Cartography written to %s in %.2f s' % (args.output, time.time() - start))
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,329 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: fast comparison of two constraints synthesized by IMITATOR (e.g., by two versions): estimation of the volume of their symmetric difference in a parameter box by Monte Carlo sampling, and exact checks at the vertices of the box and on the boundaries of the inequalities; the mismatches are reported with witness valuations
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import itertools
+import json
+import math
+import random
+import re
+import sys
+from fractions import Fraction
+
+import imitator_utilities as iu
+import constraint_evaluator as ce
+
+# Above this number of parameters, the vertices of the box are not all checked
+MAX_VERTEX_DIMENSIONS = 12
+
+# Number of steps of the sampling grid in each dimension
+SAMPLING_RESOLUTION = 10 ** 6
+
+# Maximum number of witnesses reported
+MAX_WITNESSES = 10
+
+BOUND_PATTERN = re.compile(r'^\s*(\w+)\s*=\s*([-0-9/.]+)\s*\.\.\s*([-0-9/.]+)\s*$')
+
+COMMENT_DELIMITER_PATTERN = re.compile(r'\(\*|\*\)')
+V0_PATTERN = re.compile(r'#synth\s+\w+\s*\((.*)\)\s*;', re.DOTALL)
+V0_RANGE_PATTERN = re.compile(r'&?\s*(\w+)\s*=\s*([-0-9/.]+)\s*\.\.\s*([-0-9/.]+)')
+V0_POINT_PATTERN = re.compile(r'&?\s*(\w+)\s*=\s*([-0-9/.]+)\s*(?:&|,|$)', re.MULTILINE)
+# Bound of the initial constraint of the model: "p >= 3", "p <= 10", "p = 5"
+MODEL_BOUND_PATTERN = re.compile(r'&\s*(\w+)\s*(>=|<=|>|<|=)\s*(\d+(?:/\d+)?)\s*$', re.MULTILINE)
+
+
+# ************************************************************
+# BOX
+# ************************************************************
+
+# Box given as "p1=0..10,p2=1/2..3"
+def parse_box(text):
+    box = {}
+    for item in text.split(','):
+        m = BOUND_PATTERN.match(item)
+        if not m:
+            raise ValueError('Cannot parse the bounds "' + item.strip() + '" (expected: parameter=lower..upper)')
+        box[m.group(1)] = (Fraction(m.group(2)), Fraction(m.group(3)))
+    return box
+
+
+# Default box: for each parameter, from 0 to twice the largest constant of the constraints (parameters are non-negative)
+def default_box(parameters, constraints):
+    largest = Fraction(1)
+    for constraint in constraints:
+        for disjunct in constraint:
+            for coefficients, constant, _ in disjunct:
+                for coefficient in coefficients.values():
+                    largest = max(largest, abs(constant / coefficient))
+    return {parameter: (Fraction(0), 2 * largest) for parameter in parameters}
+
+
+# Content of a model or property file without its (possibly nested) comments
+def read_without_comments(file_name):
+    with open(file_name) as f:
+        content = f.read()
+    parts = []
+    depth = 0
+    position = 0
+    for m in COMMENT_DELIMITER_PATTERN.finditer(content):
+        if depth == 0:
+            parts.append(content[position:m.start()])
+        depth = depth + 1 if m.group() == '(*' else max(0, depth - 1)
+        position = m.end()
+    if depth == 0:
+        parts.append(content[position:])
+    return ''.join(parts)
+
+
+# Box of the v0 (or pi0) of a property file: parameter => (lower, upper)
+# NOTE: in a v0 with ranges (cartography), a parameter fixed to a value is fixed in the box; in a reference valuation (IM, PRP: no range), the box of a parameter with value v is 0..2v, centered on v
+def box_from_property(property_file):
+    m = V0_PATTERN.search(read_without_comments(property_file))
+    if not m:
+        return {}
+    box = {}
+    text = m.group(1)
+    for parameter, lower, upper in V0_RANGE_PATTERN.findall(text):
+        box[parameter] = (Fraction(lower), Fraction(upper))
+    has_ranges = bool(box)
+    for parameter, value in V0_POINT_PATTERN.findall(V0_RANGE_PATTERN.sub('', text)):
+        if parameter in box or parameter == 'step':
+            continue
+        value = Fraction(value)
+        box[parameter] = (value, value) if has_ranges or value <= 0 else (Fraction(0), 2 * value)
+    return box
+
+
+# Bounds of the parameters in the initial constraint of a model: parameter => (lower or None, upper or None)
+def bounds_from_model(model_file):
+    bounds = {}
+    for name, op, value in MODEL_BOUND_PATTERN.findall(read_without_comments(model_file)):
+        lower, upper = bounds.get(name, (None, None))
+        value = Fraction(value)
+        if op in ('>=', '>', '='):
+            lower = value if lower is None else max(lower, value)
+        if op in ('<=', '<', '='):
+            upper = value if upper is None else min(upper, value)
+        bounds[name] = (lower, upper)
+    return bounds
+
+
+# Box of the comparison: the v0 of the property, else the bounds of the model, else the default box
+def derive_box(parameters, constraints, property_file=None, model_file=None):
+    box = default_box(parameters, constraints)
+    if model_file is not None:
+        for parameter, (lower, upper) in bounds_from_model(model_file).items():
+            if parameter in box:
+                default_lower, default_upper = box[parameter]
+                lower = default_lower if lower is None else lower
+                upper = default_upper if upper is None else upper
+                if lower <= upper:
+                    box[parameter] = (lower, upper)
+    if property_file is not None:
+        for parameter, bounds in box_from_property(property_file).items():
+            if parameter in box:
+                box[parameter] = bounds
+    return box
+
+
+# ************************************************************
+# CHECKS
+# ************************************************************
+
+# Witness of a mismatch: valuation and membership in each constraint
+def make_witness(valuation, first, second, kind):
+    return {
+        'kind': kind,
+        'valuation': {parameter: str(value) for parameter, value in valuation.items()},
+        'first': first,
+        'second': second,
+    }
+
+
+# Exact membership of a valuation in both constraints; returns a witness if they differ
+def check_exact(first_constraint, second_constraint, valuation, kind):
+    first = iu.satisfies(first_constraint, valuation)
+    second = iu.satisfies(second_constraint, valuation)
+    return make_witness(valuation, first, second, kind) if first != second else None
+
+
+def box_vertices(parameters, box):
+    for corner in itertools.product(*[box[parameter] for parameter in parameters]):
+        yield dict(zip(parameters, corner))
+
+
+# Random points on the hyperplane of each inequality (within the box): the strictness of an inequality only changes points of its boundary
+def boundary_points(parameters, box, constraints, rng, points_per_inequality):
+    for constraint in constraints:
+        for disjunct in constraint:
+            for coefficients, constant, _ in disjunct:
+                if not coefficients:
+                    continue
+                for _ in range(points_per_inequality):
+                    solved = rng.choice(sorted(coefficients))
+                    valuation = {}
+                    for parameter in parameters:
+                        lower, upper = box[parameter]
+                        valuation[parameter] = lower + (upper - lower) * Fraction(rng.randint(0, 1000), 1000)
+                    # Value of the solved parameter on the hyperplane
+                    value = -(constant + sum(coefficient * valuation[parameter] for parameter, coefficient in coefficients.items() if parameter != solved)) / coefficients[solved]
+                    lower, upper = box[solved]
+                    if lower <= value <= upper:
+                        valuation[solved] = value
+                        yield valuation
+
+
+# Key of a witness, to report each valuation once
+def witness_key(witness):
+    return tuple(sorted(witness['valuation'].items()))
+
+
+# Monte Carlo estimation: returns (number of samples in the symmetric difference, number in the union, witnesses (checked exactly, not in seen))
+def monte_carlo(parameters, box, first_compiled, second_compiled, first_constraint, second_constraint, rng, nb_samples, seen, batch_size=100000):
+    nb_difference = 0
+    nb_union = 0
+    witnesses = []
+    remaining = nb_samples
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        remaining -= n
+        # NOTE: the samples are on a fine grid so that the witnesses are exact (and readable) rationals
+        positions = [[rng.randint(0, SAMPLING_RESOLUTION) for _ in range(n)] for _ in parameters]
+        columns = [[float(lower) + float(upper - lower) * position / SAMPLING_RESOLUTION for position in column] for (lower, upper), column in zip((box[parameter] for parameter in parameters), positions)]
+        first = first_compiled.evaluate_columns(columns, n=n)
+        second = second_compiled.evaluate_columns(columns, n=n)
+        for i in range(n):
+            if first[i] or second[i]:
+                nb_union += 1
+            if first[i] != second[i]:
+                nb_difference += 1
+                if len(witnesses) < MAX_WITNESSES:
+                    # NOTE: the float sample is checked again with exact rationals
+                    valuation = {parameter: box[parameter][0] + (box[parameter][1] - box[parameter][0]) * Fraction(positions[k][i], SAMPLING_RESOLUTION) for k, parameter in enumerate(parameters)}
+                    witness = check_exact(first_constraint, second_constraint, valuation, 'sample')
+                    if witness is not None and witness_key(witness) not in seen:
+                        seen.add(witness_key(witness))
+                        witnesses.append(witness)
+    return nb_difference, nb_union, witnesses
+
+
+# Compare two constraints in the box; returns a report (dictionary)
+def compare_constraints(first_text, second_text, box=None, nb_samples=100000, points_per_inequality=20, seed=0, property_file=None, model_file=None):
+    first_constraint = iu.parse_constraint(first_text)
+    second_constraint = iu.parse_constraint(second_text)
+    parameters = sorted(set(iu.constraint_parameters(first_constraint)) | set(iu.constraint_parameters(second_constraint)) | set(box or ()))
+    if box is None:
+        box = derive_box(parameters, [first_constraint, second_constraint], property_file, model_file)
+    missing = [parameter for parameter in parameters if parameter not in box]
+    if missing:
+        raise ValueError('No bounds for the parameter(s) ' + ', '.join(missing))
+    rng = random.Random(seed)
+
+    witnesses = []
+    seen = set()
+    nb_exact_checks = 0
+    exact_points = []
+    if len(parameters) <= MAX_VERTEX_DIMENSIONS:
+        exact_points += [(valuation, 'vertex') for valuation in box_vertices(parameters, box)]
+    exact_points += [(valuation, 'boundary') for valuation in boundary_points(parameters, box, [first_constraint, second_constraint], rng, points_per_inequality)]
+    nb_exact_mismatches = 0
+    for valuation, kind in exact_points:
+        nb_exact_checks += 1
+        witness = check_exact(first_constraint, second_constraint, valuation, kind)
+        if witness is not None:
+            nb_exact_mismatches += 1
+            # NOTE: half of the witnesses are kept for the samples (inside the difference rather than on its boundary)
+            if len(witnesses) < MAX_WITNESSES // 2 and witness_key(witness) not in seen:
+                seen.add(witness_key(witness))
+                witnesses.append(witness)
+
+    report = {'parameters': parameters, 'box': {parameter: [str(lower), str(upper)] for parameter, (lower, upper) in box.items() if parameter in parameters}, 'exact_checks': nb_exact_checks, 'exact_mismatches': nb_exact_mismatches, 'samples': 0}
+    if parameters and nb_samples > 0:
+        first_compiled = ce.CompiledConstraint(first_constraint, parameters)
+        second_compiled = ce.CompiledConstraint(second_constraint, parameters)
+        nb_difference, nb_union, sample_witnesses = monte_carlo(parameters, box, first_compiled, second_compiled, first_constraint, second_constraint, rng, nb_samples, seen)
+        witnesses += sample_witnesses[:MAX_WITNESSES - len(witnesses)]
+        volume = math.prod(float(upper - lower) for lower, upper in (box[parameter] for parameter in parameters))
+        ratio = nb_difference / nb_samples
+        report.update({
+            'samples': nb_samples,
+            'sample_mismatches': nb_difference,
+            # Estimated volume of the symmetric difference, with its standard error
+            'difference_volume': ratio * volume,
+            'difference_volume_error': math.sqrt(ratio * (1 - ratio) / nb_samples) * volume,
+            'box_volume': volume,
+            # Volume of the symmetric difference relative to the union
+            'relative_difference': nb_difference / nb_union if nb_union else 0.0,
+        })
+    report['witnesses'] = witnesses
+    report['equal'] = not witnesses and report.get('sample_mismatches', 0) == 0 and nb_exact_mismatches == 0
+    return report
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def read_constraint(text):
+    if text.endswith(iu.RES_EXTENSION):
+        constraint = iu.parse_res_file(text)['constraint']
+        if constraint is None:
+            raise ValueError('No constraint in ' + text)
+        # NOTE: a constraint with good and bad valuations is compared on its good part
+        return constraint.split('<good|bad>')[0]
+    return text
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Comparison of two constraints synthesized by IMITATOR by sampling and exact checks')
+    parser.add_argument('first', help='First result file (.res) or constraint')
+    parser.add_argument('second', help='Second result file (.res) or constraint')
+    parser.add_argument('--box', default=None, help='Parameter box, e.g., "p1=0..10,p2=0..5" (default: the v0 of --property, else the bounds of --model, else from 0 to twice the largest constant)')
+    parser.add_argument('--property', default=None, help='Property file (.imiprop, .v0, .pi0) whose v0 gives the box')
+    parser.add_argument('--model', default=None, help='Model whose initial constraint gives the bounds of the parameters')
+    parser.add_argument('--samples', type=int, default=100000, help='Number of Monte Carlo samples (default: 100000)')
+    parser.add_argument('--boundary-points', type=int, default=20, help='Number of exact checks on the boundary of each inequality (default: 20)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the sampling (default: 0)')
+    parser.add_argument('--json', default=None, help='Also write the report in this JSON file')
+    parser.add_argument('--quiet', action='store_true', help='Only print one line')
+    args = parser.parse_args()
+
+    try:
+        box = parse_box(args.box) if args.box else None
+        report = compare_constraints(read_constraint(args.first), read_constraint(args.second), box, args.samples, args.boundary_points, args.seed, args.property, args.model)
+    except (ValueError, iu.ConstraintParseError) as e:
+        print('Error: %s' % e)
+        sys.exit(2)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    if report['equal']:
+        print('No difference found (%d samples, %d exact checks)' % (report['samples'], report['exact_checks']))
+        sys.exit(0)
+    summary = 'Constraints differ: %d / %d exact checks' % (report['exact_mismatches'], report['exact_checks'])
+    if report['samples']:
+        summary += ', %d / %d samples; volume of the difference %.4g +/- %.2g (%.2f%% of the union)' % (report['sample_mismatches'], report['samples'], report['difference_volume'], report['difference_volume_error'], 100 * report['relative_difference'])
+    print(summary)
+    if not args.quiet:
+        for witness in report['witnesses']:
+            print('  %s: %s in first: %s, in second: %s' % (witness['kind'], ', '.join('%s = %s' % item for item in witness['valuation'].items()), witness['first'], witness['second']))
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,695 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: compaction of the (possibly huge) disjunctive constraints synthesized by IMITATOR: removal of the redundant inequalities, of the empty disjuncts and of the disjuncts included in another one, and exact merging of the disjuncts whose union is convex (boxes or polyhedra), using an exact rational simplex; the result is printed in a normalized form, and can be serialized in a binary file for fast reloading
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import array
+import math
+import struct
+import sys
+import time
+from fractions import Fraction
+
+import imitator_utilities as iu
+
+
+# ************************************************************
+# NORMALIZED INEQUALITIES
+# ************************************************************
+
+# An inequality in normalized form is a triple (coefficients, constant, operator) meaning
+#   sum(coefficients[k] * parameters[k]) + constant  operator  0
+# where coefficients is a tuple of integers (one per parameter) with a gcd of 1, and constant is a Fraction.
+# NOTE: the equalities are oriented so that their first non-zero coefficient is positive, hence two inequalities with the same direction have the same coefficients
+
+# Normalize an inequality of imitator_utilities; returns True or False if it has no parameter
+def normalize_inequality(inequality, parameter_columns):
+    coefficients, constant, operator = inequality
+    if not coefficients:
+        if operator == iu.OP_GT:
+            return constant > 0
+        if operator == iu.OP_GE:
+            return constant >= 0
+        return constant == 0
+    multiplier = math.lcm(*(Fraction(value).denominator for value in coefficients.values()))
+    integers = [0] * len(parameter_columns)
+    for parameter, value in coefficients.items():
+        integers[parameter_columns[parameter]] = int(value * multiplier)
+    divisor = math.gcd(*integers)
+    if operator == iu.OP_EQ and next(value for value in integers if value != 0) < 0:
+        divisor = -divisor
+    return (tuple(value // divisor for value in integers), Fraction(constant) * multiplier / divisor, operator)
+
+
+# Inequality of imitator_utilities from a normalized inequality
+def denormalize_inequality(row, parameters):
+    coefficients, constant, operator = row
+    return ({parameter: Fraction(value) for parameter, value in zip(parameters, coefficients) if value != 0}, constant, operator)
+
+
+# Negation of a normalized inequality, as a list of alternatives
+def negation(row):
+    coefficients, constant, operator = row
+    opposite = tuple(-value for value in coefficients)
+    if operator == iu.OP_GE:
+        return [(opposite, -constant, iu.OP_GT)]
+    if operator == iu.OP_GT:
+        return [(opposite, -constant, iu.OP_GE)]
+    return [(coefficients, constant, iu.OP_GT), (opposite, -constant, iu.OP_GT)]
+
+
+# Whether the inequality a.x + first op1 0 implies a.x + second op2 0 (same coefficients a)
+def implies_same_direction(first, second):
+    _, first_constant, first_operator = first
+    _, second_constant, second_operator = second
+    if second_operator == iu.OP_EQ:
+        return first_operator == iu.OP_EQ and first_constant == second_constant
+    if second_operator == iu.OP_GT and first_operator != iu.OP_GT:
+        return second_constant > first_constant
+    return second_constant >= first_constant
+
+
+# ************************************************************
+# EXACT SIMPLEX
+# ************************************************************
+
+LP_OPTIMAL = 'optimal'
+LP_INFEASIBLE = 'infeasible'
+LP_UNBOUNDED = 'unbounded'
+
+
+# Pivot of the tableau on (row, column); the last element of each row is the right-hand side
+def pivot(tableau, cost, basis, pivot_row, pivot_column):
+    row = tableau[pivot_row]
+    factor = row[pivot_column]
+    if factor != 1:
+        row[:] = [value / factor if value else value for value in row]
+    # NOTE: the tableau is sparse: only the non-zero columns of the pivot row are updated
+    nonzero = [column for column, value in enumerate(row) if value]
+    for other in tableau + [cost]:
+        if other is not row and other[pivot_column] != 0:
+            multiplier = other[pivot_column]
+            for column in nonzero:
+                other[column] -= multiplier * row[column]
+    basis[pivot_row] = pivot_column
+
+
+# Simplex iterations with Bland's rule (no cycling) on the columns below nb_columns; returns LP_OPTIMAL or LP_UNBOUNDED
+def simplex_iterations(tableau, cost, basis, nb_columns):
+    while True:
+        entering = next((column for column in range(nb_columns) if cost[column] > 0), None)
+        if entering is None:
+            return LP_OPTIMAL
+        leaving = None
+        for i, row in enumerate(tableau):
+            if row[entering] > 0:
+                ratio = row[-1] / row[entering]
+                if leaving is None or ratio < best_ratio or (ratio == best_ratio and basis[i] < basis[leaving]):
+                    leaving, best_ratio = i, ratio
+        if leaving is None:
+            return LP_UNBOUNDED
+        pivot(tableau, cost, basis, leaving, entering)
+
+
+# Maximize objective.z subject to matrix.z <= bounds, with free variables z (two-phase simplex on exact rationals); returns (status, optimal value or None)
+def lp_maximize(matrix, bounds, objective):
+    n = len(objective)
+    m = len(matrix)
+    artificial_rows = [i for i in range(m) if bounds[i] < 0]
+    # Columns: z+ (n), z- (n), slack variables (m), artificial variables
+    nb_columns = 2 * n + m
+    width = nb_columns + len(artificial_rows)
+    tableau = []
+    basis = []
+    for i, (row, bound) in enumerate(zip(matrix, bounds)):
+        sign = -1 if bound < 0 else 1
+        line = [Fraction(sign * value) for value in row] + [Fraction(-sign * value) for value in row] + [Fraction(0)] * (width - 2 * n) + [Fraction(sign * bound)]
+        line[2 * n + i] = Fraction(sign)
+        if bound < 0:
+            column = nb_columns + artificial_rows.index(i)
+            line[column] = Fraction(1)
+            basis.append(column)
+        else:
+            basis.append(2 * n + i)
+        tableau.append(line)
+
+    # Phase 1: minimize the sum of the artificial variables
+    if artificial_rows:
+        cost = [Fraction(0)] * (width + 1)
+        for i in artificial_rows:
+            cost = [value + other for value, other in zip(cost, tableau[i])]
+        for column in range(nb_columns, width):
+            cost[column] = Fraction(0)
+        simplex_iterations(tableau, cost, basis, width)
+        if cost[-1] > 0:
+            return LP_INFEASIBLE, None
+        # Drive the remaining (null) artificial variables out of the basis
+        i = 0
+        while i < len(tableau):
+            if basis[i] >= nb_columns:
+                column = next((column for column in range(nb_columns) if tableau[i][column] != 0), None)
+                if column is None:
+                    # Redundant row
+                    del tableau[i]
+                    del basis[i]
+                    continue
+                pivot(tableau, cost, basis, i, column)
+            i += 1
+
+    # Phase 2
+    costs = list(objective) + [-value for value in objective] + [0] * (width - 2 * n)
+    cost = [Fraction(value) for value in costs] + [Fraction(0)]
+    for i, column in enumerate(basis):
+        if cost[column] != 0:
+            multiplier = cost[column]
+            cost = [value - multiplier * other for value, other in zip(cost, tableau[i])]
+    if simplex_iterations(tableau, cost, basis, nb_columns) == LP_UNBOUNDED:
+        return LP_UNBOUNDED, None
+    return LP_OPTIMAL, -cost[-1]
+
+
+# ************************************************************
+# POLYHEDRA
+# ************************************************************
+
+# Whether the conjunction of normalized inequalities is empty (exact, strictness included)
+# NOTE: a margin variable t is added to the strict inequalities (a.x + c - t >= 0) and maximized: the polyhedron is non-empty iff the closure is feasible with t > 0
+def is_empty(rows, n):
+    matrix, bounds = [], []
+    strict = False
+    for coefficients, constant, operator in rows:
+        margin = 1 if operator == iu.OP_GT else 0
+        strict = strict or margin == 1
+        matrix.append([-value for value in coefficients] + [margin])
+        bounds.append(constant)
+        if operator == iu.OP_EQ:
+            matrix.append(list(coefficients) + [0])
+            bounds.append(-constant)
+    matrix.append([0] * n + [1])
+    bounds.append(1)
+    status, value = lp_maximize(matrix, bounds, [0] * n + [1])
+    if status == LP_INFEASIBLE:
+        return True
+    return strict and value <= 0
+
+
+# Whether the inequality holds in the whole (closed) box given by exact bounds (None if infinite); False if unknown
+def box_implies(bounds, row):
+    coefficients, constant, operator = row
+    if operator == iu.OP_EQ:
+        return False
+    minimum = constant
+    for coefficient, (lower, upper) in zip(coefficients, bounds):
+        if coefficient != 0:
+            bound = lower if coefficient > 0 else upper
+            if bound is None:
+                return False
+            minimum += coefficient * bound
+    return minimum > 0 or (minimum == 0 and operator == iu.OP_GE)
+
+
+# Whether the conjunction of rows implies the inequality row; bounds is an optional box containing the rows
+def implies(rows, row, n, bounds=None):
+    if any(other[0] == row[0] and implies_same_direction(other, row) for other in rows):
+        return True
+    if bounds is not None and box_implies(bounds, row):
+        return True
+    return all(is_empty(rows + [alternative], n) for alternative in negation(row))
+
+
+# Minimum and maximum of each parameter in the closure of a (non-empty) polyhedron, as a list of exact pairs (lower, upper) with None if infinite
+def bounding_box(rows, n):
+    matrix, bounds = [], []
+    for coefficients, constant, operator in rows:
+        matrix.append([-value for value in coefficients])
+        bounds.append(constant)
+        if operator == iu.OP_EQ:
+            matrix.append(list(coefficients))
+            bounds.append(-constant)
+    box = []
+    for k in range(n):
+        objective = [0] * n
+        objective[k] = 1
+        status, upper = lp_maximize(matrix, bounds, objective)
+        objective[k] = -1
+        status_lower, lower = lp_maximize(matrix, bounds, objective)
+        box.append((None if status_lower == LP_UNBOUNDED else -lower, None if status == LP_UNBOUNDED else upper))
+    return box
+
+
+# ************************************************************
+# BOXES
+# ************************************************************
+
+# A bound is a pair (value, strict), with value None if infinite.
+# Intervals of a box: one pair (lower bound, upper bound) per parameter
+
+# Intervals of a conjunction of inequalities with one parameter each; None if some inequality has several parameters
+def box_intervals(rows, n):
+    intervals = [[(None, False), (None, False)] for _ in range(n)]
+    for coefficients, constant, operator in rows:
+        columns = [k for k in range(n) if coefficients[k] != 0]
+        if len(columns) != 1:
+            return None
+        k = columns[0]
+        bound = (-constant / coefficients[k], operator == iu.OP_GT)
+        if operator == iu.OP_EQ or coefficients[k] > 0:
+            intervals[k][0] = tighter_lower(intervals[k][0], bound)
+        if operator == iu.OP_EQ or coefficients[k] < 0:
+            intervals[k][1] = tighter_upper(intervals[k][1], bound)
+    return [tuple(interval) for interval in intervals]
+
+
+def tighter_lower(first, second):
+    if first[0] is None or (second[0] is not None and (second[0], second[1]) > (first[0], first[1])):
+        return second
+    return first
+
+
+def tighter_upper(first, second):
+    if first[0] is None or (second[0] is not None and (-second[0], second[1]) > (-first[0], first[1])):
+        return second
+    return first
+
+
+def interval_empty(interval):
+    (lower, lower_strict), (upper, upper_strict) = interval
+    return lower is not None and upper is not None and (lower > upper or (lower == upper and (lower_strict or upper_strict)))
+
+
+# Whether the interval first is included in the interval second
+def interval_included(first, second):
+    return tighter_lower(first[0], second[0]) == first[0] and tighter_upper(first[1], second[1]) == first[1]
+
+
+# Union of two intervals if it is an interval, else None
+def interval_union(first, second):
+    if tighter_lower(first[0], second[0]) == first[0]:
+        first, second = second, first
+    # Now first starts before second
+    (upper, upper_strict), (lower, lower_strict) = first[1], second[0]
+    if upper is not None and lower is not None and (upper < lower or (upper == lower and upper_strict and lower_strict)):
+        return None
+    return (first[0], first[1] if tighter_upper(first[1], second[1]) == second[1] else second[1])
+
+
+# Normalized inequalities of a box
+def box_rows(intervals, n):
+    rows = []
+    for k, ((lower, lower_strict), (upper, upper_strict)) in enumerate(intervals):
+        unit = tuple(1 if column == k else 0 for column in range(n))
+        if lower is not None and lower == upper:
+            rows.append((unit, -lower, iu.OP_EQ))
+            continue
+        if lower is not None:
+            rows.append((unit, -lower, iu.OP_GT if lower_strict else iu.OP_GE))
+        if upper is not None:
+            rows.append((tuple(-value for value in unit), upper, iu.OP_GT if upper_strict else iu.OP_GE))
+    return rows
+
+
+# ************************************************************
+# DISJUNCTS
+# ************************************************************
+
+# A non-empty convex disjunct, without redundant inequality
+#   rows: normalized inequalities
+#   intervals: intervals if the disjunct is a box, else None
+#   bounds: bounding box of its closure (exact pairs (lower, upper), None if infinite)
+#   lowers, uppers: bounding box as floats (infinite if unbounded), for the sweep
+class Disjunct:
+    def __init__(self, rows, n, intervals=None):
+        if intervals is None:
+            intervals = box_intervals(rows, n)
+        self.intervals = intervals
+        if intervals is not None:
+            self.rows = box_rows(intervals, n)
+            self.bounds = [(lower, upper) for (lower, _), (upper, _) in intervals]
+        else:
+            self.rows = rows
+            self.bounds = bounding_box(rows, n)
+        self.lowers = [-math.inf if lower is None else float(lower) for lower, _ in self.bounds]
+        self.uppers = [math.inf if upper is None else float(upper) for _, upper in self.bounds]
+
+
+# Non-empty disjunct without redundancy from a conjunction of normalized inequalities; None if empty
+def make_disjunct(rows, n):
+    # Keep the tightest of the inequalities with the same direction
+    tightest = {}
+    for row in rows:
+        key = (row[0], row[2] == iu.OP_EQ)
+        if key not in tightest or implies_same_direction(row, tightest[key]):
+            tightest[key] = row
+        elif not implies_same_direction(tightest[key], row) and row[2] == iu.OP_EQ:
+            # Two different equalities with the same direction
+            return None
+    rows = list(tightest.values())
+    intervals = box_intervals(rows, n)
+    if intervals is not None:
+        if any(interval_empty(interval) for interval in intervals):
+            return None
+        return Disjunct(rows, n, intervals)
+    if is_empty(rows, n):
+        return None
+    # Remove the inequalities implied by the others
+    i = 0
+    while i < len(rows):
+        if implies(rows[:i] + rows[i + 1:], rows[i], n):
+            del rows[i]
+        else:
+            i += 1
+    return Disjunct(rows, n)
+
+
+# Whether the disjunct first is included in the disjunct second
+def disjunct_included(first, second, n):
+    if any(first.lowers[k] < second.lowers[k] or first.uppers[k] > second.uppers[k] for k in range(n)):
+        return False
+    if first.intervals is not None and second.intervals is not None:
+        return all(interval_included(a, b) for a, b in zip(first.intervals, second.intervals))
+    return all(implies(first.rows, row, n, first.bounds) for row in second.rows)
+
+
+# Union of two disjuncts if it is convex (exactly), else None
+# NOTE: for polyhedra, the union is the envelope (the inequalities of each disjunct valid in the other one) iff the envelope does not contain points outside both disjuncts
+def disjunct_union(first, second, n):
+    if first.intervals is not None and second.intervals is not None:
+        different = [k for k in range(n) if first.intervals[k] != second.intervals[k]]
+        if len(different) != 1:
+            return None
+        k = different[0]
+        union = interval_union(first.intervals[k], second.intervals[k])
+        if union is None:
+            return None
+        intervals = list(first.intervals)
+        intervals[k] = union
+        return Disjunct(None, n, intervals)
+    first_envelope = [implies(second.rows, row, n, second.bounds) for row in first.rows]
+    second_envelope = [implies(first.rows, row, n, first.bounds) for row in second.rows]
+    envelope = [row for row, valid in zip(first.rows, first_envelope) if valid] + [row for row, valid in zip(second.rows, second_envelope) if valid]
+    for first_row, first_valid in zip(first.rows, first_envelope):
+        if first_valid:
+            continue
+        for second_row, second_valid in zip(second.rows, second_envelope):
+            if second_valid:
+                continue
+            for first_alternative in negation(first_row):
+                for second_alternative in negation(second_row):
+                    if not is_empty(envelope + [first_alternative, second_alternative], n):
+                        return None
+    return make_disjunct(envelope, n)
+
+
+# Pairs (i, j) of disjuncts whose bounding boxes intersect (or touch), by sweeping along the first parameter
+def overlapping_pairs(disjuncts, n):
+    order = sorted(range(len(disjuncts)), key=lambda i: disjuncts[i].lowers[0])
+    active = []
+    for i in order:
+        current = disjuncts[i]
+        active = [j for j in active if disjuncts[j].uppers[0] >= current.lowers[0]]
+        for j in active:
+            other = disjuncts[j]
+            if all(other.lowers[k] <= current.uppers[k] and current.lowers[k] <= other.uppers[k] for k in range(1, n)):
+                yield j, i
+        active.append(i)
+
+
+# ************************************************************
+# COMPACTION
+# ************************************************************
+
+# Compaction of a constraint of imitator_utilities; returns (compacted constraint, statistics)
+def compact_constraint(constraint, parameters=None, merge=True):
+    if parameters is None:
+        parameters = iu.constraint_parameters(constraint)
+    parameters = list(parameters)
+    n = len(parameters)
+    parameter_columns = {parameter: column for column, parameter in enumerate(parameters)}
+    statistics = {
+        'disjuncts_before': len(constraint),
+        'inequalities_before': sum(len(disjunct) for disjunct in constraint),
+        'empty_disjuncts': 0,
+        'included_disjuncts': 0,
+        'merged_disjuncts': 0,
+    }
+
+    disjuncts = []
+    for inequalities in constraint:
+        rows = []
+        for inequality in inequalities:
+            row = normalize_inequality(inequality, parameter_columns)
+            if row is False:
+                rows = None
+                break
+            if row is not True:
+                rows.append(row)
+        disjunct = make_disjunct(rows, n) if rows is not None else None
+        if disjunct is None:
+            statistics['empty_disjuncts'] += 1
+        elif not disjunct.rows:
+            # True
+            disjuncts = [disjunct]
+            break
+        else:
+            disjuncts.append(disjunct)
+
+    # Remove the included disjuncts and merge the disjuncts with a convex union, until a fixpoint
+    changed = n > 0
+    while changed:
+        changed = False
+        removed = set()
+        merged = []
+        for i, j in overlapping_pairs(disjuncts, n):
+            if i in removed or j in removed:
+                continue
+            if disjunct_included(disjuncts[i], disjuncts[j], n):
+                removed.add(i)
+                statistics['included_disjuncts'] += 1
+            elif disjunct_included(disjuncts[j], disjuncts[i], n):
+                removed.add(j)
+                statistics['included_disjuncts'] += 1
+            elif merge:
+                union = disjunct_union(disjuncts[i], disjuncts[j], n)
+                if union is not None:
+                    removed.update((i, j))
+                    merged.append(union)
+                    statistics['merged_disjuncts'] += 1
+                    changed = True
+        disjuncts = [disjunct for i, disjunct in enumerate(disjuncts) if i not in removed] + merged
+
+    # Normalized order: by bounding box, then by inequalities
+    disjuncts.sort(key=lambda disjunct: (disjunct.lowers, disjunct.uppers, sorted(disjunct.rows)))
+    compacted = [[denormalize_inequality(row, parameters) for row in sorted(disjunct.rows, key=row_order)] for disjunct in disjuncts]
+    statistics['disjuncts_after'] = len(compacted)
+    statistics['inequalities_after'] = sum(len(disjunct) for disjunct in compacted)
+    return compacted, statistics
+
+
+# Order of the inequalities in a disjunct: by first parameter, lower bounds first
+def row_order(row):
+    coefficients, constant, operator = row
+    columns = [k for k, value in enumerate(coefficients) if value != 0]
+    return (len(columns), columns, [-value for value in coefficients], constant, operator)
+
+
+# ************************************************************
+# PRINTING
+# ************************************************************
+
+def format_term(coefficient, parameter):
+    return parameter if coefficient == 1 else '%d*%s' % (coefficient, parameter)
+
+
+# Inequality printed as by IMITATOR (positive terms on each side, operators among >, >=, =)
+def format_inequality(inequality, parameters):
+    coefficients, constant, operator = inequality
+    multiplier = math.lcm(Fraction(constant).denominator, *(Fraction(value).denominator for value in coefficients.values()))
+    left, right = [], []
+    for parameter in parameters:
+        value = int(coefficients.get(parameter, 0) * multiplier)
+        if value > 0:
+            left.append(format_term(value, parameter))
+        elif value < 0:
+            right.append(format_term(-value, parameter))
+    value = int(constant * multiplier)
+    if value > 0:
+        left.append(str(value))
+    elif value < 0:
+        right.append(str(-value))
+    return '%s %s %s' % (' + '.join(left) or '0', operator, ' + '.join(right) or '0')
+
+
+# Constraint printed as by IMITATOR
+def format_constraint(constraint, parameters):
+    if not constraint:
+        return 'False'
+    if constraint == [[]]:
+        return 'True'
+    return '\nOR\n'.join(' ' + '\n& '.join(format_inequality(inequality, parameters) for inequality in disjunct) for disjunct in constraint)
+
+
+# ************************************************************
+# BINARY SERIALIZATION
+# ************************************************************
+
+# File: magic, number of parameters, names (length-prefixed UTF-8), number of disjuncts, number of inequalities per disjunct (uint32),
+# operator codes (one byte per inequality), then the integer matrix (int64, little endian) with one row per inequality: coefficients and constant
+# NOTE: each inequality is multiplied by the denominator of its constant so that the matrix is made of integers
+BINARY_MAGIC = b'IMITATOR-CONSTRAINT-1\n'
+OPERATOR_CODES = {iu.OP_GT: 0, iu.OP_GE: 1, iu.OP_EQ: 2}
+INT64_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+def write_binary(binary_file, constraint, parameters):
+    counts = array.array('I', [len(disjunct) for disjunct in constraint])
+    operators = bytearray()
+    matrix = array.array('q')
+    for disjunct in constraint:
+        for coefficients, constant, operator in disjunct:
+            multiplier = math.lcm(Fraction(constant).denominator, *(Fraction(value).denominator for value in coefficients.values()))
+            values = [int(coefficients.get(parameter, 0) * multiplier) for parameter in parameters] + [int(constant * multiplier)]
+            if any(value not in INT64_RANGE for value in values):
+                raise ValueError('Coefficient too large for the binary serialization')
+            matrix.extend(values)
+            operators.append(OPERATOR_CODES[operator])
+    if sys.byteorder == 'big':
+        counts.byteswap()
+        matrix.byteswap()
+    with open(binary_file, 'wb') as f:
+        f.write(BINARY_MAGIC)
+        f.write(struct.pack('<I', len(parameters)))
+        for parameter in parameters:
+            name = parameter.encode('utf-8')
+            f.write(struct.pack('<H', len(name)) + name)
+        f.write(struct.pack('<I', len(constraint)))
+        f.write(counts.tobytes())
+        f.write(bytes(operators))
+        f.write(matrix.tobytes())
+
+
+# Read a binary file; returns (parameters, matrix as an array of int64, operators, counts); the matrix has len(parameters) + 1 columns
+def read_binary_arrays(binary_file):
+    with open(binary_file, 'rb') as f:
+        data = f.read()
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError(binary_file + ' is not a binary constraint file')
+    position = len(BINARY_MAGIC)
+    nb_parameters, = struct.unpack_from('<I', data, position)
+    position += 4
+    parameters = []
+    for _ in range(nb_parameters):
+        length, = struct.unpack_from('<H', data, position)
+        parameters.append(data[position + 2:position + 2 + length].decode('utf-8'))
+        position += 2 + length
+    nb_disjuncts, = struct.unpack_from('<I', data, position)
+    position += 4
+    counts = array.array('I')
+    counts.frombytes(data[position:position + 4 * nb_disjuncts])
+    position += 4 * nb_disjuncts
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    nb_rows = sum(counts)
+    operators = data[position:position + nb_rows]
+    position += nb_rows
+    matrix = array.array('q')
+    matrix.frombytes(data[position:position + 8 * nb_rows * (nb_parameters + 1)])
+    if sys.byteorder == 'big':
+        matrix.byteswap()
+    return parameters, matrix, operators, counts
+
+
+# Read a binary file into (parameters, constraint of imitator_utilities)
+def read_binary(binary_file):
+    parameters, matrix, operators, counts = read_binary_arrays(binary_file)
+    operator_names = {code: operator for operator, code in OPERATOR_CODES.items()}
+    width = len(parameters) + 1
+    constraint = []
+    row = 0
+    for count in counts:
+        disjunct = []
+        for _ in range(count):
+            values = matrix[row * width:(row + 1) * width]
+            disjunct.append(({parameter: Fraction(value) for parameter, value in zip(parameters, values) if value != 0}, Fraction(values[-1]), operator_names[operators[row]]))
+            row += 1
+        constraint.append(disjunct)
+    return parameters, constraint
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+# Compaction of the text of a constraint; a constraint with good and bad valuations is compacted part by part
+def compact_text(text, merge=True):
+    parts = text.split('<good|bad>')
+    parsed = [iu.parse_constraint(part) for part in parts]
+    parameters = sorted(set().union(*(iu.constraint_parameters(constraint) for constraint in parsed)))
+    compacted_parts = []
+    statistics = []
+    for constraint in parsed:
+        compacted, part_statistics = compact_constraint(constraint, parameters, merge)
+        compacted_parts.append(compacted)
+        statistics.append(part_statistics)
+    return parameters, compacted_parts, statistics
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Compaction of a constraint synthesized by IMITATOR (redundant inequalities, included disjuncts, convex unions)')
+    parser.add_argument('input', help='Result file (.res), or text of the constraint')
+    parser.add_argument('--output', default=None, help='Write the compacted constraint to this file; if it is a .res file, the input result file is copied with its constraint replaced (default: print the constraint)')
+    parser.add_argument('--binary', default=None, help='Also write the compacted constraint to this binary file')
+    parser.add_argument('--no-merge', action='store_true', help='Do not merge the disjuncts whose union is convex')
+    parser.add_argument('--quiet', action='store_true', help='Do not print statistics')
+    args = parser.parse_args()
+
+    content = None
+    text = args.input
+    if text.endswith(iu.RES_EXTENSION):
+        with open(text) as f:
+            content = f.read()
+        text = iu.parse_res(content)['constraint']
+        if text is None:
+            print('Error: no constraint in ' + args.input)
+            sys.exit(1)
+
+    start = time.time()
+    try:
+        parameters, compacted_parts, statistics = compact_text(text, not args.no_merge)
+    except iu.ConstraintParseError as e:
+        print('Error: %s' % e)
+        sys.exit(1)
+    result = '\n<good|bad>\n'.join(format_constraint(compacted, parameters) for compacted in compacted_parts)
+
+    if not args.quiet:
+        for part_statistics in statistics:
+            print('Disjuncts: %(disjuncts_before)d -> %(disjuncts_after)d (%(empty_disjuncts)d empty, %(included_disjuncts)d included, %(merged_disjuncts)d merges); inequalities: %(inequalities_before)d -> %(inequalities_after)d' % part_statistics)
+        print('Compaction time: %.3f s' % (time.time() - start))
+
+    if args.output is None:
+        print(result)
+    elif args.output.endswith(iu.RES_EXTENSION) and content is not None:
+        with open(args.output, 'w') as f:
+            f.write(iu.RES_CONSTRAINT_PATTERN.sub(lambda m: 'BEGIN CONSTRAINT\n' + result + '\nEND CONSTRAINT', content, count=1))
+    else:
+        with open(args.output, 'w') as f:
+            f.write(result + '\n')
+
+    if args.binary is not None:
+        # NOTE: for a constraint with good and bad valuations, only the good part is serialized
+        write_binary(args.binary, compacted_parts[0], parameters)
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: batch evaluation of the membership of parameter valuations in constraints synthesized by IMITATOR (disjunctions of conjunctions of linear inequalities); the constraint is compiled once into a sparse row form and evaluated on whole columns of valuations, with floats or exact rationals
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import csv
+import math
+import sys
+from fractions import Fraction
+
+import imitator_utilities as iu
+
+
+# ************************************************************
+# SPARSE FORM
+# ************************************************************
+
+# Largest common denominator of a column of rationals for which the column is scaled to integers
+MAX_SCALE = 10 ** 12
+
+
+# Exact value: an int if integral (faster arithmetic), else a Fraction
+def exact_value(value):
+    if isinstance(value, int):
+        return value
+    value = Fraction(value)
+    return value.numerator if value.denominator == 1 else value
+
+
+# One inequality in sparse row form: sum(coefficients[k] * column[columns[k]]) + constant  operator  0
+# NOTE: the coefficients and the constant are integers (the inequality is multiplied by the least common multiple of the denominators)
+class SparseRow:
+    def __init__(self, columns, coefficients, constant, operator):
+        self.columns = columns
+        self.coefficients = coefficients
+        self.constant = constant
+        self.operator = operator
+
+
+def sparse_row(inequality, parameter_columns):
+    coefficients, constant, operator = inequality
+    denominators = [value.denominator for value in coefficients.values()] + [Fraction(constant).denominator]
+    multiplier = math.lcm(*denominators)
+    terms = sorted((parameter_columns[parameter], int(coefficient * multiplier)) for parameter, coefficient in coefficients.items())
+    return SparseRow(tuple(column for column, _ in terms), tuple(coefficient for _, coefficient in terms), int(constant * multiplier), operator)
+
+
+# Constraint compiled for batch evaluation
+#   parameters: names of the columns
+#   disjuncts: list of lists of SparseRow (an empty disjunct is True; no disjunct is False)
+class CompiledConstraint:
+    def __init__(self, constraint, parameters=None):
+        if parameters is None:
+            parameters = iu.constraint_parameters(constraint)
+        self.parameters = list(parameters)
+        parameter_columns = {parameter: column for column, parameter in enumerate(self.parameters)}
+        missing = set(iu.constraint_parameters(constraint)) - set(parameter_columns)
+        if missing:
+            raise ValueError('Parameter(s) of the constraint without column: ' + ', '.join(sorted(missing)))
+        self.disjuncts = [[sparse_row(inequality, parameter_columns) for inequality in disjunct] for disjunct in constraint]
+        # Scales of the columns => compiled function
+        self.compiled_functions = {}
+
+    @classmethod
+    def from_text(cls, text, parameters=None):
+        return cls(iu.parse_constraint(text), parameters)
+
+    # Python function evaluating the constraint on columns: the disjunction of the conjunctions is short-circuited for each valuation
+    # The column k holds the values multiplied by scales[k]: each row is multiplied by the least common multiple of the scales of its columns, so that it keeps integer coefficients
+    # NOTE: only numbers and generated names appear in the generated code
+    def function(self, scales):
+        if scales in self.compiled_functions:
+            return self.compiled_functions[scales]
+        if not self.disjuncts:
+            code = 'lambda columns, n: bytearray(n)'
+        else:
+            disjunct_codes = []
+            for disjunct in self.disjuncts:
+                if not disjunct:
+                    disjunct_codes = ['True']
+                    break
+                row_codes = []
+                for row in disjunct:
+                    multiplier = math.lcm(*(scales[column] for column in row.columns))
+                    terms = ' + '.join('%d * c%d[i]' % (coefficient * multiplier // scales[column], column) for column, coefficient in zip(row.columns, row.coefficients))
+                    operator = '==' if row.operator == iu.OP_EQ else row.operator
+                    row_codes.append('%s + %d %s 0' % (terms, row.constant * multiplier, operator) if terms else '%d %s 0' % (row.constant, operator))
+                disjunct_codes.append('(' + ' and '.join(row_codes) + ')')
+            unpacking = ', '.join('c%d' % column for column in range(len(self.parameters)))
+            code = 'lambda columns, n: (lambda %s: bytearray(1 if %s else 0 for i in range(n)))(*columns)' % (unpacking + ',' if unpacking else '', ' or '.join(disjunct_codes))
+        self.compiled_functions[scales] = eval(code, {'bytearray': bytearray, 'range': range})
+        return self.compiled_functions[scales]
+
+    # Membership of the n valuations given as columns (one sequence per parameter, in the order of self.parameters); returns a bytearray (1 if the valuation belongs to the constraint)
+    #   exact: the values are converted into exact rationals (no rounding error at the boundaries); otherwise into floats
+    def evaluate_columns(self, columns, exact=False, n=None):
+        if len(columns) != len(self.parameters):
+            raise ValueError('Expected %d columns (%s), got %d' % (len(self.parameters), ', '.join(self.parameters), len(columns)))
+        if n is None:
+            n = len(columns[0]) if columns else 0
+        if not exact:
+            return self.function((1,) * len(columns))([[float(value) for value in column] for column in columns], n)
+        columns = [[exact_value(value) for value in column] for column in columns]
+        # NOTE: the rational values of a column are turned into integers by multiplying them by the common denominator of the column (if not too large), as integer arithmetic is much faster
+        scales = []
+        for k, column in enumerate(columns):
+            denominator = math.lcm(*set(value.denominator for value in column if isinstance(value, Fraction)))
+            if 1 < denominator <= MAX_SCALE:
+                columns[k] = [value * denominator if isinstance(value, int) else value.numerator * (denominator // value.denominator) for value in column]
+                scales.append(denominator)
+            else:
+                scales.append(1)
+        return self.function(tuple(scales))(columns, n)
+
+    # Membership of valuations given as dictionaries parameter => value
+    def evaluate(self, valuations, exact=False):
+        return self.evaluate_columns([[valuation[parameter] for valuation in valuations] for parameter in self.parameters], exact, len(valuations))
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+# Read valuations from a CSV file with a header of parameter names
+def read_valuations(csv_file, exact):
+    convert = Fraction if exact else float
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        return [{name: convert(value) for name, value in row.items()} for row in reader], reader.fieldnames
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Batch membership of parameter valuations in a constraint synthesized by IMITATOR')
+    parser.add_argument('constraint', help='Result file (.res) or text of the constraint')
+    parser.add_argument('valuations', help='CSV file of valuations, with the parameter names as header')
+    parser.add_argument('--exact', action='store_true', help='Evaluate with exact rationals (default: floats)')
+    parser.add_argument('--output', default=None, help='Write the valuations with a column "member" (0 or 1) to this CSV file')
+    args = parser.parse_args()
+
+    text = args.constraint
+    if text.endswith(iu.RES_EXTENSION):
+        text = iu.parse_res_file(text)['constraint']
+        if text is None:
+            print('Error: no constraint in ' + args.constraint)
+            sys.exit(1)
+    valuations, fieldnames = read_valuations(args.valuations, args.exact)
+    try:
+        compiled = CompiledConstraint.from_text(text, fieldnames)
+    except (ValueError, iu.ConstraintParseError) as e:
+        print('Error: %s' % e)
+        sys.exit(1)
+    membership = compiled.evaluate(valuations, args.exact)
+    print('%d / %d valuation(s) in the constraint' % (sum(membership), len(valuations)))
+
+    if args.output is not None:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames + ['member'])
+            for valuation, member in zip(valuations, membership):
+                writer.writerow([valuation[name] for name in fieldnames] + [member])
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,264 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: sweep of the OCaml GC settings of IMITATOR (OCAMLRUNPARAM: minor heap size, space overhead, allocation policy) on a set of benchmarks: wall time, GC statistics and peak memory of each run, Pareto front of time and memory and recommended setting for each workload class (model family)
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import imitator_utilities as iu
+
+option_tuner = iu.load_script('option-tuner.py', 'option_tuner')
+
+
+# ************************************************************
+# GC SETTINGS
+# ************************************************************
+
+# Default grid: minor heap size (s, in words), space overhead (o, in percent), allocation policy (a; OCaml 4 only)
+DEFAULT_MINOR_HEAP_SIZES = ['256k', '1M', '4M', '16M']
+DEFAULT_SPACE_OVERHEADS = [80, 120, 200]
+DEFAULT_POLICIES = [0, 1, 2]
+
+# Print the GC statistics on stderr at exit
+GC_STATISTICS_FLAG = 'v=0x400'
+
+# Setting of the OCaml runtime (empty: default setting)
+BASELINE = ''
+
+GC_STATISTIC_PATTERN = re.compile(r'^\s*([a-z_]+)\s*:\s*([0-9.e+]+)\s*$', re.MULTILINE)
+
+# Exponent of the memory ratio in the trade-off score (0: time only)
+DEFAULT_MEMORY_WEIGHT = 0.5
+
+
+# Settings of the grid, as OCAMLRUNPARAM values (the baseline first)
+def make_grid(minor_heap_sizes, space_overheads, policies):
+    grid = [BASELINE]
+    for s, o, a in itertools.product(minor_heap_sizes, space_overheads, policies):
+        parts = []
+        if s is not None:
+            parts.append('s=%s' % s)
+        if o is not None:
+            parts.append('o=%s' % o)
+        if a is not None:
+            parts.append('a=%s' % a)
+        grid.append(','.join(parts))
+    return grid
+
+
+# Values of a grid dimension ("none": the dimension is not set)
+def grid_values(values):
+    return [None if value == 'none' else value for value in values]
+
+
+# GC statistics printed at exit: name => number
+def parse_gc_statistics(stderr):
+    statistics = {}
+    for name, value in GC_STATISTIC_PATTERN.findall(stderr):
+        try:
+            statistics[name] = float(value) if '.' in value or 'e' in value else int(value)
+        except ValueError:
+            pass
+    return statistics
+
+
+# ************************************************************
+# MEASUREMENT
+# ************************************************************
+
+# Run IMITATOR once with a GC setting; returns {'status', 'wall_time', 'max_rss' (in KiB), 'gc'}
+# NOTE: the process is waited with wait4, to get the peak memory of this process only
+def run_measured(benchmark, setting, binary, sandbox_dir, name, timeout):
+    env = dict(os.environ)
+    env['OCAMLRUNPARAM'] = ','.join(part for part in [setting, GC_STATISTICS_FLAG] if part)
+    cmd = [iu.find_binary(binary), os.path.abspath(benchmark.model_file)]
+    if benchmark.property_file is not None:
+        cmd.append(os.path.abspath(benchmark.property_file))
+    cmd += benchmark.options + ['-output-prefix', os.path.join(sandbox_dir, name)]
+    stdout_file = os.path.join(sandbox_dir, name + '.stdout')
+    stderr_file = os.path.join(sandbox_dir, name + '.stderr')
+    start = time.time()
+    with open(stdout_file, 'w') as stdout, open(stderr_file, 'w') as stderr:
+        try:
+            process = subprocess.Popen(cmd, cwd=sandbox_dir, stdout=stdout, stderr=stderr, env=env)
+        except OSError as e:
+            return {'status': iu.STATUS_FAILED, 'wall_time': 0.0, 'max_rss': None, 'gc': {}, 'error': str(e)}
+        timer = None
+        timed_out = threading.Event()
+        if timeout is not None:
+            def kill():
+                timed_out.set()
+                process.kill()
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+        _, wait_status, rusage = os.wait4(process.pid, 0)
+        wall_time = time.time() - start
+        # NOTE: the process is already reaped; Popen must not wait for it again
+        process.returncode = os.waitstatus_to_exitcode(wait_status)
+        if timer is not None:
+            timer.cancel()
+    with open(stderr_file) as f:
+        stderr_text = f.read()
+    status = iu.STATUS_TIMEOUT if timed_out.is_set() else (iu.STATUS_OK if process.returncode == 0 else iu.STATUS_FAILED)
+    # NOTE: ru_maxrss is in KiB on Linux
+    return {'status': status, 'wall_time': wall_time, 'max_rss': rusage.ru_maxrss, 'gc': parse_gc_statistics(stderr_text)}
+
+
+# Median measurement of a benchmark with a setting over the repetitions (None if one of the runs did not succeed)
+def measure(benchmark, setting, binary, sandbox_dir, name, timeout, repeat):
+    runs = []
+    for i in range(repeat):
+        run = run_measured(benchmark, setting, binary, sandbox_dir, '%s_%d' % (name, i), timeout)
+        runs.append(run)
+        if run['status'] != iu.STATUS_OK:
+            return {'status': run['status'], 'runs': runs}
+    return {
+        'status': iu.STATUS_OK,
+        'wall_time': statistics.median(run['wall_time'] for run in runs),
+        'max_rss': max(run['max_rss'] for run in runs),
+        'gc': runs[len(runs) // 2]['gc'],
+        'runs': runs,
+    }
+
+
+# ************************************************************
+# RECOMMENDATION
+# ************************************************************
+
+# Total time and peak memory of each setting on a class (only the settings that succeeded on all its benchmarks)
+def class_totals(benchmarks, grid, measurements):
+    totals = {}
+    for setting in grid:
+        results = [measurements[benchmark.name, setting] for benchmark in benchmarks]
+        if all(result['status'] == iu.STATUS_OK for result in results):
+            totals[setting] = {
+                'wall_time': sum(result['wall_time'] for result in results),
+                'max_rss': max(result['max_rss'] for result in results),
+                'minor_collections': sum(result['gc'].get('minor_collections', 0) for result in results),
+                'major_collections': sum(result['gc'].get('major_collections', 0) for result in results),
+            }
+    return totals
+
+
+# Settings not dominated in time and memory
+def pareto_front(totals):
+    front = []
+    for setting, total in totals.items():
+        if not any(other['wall_time'] <= total['wall_time'] and other['max_rss'] <= total['max_rss'] and (other['wall_time'] < total['wall_time'] or other['max_rss'] < total['max_rss']) for other in totals.values()):
+            front.append(setting)
+    return sorted(front, key=lambda setting: totals[setting]['wall_time'])
+
+
+# Best trade-off: smallest (time / baseline time) * (memory / baseline memory) ^ weight on the Pareto front
+def recommend(totals, memory_weight):
+    if BASELINE not in totals:
+        return None
+    baseline = totals[BASELINE]
+    def score(setting):
+        return totals[setting]['wall_time'] / baseline['wall_time'] * math.pow(totals[setting]['max_rss'] / baseline['max_rss'], memory_weight)
+    return min(pareto_front(totals), key=lambda setting: (score(setting), setting != BASELINE))
+
+
+def setting_name(setting):
+    return setting or 'default'
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Sweep of the OCaml GC settings (OCAMLRUNPARAM) of IMITATOR, with a recommended setting for each workload class')
+    parser.add_argument('benchmarks', nargs='?', default=None, help='JSON file of the benchmarks: list of {"name", "model", "property", "family", "options"} (default: the benchmarks of the comparator)')
+    parser.add_argument('--classes', nargs='+', default=None, help='Only these workload classes (families)')
+    parser.add_argument('--minor-heap', nargs='+', default=DEFAULT_MINOR_HEAP_SIZES, help='Minor heap sizes (s, in words; "none": not set) (default: %s)' % ' '.join(DEFAULT_MINOR_HEAP_SIZES))
+    parser.add_argument('--space-overhead', nargs='+', default=[str(value) for value in DEFAULT_SPACE_OVERHEADS], help='Space overheads (o; "none": not set) (default: %s)' % ' '.join(str(value) for value in DEFAULT_SPACE_OVERHEADS))
+    parser.add_argument('--policy', nargs='+', default=[str(value) for value in DEFAULT_POLICIES], help='Allocation policies (a; ignored by OCaml 5; "none": not set) (default: %s)' % ' '.join(str(value) for value in DEFAULT_POLICIES))
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs of each benchmark and setting; the median time is kept (default: 3)')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit of each run (in seconds)')
+    parser.add_argument('--memory-weight', type=float, default=DEFAULT_MEMORY_WEIGHT, help='Weight of the memory in the trade-off: score = time ratio * memory ratio ^ weight (default: %g)' % DEFAULT_MEMORY_WEIGHT)
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator)')
+    parser.add_argument('--output', default='gc-sweep.json', help='Measurements and recommendations (JSON; default: gc-sweep.json)')
+    parser.add_argument('--install', action='store_true', help='Use the setting recommended for all the benchmarks as default setting of the IMITATOR runs of the scripts (%s)' % iu.OCAMLRUNPARAM_PATH)
+    parser.add_argument('--quiet', action='store_true', help='Only print the recommendations')
+    args = parser.parse_args()
+
+    benchmarks = option_tuner.read_benchmarks(args.benchmarks) if args.benchmarks else option_tuner.comparator_benchmarks()
+    classes = {}
+    for benchmark in benchmarks:
+        if args.classes is None or benchmark.family in args.classes:
+            classes.setdefault(benchmark.family, []).append(benchmark)
+    if not classes:
+        print('Error: no benchmark')
+        sys.exit(2)
+    grid = make_grid(grid_values(args.minor_heap), grid_values(args.space_overhead), grid_values(args.policy))
+
+    sandbox_dir = iu.create_sandbox('imitator_gc_sweep_')
+    measurements = {}
+    try:
+        for i, setting in enumerate(grid):
+            if not args.quiet:
+                print('[%d/%d] OCAMLRUNPARAM=%s' % (i + 1, len(grid), setting_name(setting)))
+            for benchmark in [benchmark for family in sorted(classes) for benchmark in classes[family]]:
+                result = measure(benchmark, setting, args.imitator, sandbox_dir, 'run%d' % len(measurements), args.timeout, args.repeat)
+                measurements[benchmark.name, setting] = result
+                if not args.quiet:
+                    if result['status'] == iu.STATUS_OK:
+                        print('  %-30s %8.2f s %10d KiB %6d minor / %4d major collections' % (benchmark.name, result['wall_time'], result['max_rss'], result['gc'].get('minor_collections', 0), result['gc'].get('major_collections', 0)))
+                    else:
+                        print('  %-30s %s' % (benchmark.name, result['status']))
+    finally:
+        shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+    report = {'grid': grid, 'measurements': [dict(benchmark=name, setting=setting, **result) for (name, setting), result in measurements.items()], 'classes': {}}
+    all_benchmarks = [benchmark for family in sorted(classes) for benchmark in classes[family]]
+    for family, family_benchmarks in sorted(classes.items()) + [('all', all_benchmarks)]:
+        totals = class_totals(family_benchmarks, grid, measurements)
+        front = pareto_front(totals)
+        best = recommend(totals, args.memory_weight)
+        report['classes'][family] = {'benchmarks': [benchmark.name for benchmark in family_benchmarks], 'totals': totals, 'pareto_front': front, 'recommended': best}
+        if best is None:
+            print('%s: the default setting did not succeed on all the benchmarks' % family)
+            continue
+        baseline = totals[BASELINE]
+        print('%s: OCAMLRUNPARAM=%s (time %.2f s, %.2fx the default; peak memory %d KiB, %.2fx the default); Pareto front: %s' % (family, setting_name(best), totals[best]['wall_time'], totals[best]['wall_time'] / baseline['wall_time'], totals[best]['max_rss'], totals[best]['max_rss'] / baseline['max_rss'], ', '.join(setting_name(setting) for setting in front)))
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print('Report written to %s' % args.output)
+
+    if args.install:
+        best = report['classes']['all']['recommended']
+        if best is None:
+            print('Error: no setting to install')
+            sys.exit(1)
+        os.makedirs(os.path.dirname(iu.OCAMLRUNPARAM_PATH), exist_ok=True)
+        with open(iu.OCAMLRUNPARAM_PATH, 'w') as f:
+            f.write(best + '\n')
+        print('OCAMLRUNPARAM=%s installed in %s' % (setting_name(best), iu.OCAMLRUNPARAM_PATH))
+
+
+if __name__ == '__main__':
+    __main__()
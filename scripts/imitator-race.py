@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: race of a portfolio of option sets on one analysis: the configurations run in parallel, the first conclusive result (exact soundness) wins and the other processes are killed; the winners are recorded for each model and property, so that the next races start with the likely winners
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import sys
+import threading
+import time
+
+import imitator_utilities as iu
+
+
+# ************************************************************
+# PORTFOLIO
+# ************************************************************
+
+# Default portfolio: name => (options, property keywords for which the options are relevant (None: all))
+CYCLE_PROPERTIES = ['AccCycle', 'AcceptingCycle', 'Cycle', 'CycleThrough', 'NZCycle']
+DEFAULT_PORTFOLIO = [
+    ('default', '', None),
+    ('merge', '-merge yes', None),
+    ('inclusion', '-comparison inclusion', None),
+    ('merge-inclusion', '-merge yes -comparison inclusion', None),
+    ('queueBFS', '-expl-order queueBFS', None),
+    ('queueBFSPRIOR', '-expl-order queueBFSPRIOR', None),
+    ('NDFS', '-cycle-algo NDFS', CYCLE_PROPERTIES),
+    ('BFS', '-cycle-algo BFS', CYCLE_PROPERTIES),
+    ('NDFS-no-subsumption', '-cycle-algo NDFS -no-subsumption', CYCLE_PROPERTIES),
+]
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'imitator-race.json')
+
+# Soundness of a conclusive result
+CONCLUSIVE_SOUNDNESS = 'exact'
+
+PROPERTY_KEYWORD_PATTERN = re.compile(r'#\s*(?:synth|exhibit|witness)\s+(\w+)')
+
+# Status of a configuration in a race
+RACE_WON = 'won'
+RACE_INCONCLUSIVE = 'inconclusive'
+RACE_KILLED = 'killed'
+RACE_NOT_STARTED = 'not started'
+
+
+# A configuration of the portfolio
+class Configuration:
+    def __init__(self, name, options, properties=None):
+        self.name = name
+        self.options = shlex.split(options) if isinstance(options, str) else list(options)
+        self.properties = properties
+        # Outcome of the race
+        self.status = RACE_NOT_STARTED
+        self.execution = None
+        self.process = None
+
+
+# Portfolio from a JSON file: list of {"name": ..., "options": ..., "properties": [...] (optional)}
+def read_portfolio(portfolio_file):
+    with open(portfolio_file) as f:
+        return [Configuration(item['name'], item.get('options', ''), item.get('properties')) for item in json.load(f)]
+
+
+def default_portfolio():
+    return [Configuration(name, options, properties) for name, options, properties in DEFAULT_PORTFOLIO]
+
+
+# Keyword of the property (e.g., EF, CycleThrough), or None
+def property_keyword(property_file):
+    if property_file is None:
+        return None
+    with open(property_file) as f:
+        m = PROPERTY_KEYWORD_PATTERN.search(f.read())
+    return m.group(1) if m else None
+
+
+# ************************************************************
+# HISTORY OF THE WINNERS
+# ************************************************************
+
+# History: key of (model, property) => {'model': ..., 'wins': {configuration: number of wins}, 'last_winner': ..., 'times': {configuration: last winning time}}
+
+def history_key(model_file, property_file):
+    digest = hashlib.sha256()
+    for path in [model_file, property_file]:
+        if path is not None:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def read_history(history_file):
+    try:
+        with open(history_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_history(history_file, history):
+    directory = os.path.dirname(history_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # NOTE: written to a temporary file first, so that concurrent races never read a partial file
+    temporary = history_file + '.%d' % os.getpid()
+    with open(temporary, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(temporary, history_file)
+
+
+# Order the portfolio: the last winner first, then by decreasing number of wins (the order of the portfolio otherwise)
+def order_portfolio(portfolio, entry):
+    if entry is None:
+        return portfolio
+    wins = entry.get('wins', {})
+    last_winner = entry.get('last_winner')
+    return sorted(portfolio, key=lambda configuration: (configuration.name != last_winner, -wins.get(configuration.name, 0)))
+
+
+# ************************************************************
+# RACE
+# ************************************************************
+
+class Race:
+    def __init__(self, model_file, property_file, configurations, common_options, binary, timeout, work_dir):
+        self.model_file = model_file
+        self.property_file = property_file
+        self.pending = list(configurations)
+        self.common_options = common_options
+        self.binary = binary
+        self.deadline = None if timeout is None else time.time() + timeout
+        self.work_dir = work_dir
+        self.winner = None
+        self.lock = threading.Lock()
+
+    # Record the process of a configuration (killed at once if the race is over)
+    def attach_process(self, configuration, process):
+        with self.lock:
+            configuration.process = process
+            if self.winner is not None:
+                process.kill()
+
+    def worker(self):
+        while True:
+            with self.lock:
+                if self.winner is not None or not self.pending:
+                    return
+                configuration = self.pending.pop(0)
+            timeout = None
+            if self.deadline is not None:
+                timeout = self.deadline - time.time()
+                if timeout <= 0:
+                    return
+            execution = iu.run_imitator(self.work_dir, configuration.name, model_file=self.model_file, property_file=self.property_file, options=configuration.options + self.common_options, binary=self.binary, timeout=timeout, started=lambda process: self.attach_process(configuration, process))
+            result = execution.result() if execution.status == iu.STATUS_OK else None
+            with self.lock:
+                configuration.execution = execution
+                if self.winner is not None:
+                    configuration.status = RACE_KILLED
+                elif result is not None and result['soundness'] == CONCLUSIVE_SOUNDNESS:
+                    configuration.status = RACE_WON
+                    self.winner = configuration
+                    for other in self.running():
+                        other.process.kill()
+                else:
+                    configuration.status = RACE_INCONCLUSIVE if execution.status != iu.STATUS_TIMEOUT else iu.STATUS_TIMEOUT
+
+    # Configurations with a process still running (called with the lock)
+    def running(self):
+        return [configuration for configuration in self.all_configurations if configuration.process is not None and configuration.execution is None]
+
+    def run(self, nb_workers):
+        self.all_configurations = list(self.pending)
+        threads = [threading.Thread(target=self.worker) for _ in range(min(nb_workers, len(self.pending)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.winner
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Race of a portfolio of IMITATOR options on one analysis: the first conclusive result wins')
+    parser.add_argument('model', help='Model (.imi)')
+    parser.add_argument('property', nargs='?', default=None, help='Property (.imiprop)')
+    parser.add_argument('--portfolio', default=None, help='JSON file with the portfolio: list of {"name", "options", "properties" (optional list of property keywords)} (default: built-in portfolio)')
+    parser.add_argument('--options', nargs=argparse.REMAINDER, default=[], help='Options common to all configurations (must come last: all the following arguments are passed to IMITATOR)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of configurations running in parallel (default: number of cores)')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit of the race (in seconds)')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator)')
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help='File of the past winners (default: %s)' % DEFAULT_HISTORY_PATH)
+    parser.add_argument('--output', default=None, help='Result file of the winner (default: <model>-race.res)')
+    args = parser.parse_args()
+
+    portfolio = read_portfolio(args.portfolio) if args.portfolio else default_portfolio()
+    keyword = property_keyword(args.property)
+    portfolio = [configuration for configuration in portfolio if configuration.properties is None or keyword in configuration.properties]
+    history = read_history(args.history)
+    key = history_key(args.model, args.property)
+    portfolio = order_portfolio(portfolio, history.get(key))
+    print('Race of %d configuration(s) (%s) with %d worker(s)' % (len(portfolio), ', '.join(configuration.name for configuration in portfolio), args.workers))
+
+    work_dir = iu.create_sandbox('imitator_race_')
+    start = time.time()
+    try:
+        race = Race(args.model, args.property, portfolio, iu.split_options(args.options), args.imitator, args.timeout, work_dir)
+        winner = race.run(args.workers)
+        wall_time = time.time() - start
+        for configuration in portfolio:
+            time_text = '%.2f s' % configuration.execution.wall_time if configuration.execution is not None else '-'
+            print('  %-25s %-14s %s' % (configuration.name, configuration.status, time_text))
+        if winner is None:
+            print('No conclusive result in %.1f s' % wall_time)
+            sys.exit(1)
+        output = args.output or os.path.splitext(args.model)[0] + '-race' + iu.RES_EXTENSION
+        shutil.copyfile(winner.execution.res_file, output)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    entry = history.setdefault(key, {'model': os.path.abspath(args.model), 'property': os.path.abspath(args.property) if args.property else None, 'wins': {}, 'times': {}})
+    entry['wins'][winner.name] = entry['wins'].get(winner.name, 0) + 1
+    entry['times'][winner.name] = winner.execution.wall_time
+    entry['last_winner'] = winner.name
+    write_history(args.history, history)
+    print('Winner: %s (%s) in %.2f s; result written to %s' % (winner.name, ' '.join(winner.options) or 'no option', wall_time, output))
+
+
+if __name__ == '__main__':
+    __main__()
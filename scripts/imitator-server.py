@@ -0,0 +1,622 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: local job server for IMITATOR analyses: JSON API over HTTP or a Unix socket, queue with priorities (and fair share between users), pool of workers, time and memory limits per job, progress and cancellation, and cache of the results keyed on the model, the property, the options and the binary; also a small client (submit, status, wait, cancel)
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import hashlib
+import http.client
+import http.server
+import itertools
+import json
+import os
+import re
+import shlex
+import shutil
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import imitator_utilities as iu
+
+
+# ************************************************************
+# CONFIGURATION
+# ************************************************************
+
+DEFAULT_PORT = 8642
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'imitator-server')
+
+# Number of finished jobs kept in memory
+MAX_FINISHED_JOBS = 1000
+
+# Number of characters of the standard output and error kept for each job
+OUTPUT_TAIL = 10000
+
+# Status of a job
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_TIMEOUT = 'timeout'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = [JOB_DONE, JOB_FAILED, JOB_TIMEOUT, JOB_CANCELLED]
+
+
+# ************************************************************
+# RESULT CACHE
+# ************************************************************
+
+# Binary path => ((size, modification time), hash)
+binary_hashes = {}
+
+
+# Hash of the content of the binary (recomputed only if the file changed)
+def binary_hash(binary):
+    stat = os.stat(binary)
+    signature = (stat.st_size, stat.st_mtime)
+    if binary not in binary_hashes or binary_hashes[binary][0] != signature:
+        digest = hashlib.sha256()
+        with open(binary, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        binary_hashes[binary] = (signature, digest.hexdigest())
+    return binary_hashes[binary][1]
+
+
+# Key of a job in the cache
+# NOTE: the limits are not part of the key, as only the successful executions are cached
+def cache_key(model_text, property_text, options, binary):
+    digest = hashlib.sha256()
+    for part in [model_text, property_text or '', '\0'.join(options), binary_hash(binary)]:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\1')
+    return digest.hexdigest()
+
+
+# Results of the successful executions: <key>.res (result file) and <key>.json (information on the execution)
+class ResultCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.nb_hits = 0
+        self.nb_misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    # (information, content of the result file), or None
+    def get(self, key):
+        if self.directory is None:
+            return None
+        path = os.path.join(self.directory, key)
+        with self.lock:
+            try:
+                with open(path + '.json') as f:
+                    information = json.load(f)
+                with open(path + iu.RES_EXTENSION) as f:
+                    content = f.read()
+            except (OSError, ValueError):
+                self.nb_misses += 1
+                return None
+            self.nb_hits += 1
+            return information, content
+
+    def put(self, key, information, content):
+        if self.directory is None:
+            return
+        path = os.path.join(self.directory, key)
+        with self.lock:
+            # NOTE: the result file is written first, so that an entry with its .json file is complete
+            with open(path + iu.RES_EXTENSION, 'w') as f:
+                f.write(content)
+            with open(path + '.json', 'w') as f:
+                json.dump(information, f)
+
+    def statistics(self):
+        if self.directory is None:
+            return {'enabled': False}
+        return {'enabled': True, 'directory': self.directory, 'entries': len([name for name in os.listdir(self.directory) if name.endswith('.json')]), 'hits': self.nb_hits, 'misses': self.nb_misses}
+
+
+# ************************************************************
+# JOBS
+# ************************************************************
+
+class Job:
+    def __init__(self, number, key, model_text, property_text, options, binary, priority, timeout, memory_limit, user):
+        self.id = str(number)
+        self.number = number
+        self.key = key
+        self.model_text = model_text
+        self.property_text = property_text
+        self.options = options
+        self.binary = binary
+        self.priority = priority
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.user = user
+        self.status = JOB_QUEUED
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.cached = False
+        self.returncode = None
+        self.wall_time = None
+        self.stdout = ''
+        self.stderr = ''
+        self.res_content = None
+        self.process = None
+        # Jobs identical to this one submitted while it was queued or running
+        self.duplicates = []
+        self.finished_event = threading.Event()
+
+    # Called when the process of the job is started
+    def attach_process(self, process):
+        self.process = process
+        # NOTE: the job may have been cancelled while its process was starting
+        if self.status == JOB_CANCELLED:
+            process.kill()
+
+    # Description of the job (without the result file)
+    def summary(self):
+        summary = {
+            'id': self.id,
+            'status': self.status,
+            'user': self.user,
+            'priority': self.priority,
+            'options': self.options,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'cached': self.cached,
+            'timeout': self.timeout,
+            'memory_limit': self.memory_limit,
+        }
+        if self.status == JOB_RUNNING:
+            elapsed = time.time() - self.started
+            summary['progress'] = {'elapsed': elapsed, 'time_ratio': elapsed / self.timeout if self.timeout else None}
+        if self.status in FINISHED_STATUSES:
+            summary.update({'returncode': self.returncode, 'wall_time': self.wall_time})
+            if self.res_content is not None:
+                result = iu.parse_res(self.res_content)
+                summary['result'] = result
+        return summary
+
+
+# Positive number of a request converted with convert (default if absent); raises ValueError if invalid
+def positive_value(request, key, convert, default):
+    value = request.get(key)
+    if value is None:
+        return default
+    try:
+        converted = convert(value)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid %s: %r' % (key, value))
+    if isinstance(value, bool) or not converted > 0:
+        raise ValueError('Invalid %s: %r (positive number expected)' % (key, value))
+    return converted
+
+
+# Queue of jobs and pool of workers
+class JobServer:
+    def __init__(self, nb_workers, cache, binaries, default_timeout, default_memory_limit):
+        self.cache = cache
+        # Binaries that the jobs may use (the first one by default)
+        self.binaries = binaries or [iu.find_binary()]
+        self.default_binary = self.binaries[0]
+        self.default_timeout = default_timeout
+        self.default_memory_limit = default_memory_limit
+        self.jobs = {}
+        self.queue = []
+        # Key => queued or running job (deduplication)
+        self.active = {}
+        # User => number of running jobs
+        self.running_per_user = {}
+        self.counter = itertools.count(1)
+        self.condition = threading.Condition()
+        self.workers = [threading.Thread(target=self.worker, daemon=True) for _ in range(nb_workers)]
+        for worker in self.workers:
+            worker.start()
+
+    # Binary of a request: the default one, or one of the binaries given to the server (by its name or its path)
+    def request_binary(self, request):
+        binary = request.get('binary')
+        if binary is None:
+            return self.default_binary
+        for allowed in self.binaries:
+            if binary == allowed or (isinstance(binary, str) and os.path.realpath(binary) == os.path.realpath(allowed)):
+                return allowed
+        raise ValueError('Binary %s not allowed (allowed: %s)' % (binary, ', '.join(self.binaries)))
+
+    # Submit a job from a request (dictionary); returns the job (an identical queued or running job, or a new job)
+    # Raises ValueError for an invalid request
+    def submit(self, request):
+        timeout = positive_value(request, 'timeout', float, self.default_timeout)
+        memory_limit = positive_value(request, 'memory_limit', int, self.default_memory_limit)
+        try:
+            priority = int(request.get('priority', 0))
+        except (TypeError, ValueError):
+            raise ValueError('Invalid priority: %r' % (request.get('priority'),))
+        binary = self.request_binary(request)
+        model_text = request.get('model_text')
+        if model_text is None:
+            with open(request['model']) as f:
+                model_text = f.read()
+        property_text = request.get('property_text')
+        if property_text is None and request.get('property') is not None:
+            with open(request['property']) as f:
+                property_text = f.read()
+        options = request.get('options', [])
+        if isinstance(options, str):
+            options = shlex.split(options)
+        key = cache_key(model_text, property_text, options, binary)
+        with self.condition:
+            number = next(self.counter)
+            job = Job(number, key, model_text, property_text, options, binary, priority, timeout, memory_limit, str(request.get('user', 'anonymous')))
+            self.jobs[job.id] = job
+            cached = self.cache.get(key)
+            if cached is not None:
+                information, content = cached
+                self.finish(job, JOB_DONE, information['returncode'], information['wall_time'], information['stdout'], information['stderr'], content)
+                job.cached = True
+            elif key in self.active:
+                # NOTE: the identical job gets the result of the active one; its priority is raised if needed
+                original = self.active[key]
+                original.duplicates.append(job)
+                original.priority = max(original.priority, job.priority)
+            else:
+                self.active[key] = job
+                self.queue.append(job)
+                self.condition.notify()
+            self.forget_old_jobs()
+        return job
+
+    # Next job to run: highest priority, then user with the fewest running jobs, then first submitted
+    def pop_job(self):
+        job = min(self.queue, key=lambda job: (-job.priority, self.running_per_user.get(job.user, 0), job.number))
+        self.queue.remove(job)
+        return job
+
+    def worker(self):
+        while True:
+            with self.condition:
+                while not self.queue:
+                    self.condition.wait()
+                job = self.pop_job()
+                job.status = JOB_RUNNING
+                job.started = time.time()
+                self.running_per_user[job.user] = self.running_per_user.get(job.user, 0) + 1
+            try:
+                self.run(job)
+            except Exception as e:
+                # NOTE: an unexpected error fails the job (and its duplicates) but not the worker
+                with self.condition:
+                    if not job.finished_event.is_set():
+                        self.finish(job, JOB_CANCELLED if job.status == JOB_CANCELLED else JOB_FAILED, None, None, '', 'Internal error: %s: %s' % (type(e).__name__, e), None)
+            finally:
+                with self.condition:
+                    self.running_per_user[job.user] -= 1
+
+    def run(self, job):
+        sandbox = iu.create_sandbox('imitator_job_')
+        try:
+            execution = iu.run_imitator(sandbox, 'job', model_text=job.model_text, property_text=job.property_text, options=job.options, binary=job.binary, timeout=job.timeout, memory_limit=job.memory_limit * 1024 * 1024 if job.memory_limit else None, started=job.attach_process)
+            content = None
+            if execution.res_file is not None and os.path.isfile(execution.res_file):
+                with open(execution.res_file) as f:
+                    content = f.read()
+        finally:
+            shutil.rmtree(sandbox, ignore_errors=True)
+        stdout, stderr = (execution.stdout or '')[-OUTPUT_TAIL:], (execution.stderr or '')[-OUTPUT_TAIL:]
+        with self.condition:
+            if job.status == JOB_CANCELLED:
+                status = JOB_CANCELLED
+            elif execution.status == iu.STATUS_TIMEOUT:
+                status = JOB_TIMEOUT
+            elif execution.status == iu.STATUS_OK:
+                status = JOB_DONE
+            else:
+                status = JOB_FAILED
+            if status == JOB_DONE and content is not None:
+                self.cache.put(job.key, {'returncode': execution.returncode, 'wall_time': execution.wall_time, 'stdout': stdout, 'stderr': stderr, 'options': job.options}, content)
+            self.finish(job, status, execution.returncode, execution.wall_time, stdout, stderr, content)
+
+    # Record the end of a job and of its duplicates (called with the lock)
+    def finish(self, job, status, returncode, wall_time, stdout, stderr, content):
+        for finished_job in [job] + job.duplicates:
+            finished_job.status = status
+            finished_job.returncode = returncode
+            finished_job.wall_time = wall_time
+            finished_job.stdout = stdout
+            finished_job.stderr = stderr
+            finished_job.res_content = content
+            finished_job.started = finished_job.started or job.started
+            finished_job.finished = time.time()
+            finished_job.process = None
+            finished_job.finished_event.set()
+        if self.active.get(job.key) is job:
+            del self.active[job.key]
+
+    # Cancel a job; returns False if already finished
+    # NOTE: cancelling a job that others duplicate cancels them too
+    def cancel(self, job):
+        with self.condition:
+            if job.status in FINISHED_STATUSES:
+                return False
+            original = self.active.get(job.key)
+            if original is not None and job in original.duplicates:
+                # Only this submission is cancelled
+                original.duplicates.remove(job)
+                job.status = JOB_CANCELLED
+                job.finished = time.time()
+                job.finished_event.set()
+                return True
+            if job.status == JOB_QUEUED:
+                self.queue.remove(job)
+                self.finish(job, JOB_CANCELLED, None, None, '', '', None)
+                return True
+            job.status = JOB_CANCELLED
+            if job.process is not None:
+                job.process.kill()
+            return True
+
+    # Position of a queued job in the queue (0 for the next one)
+    def queue_position(self, job):
+        with self.condition:
+            order = sorted(self.queue, key=lambda queued: (-queued.priority, self.running_per_user.get(queued.user, 0), queued.number))
+            return order.index(job) if job in order else None
+
+    # Forget the oldest finished jobs (called with the lock)
+    def forget_old_jobs(self):
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATUSES]
+        if len(finished) > MAX_FINISHED_JOBS:
+            finished.sort(key=lambda job: job.finished)
+            for job in finished[:len(finished) - MAX_FINISHED_JOBS]:
+                del self.jobs[job.id]
+
+    def statistics(self):
+        with self.condition:
+            statuses = {}
+            for job in self.jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            return {'workers': len(self.workers), 'queued': len(self.queue), 'jobs': statuses, 'cache': self.cache.statistics()}
+
+
+# ************************************************************
+# HTTP API
+# ************************************************************
+
+# API (JSON):
+#   POST /jobs                 submit {model | model_text, property | property_text, options, priority, timeout, memory_limit (MB), binary, user}
+#   GET  /jobs                 summary of all jobs
+#   GET  /jobs/<id>            summary of a job, with its progress or its result
+#   GET  /jobs/<id>/result     result file of a finished job (text)
+#   GET  /jobs/<id>/wait       wait for the end of a job (at most ?timeout=<seconds>)
+#   POST /jobs/<id>/cancel     cancel a job
+#   GET  /status               statistics of the server
+JOB_PATH_PATTERN = re.compile(r'^/jobs/(\d+)(?:/(result|wait|cancel))?$')
+
+
+class RequestHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write('[%s] %s\n' % (time.strftime('%Y-%m-%d %H:%M:%S'), format % args))
+
+    def send(self, code, content, content_type='application/json'):
+        data = (json.dumps(content) if content_type == 'application/json' else content).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def job_or_404(self, job_id):
+        job = self.server.job_server.jobs.get(job_id)
+        if job is None:
+            self.send(404, {'error': 'No job ' + job_id})
+        return job
+
+    def do_GET(self):
+        job_server = self.server.job_server
+        path, _, query = self.path.partition('?')
+        if path == '/status':
+            return self.send(200, job_server.statistics())
+        if path == '/jobs':
+            return self.send(200, [job.summary() for job in list(job_server.jobs.values())])
+        m = JOB_PATH_PATTERN.match(path)
+        if not m or m.group(2) == 'cancel':
+            return self.send(404, {'error': 'Unknown path ' + path})
+        job = self.job_or_404(m.group(1))
+        if job is None:
+            return
+        if m.group(2) == 'result':
+            if job.res_content is None:
+                return self.send(404, {'error': 'No result for job ' + job.id, 'status': job.status})
+            return self.send(200, job.res_content, 'text/plain; charset=utf-8')
+        if m.group(2) == 'wait':
+            timeout = re.search(r'(?:^|&)timeout=([0-9.]+)', query)
+            job.finished_event.wait(float(timeout.group(1)) if timeout else None)
+        summary = job.summary()
+        if job.status == JOB_QUEUED:
+            summary['queue_position'] = job_server.queue_position(job)
+        self.send(200, summary)
+
+    def do_POST(self):
+        job_server = self.server.job_server
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            return self.send(400, {'error': 'Invalid JSON: %s' % e})
+        if self.path == '/jobs':
+            if not isinstance(request, dict):
+                return self.send(400, {'error': 'Invalid request: JSON object expected'})
+            if 'model' not in request and 'model_text' not in request:
+                return self.send(400, {'error': 'No model'})
+            try:
+                job = job_server.submit(request)
+            except (OSError, ValueError) as e:
+                return self.send(400, {'error': str(e)})
+            return self.send(201, job.summary())
+        m = JOB_PATH_PATTERN.match(self.path)
+        if not m or m.group(2) != 'cancel':
+            return self.send(404, {'error': 'Unknown path ' + self.path})
+        job = self.job_or_404(m.group(1))
+        if job is not None:
+            self.send(200, {'id': job.id, 'cancelled': job_server.cancel(job), 'status': job.status})
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    # NOTE: the clients of a Unix socket have no address
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('local', 0)
+
+
+def make_http_server(job_server, port, unix_socket, verbose):
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, RequestHandler)
+    else:
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', port), RequestHandler)
+    server.job_server = job_server
+    server.verbose = verbose
+    return server
+
+
+# ************************************************************
+# CLIENT
+# ************************************************************
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, unix_socket, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_socket = unix_socket
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_socket)
+
+
+# Send a request to the server; returns the decoded JSON (or the text)
+def request_server(method, path, content=None, port=DEFAULT_PORT, unix_socket=None):
+    if unix_socket is not None:
+        connection = UnixHTTPConnection(unix_socket)
+    else:
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+    body = json.dumps(content).encode('utf-8') if content is not None else None
+    connection.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    data = response.read().decode('utf-8')
+    connection.close()
+    if response.getheader('Content-Type', '').startswith('application/json'):
+        data = json.loads(data)
+    if response.status >= 400:
+        raise RuntimeError(data.get('error', data) if isinstance(data, dict) else data)
+    return data
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Local job server for IMITATOR analyses, and its client')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port on localhost (default: %d)' % DEFAULT_PORT)
+    parser.add_argument('--socket', default=None, help='Unix socket (instead of the TCP port)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Run the server')
+    serve.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of analyses in parallel (default: number of cores)')
+    serve.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Directory of the result cache (default: %s)' % DEFAULT_CACHE_PATH)
+    serve.add_argument('--no-cache', action='store_true', help='Disable the result cache')
+    serve.add_argument('--imitator', action='append', default=None, help='IMITATOR binary that the jobs may use (repeatable; the first one is the default; default: bin/imitator)')
+    serve.add_argument('--timeout', type=float, default=None, help='Default time limit of the jobs (in seconds)')
+    serve.add_argument('--memory', type=int, default=None, help='Default memory limit of the jobs (in MB)')
+    serve.add_argument('--verbose', action='store_true', help='Log the requests')
+
+    submit = commands.add_parser('submit', help='Submit a job')
+    submit.add_argument('model', help='Model (.imi)')
+    submit.add_argument('property', nargs='?', default=None, help='Property (.imiprop)')
+    submit.add_argument('--options', nargs=argparse.REMAINDER, default=[], help='Options for IMITATOR (must come last: all the following arguments are passed to IMITATOR)')
+    submit.add_argument('--priority', type=int, default=0, help='Priority (higher first; default: 0)')
+    submit.add_argument('--timeout', type=float, default=None, help='Time limit (in seconds)')
+    submit.add_argument('--memory', type=int, default=None, help='Memory limit (in MB)')
+    submit.add_argument('--imitator', default=None, help='IMITATOR binary')
+    submit.add_argument('--user', default=os.environ.get('USER', 'anonymous'), help='User name (for the fair share)')
+    submit.add_argument('--wait', action='store_true', help='Wait for the end of the job and print its result file')
+
+    for name, help_text in [('status', 'Print the status of a job (or of the server without job)'), ('wait', 'Wait for a job and print its result file'), ('cancel', 'Cancel a job')]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('job', nargs='?' if name == 'status' else None, default=None, help='Job identifier')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        cache = ResultCache(None if args.no_cache else args.cache)
+        job_server = JobServer(args.workers, cache, args.imitator, args.timeout, args.memory)
+        server = make_http_server(job_server, args.port, args.socket, args.verbose)
+        print('IMITATOR job server with %d worker(s) on %s' % (args.workers, args.socket or 'http://127.0.0.1:%d' % args.port))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if args.socket is not None and os.path.exists(args.socket):
+                os.remove(args.socket)
+        return
+
+    def call(method, path, content=None):
+        try:
+            return request_server(method, path, content, args.port, args.socket)
+        except (OSError, RuntimeError) as e:
+            print('Error: %s' % e)
+            sys.exit(1)
+
+    if args.command == 'submit':
+        request = {'model': os.path.abspath(args.model), 'options': iu.split_options(args.options), 'priority': args.priority, 'user': args.user}
+        if args.property is not None:
+            request['property'] = os.path.abspath(args.property)
+        if args.imitator is not None and os.path.exists(args.imitator):
+            args.imitator = os.path.abspath(args.imitator)
+        for key, value in [('timeout', args.timeout), ('memory_limit', args.memory), ('binary', args.imitator)]:
+            if value is not None:
+                request[key] = value
+        job = call('POST', '/jobs', request)
+        print('Job %s: %s%s' % (job['id'], job['status'], ' (cached)' if job['cached'] else ''))
+        if not args.wait:
+            return
+        args.job = job['id']
+    if args.command == 'status':
+        print(json.dumps(call('GET', '/jobs/' + args.job if args.job else '/status'), indent=1))
+    elif args.command == 'cancel':
+        job = call('POST', '/jobs/%s/cancel' % args.job)
+        print('Job %s: %s' % (job['id'], job['status']))
+    else:
+        job = call('GET', '/jobs/%s/wait' % args.job)
+        print('Job %s: %s' % (job['id'], job['status']))
+        if job['status'] == JOB_DONE:
+            print(call('GET', '/jobs/%s/result' % args.job))
+        else:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    __main__()
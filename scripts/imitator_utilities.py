@@ -0,0 +1,534 @@
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: common functions for the scripts running IMITATOR (execution in a sandbox, parsing of the result files and of the synthesized constraints)
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import importlib.util
+import os
+import re
+import resource
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+from fractions import Fraction
+
+# ************************************************************
+# GENERAL CONFIGURATION
+# ************************************************************
+
+# Path to the scripts directory
+SCRIPTS_PATH = os.path.dirname(os.path.abspath(__file__))
+# Root path to the main IMITATOR root directory
+IMITATOR_PATH = os.path.dirname(SCRIPTS_PATH)
+# Default IMITATOR binary
+DEFAULT_BINARY = os.path.join(IMITATOR_PATH, 'bin', 'imitator')
+
+# Extension of the result file
+RES_EXTENSION = '.res'
+
+# Tuned GC settings of IMITATOR (written by gc-sweep.py --install), used when OCAMLRUNPARAM is not set
+OCAMLRUNPARAM_PATH = os.path.join(os.path.expanduser('~'), '.config', 'imitator', 'ocamlrunparam')
+
+# Status of an execution
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_FAILED = 'failed'
+
+
+# ************************************************************
+# RUNNING IMITATOR
+# ************************************************************
+
+# Find the IMITATOR binary: the given one, else bin/imitator, else the one in the PATH
+def find_binary(binary=None):
+    if binary is not None:
+        return binary
+    if os.path.isfile(DEFAULT_BINARY):
+        return DEFAULT_BINARY
+    return shutil.which('imitator') or DEFAULT_BINARY
+
+
+# Options for IMITATOR given on the command line of a script (with nargs=argparse.REMAINDER, so that they may start with '-'); each argument may also hold several options (e.g., --options="-merge -comparison inclusion")
+def split_options(arguments):
+    return [option for argument in arguments for option in shlex.split(argument)]
+
+
+# Create a fresh directory for one execution
+def create_sandbox(prefix='imitator_'):
+    return tempfile.mkdtemp(prefix=prefix)
+
+
+# Environment of IMITATOR: the given one (else the current one), with the tuned OCAMLRUNPARAM if none is set
+def imitator_environment(env=None):
+    if 'OCAMLRUNPARAM' in (os.environ if env is None else env):
+        return env
+    try:
+        with open(OCAMLRUNPARAM_PATH) as f:
+            ocamlrunparam = f.read().strip()
+    except OSError:
+        return env
+    if not ocamlrunparam:
+        return env
+    env = dict(os.environ if env is None else env)
+    env['OCAMLRUNPARAM'] = ocamlrunparam
+    return env
+
+
+# Result of one execution of IMITATOR
+class Execution:
+    def __init__(self, status, wall_time, returncode, res_file, stdout, stderr):
+        self.status = status
+        self.wall_time = wall_time
+        self.returncode = returncode
+        self.res_file = res_file
+        self.stdout = stdout
+        self.stderr = stderr
+
+    # Content of the result file, or None if not found
+    def result(self):
+        if self.res_file is None or not os.path.isfile(self.res_file):
+            return None
+        return parse_res_file(self.res_file)
+
+
+# Run IMITATOR on a model and a property in the sandbox; the model and the property are given either as file names or as contents (model_text, property_text)
+#   memory_limit: limit of the address space of the process (in bytes)
+#   started: function called with the process once started (e.g., to kill it)
+# NOTE: the result file is <sandbox>/<name>.res
+def run_imitator(sandbox_dir, name, model_file=None, property_file=None, model_text=None, property_text=None, options=(), binary=None, timeout=None, env=None, memory_limit=None, started=None):
+    if model_text is not None:
+        model_file = os.path.join(sandbox_dir, name + '.imi')
+        with open(model_file, 'w') as f:
+            f.write(model_text)
+    if property_text is not None:
+        property_file = os.path.join(sandbox_dir, name + '.imiprop')
+        with open(property_file, 'w') as f:
+            f.write(property_text)
+
+    output_prefix = os.path.join(sandbox_dir, name)
+    cmd = [find_binary(binary), os.path.abspath(model_file)]
+    if property_file is not None:
+        cmd.append(os.path.abspath(property_file))
+    cmd += list(options) + ['-output-prefix', output_prefix]
+
+    env = imitator_environment(env)
+
+    start = time.time()
+    try:
+        process = subprocess.Popen(cmd, cwd=sandbox_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, env=env)
+    except OSError as e:
+        return Execution(STATUS_FAILED, time.time() - start, None, None, '', str(e))
+    # NOTE: the limit is set on the started process rather than with preexec_fn, which may deadlock when the caller has threads (e.g., imitator-server.py)
+    if memory_limit is not None:
+        try:
+            resource.prlimit(process.pid, resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except ProcessLookupError:
+            # The process has already ended
+            pass
+    if started is not None:
+        started(process)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, stderr = process.communicate()
+        return Execution(STATUS_TIMEOUT, time.time() - start, None, None, stdout, stderr)
+    wall_time = time.time() - start
+
+    status = STATUS_OK if process.returncode == 0 else STATUS_FAILED
+    return Execution(status, wall_time, process.returncode, output_prefix + RES_EXTENSION, stdout, stderr)
+
+
+# Load a Python script that cannot be imported by its name (e.g., json-parser-both.py); file_name is relative to directory (by default, the scripts directory)
+def load_script(file_name, module_name, directory=SCRIPTS_PATH):
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(directory, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ************************************************************
+# PARSING RESULT FILES
+# ************************************************************
+
+# Statistics of the result file: key in the result dictionary => (label in the file, conversion function)
+RES_FIELDS = {
+    'soundness': ('Constraint soundness', str),
+    'termination': ('Termination', str),
+    'nature': ('Constraint nature', str),
+    'states': ('Number of states', int),
+    'transitions': ('Number of transitions', int),
+    'computed_states': ('Number of computed states', int),
+    'total_time': ('Total computation time', lambda s: float(s.split()[0])),
+}
+
+RES_CONSTRAINT_PATTERN = re.compile(r'BEGIN CONSTRAINT\n(.*?)\nEND CONSTRAINT', re.DOTALL)
+
+
+# Parse the content of a result file into a dictionary with the keys of RES_FIELDS and 'constraint' (text of the constraint, or None)
+def parse_res(content):
+    result = {'constraint': None}
+    m = RES_CONSTRAINT_PATTERN.search(content)
+    if m:
+        result['constraint'] = m.group(1).strip()
+    for key, (label, convert) in RES_FIELDS.items():
+        m = re.search('^' + re.escape(label) + r'\s*:\s*(.+?)\s*$', content, re.MULTILINE)
+        result[key] = None
+        if m:
+            try:
+                result[key] = convert(m.group(1))
+            except ValueError:
+                pass
+    return result
+
+
+def parse_res_file(res_file):
+    with open(res_file) as f:
+        return parse_res(f.read())
+
+
+# ************************************************************
+# PARSING CONSTRAINTS
+# ************************************************************
+
+# A linear inequality is a triple (coefficients, constant, operator) meaning
+#   sum(coefficients[p] * p) + constant  operator  0
+# where coefficients maps parameter names to non-zero Fractions, and operator is one of '>', '>=', '='.
+# A constraint is a list of disjuncts, each disjunct being a list of linear inequalities (conjunction).
+# The true constraint is [[]] and the false constraint is [].
+
+OP_GT = '>'
+OP_GE = '>='
+OP_EQ = '='
+
+# Operators as printed by IMITATOR, and their normalization to OP_GT/OP_GE/OP_EQ (with a sign)
+OPERATORS = {
+    '>': (OP_GT, 1),
+    '>=': (OP_GE, 1),
+    '=': (OP_EQ, 1),
+    '<=': (OP_GE, -1),
+    '<': (OP_GT, -1),
+}
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+(?:/\d+)?(?:\.\d+)?)|([A-Za-z_][A-Za-z0-9_]*)|(>=|<=|[<>=*+\-()]))')
+
+
+class ConstraintParseError(Exception):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        m = TOKEN_PATTERN.match(text, position)
+        if not m:
+            raise ConstraintParseError('Unexpected character in "' + text + '" at position ' + str(position))
+        number, name, symbol = m.groups()
+        if number is not None:
+            tokens.append(('num', Fraction(number)))
+        elif name is not None:
+            tokens.append(('var', name))
+        else:
+            tokens.append(('sym', symbol))
+        position = m.end()
+    return tokens
+
+
+# Parse a linear term (a sum of products of numbers and at most one parameter) into (coefficients, constant)
+def parse_linear_term(tokens):
+    coefficients = {}
+    constant = Fraction(0)
+    sign = 1
+    expect_term = True
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == 'sym' and value in '+-' and expect_term:
+            if value == '-':
+                sign = -sign
+            i += 1
+            continue
+        if kind == 'sym' and value in '+-':
+            sign = -1 if value == '-' else 1
+            expect_term = True
+            i += 1
+            continue
+        if not expect_term:
+            raise ConstraintParseError('Unexpected token ' + str(value))
+        # Product of factors
+        factor = Fraction(sign)
+        variable = None
+        while True:
+            if i == len(tokens):
+                raise ConstraintParseError('Missing factor after *')
+            kind, value = tokens[i]
+            if kind == 'num':
+                factor *= value
+            elif kind == 'var':
+                if variable is not None:
+                    raise ConstraintParseError('Non-linear term with ' + variable + ' and ' + value)
+                variable = value
+            else:
+                raise ConstraintParseError('Unexpected token ' + str(value))
+            i += 1
+            if i < len(tokens) and tokens[i] == ('sym', '*'):
+                i += 1
+                continue
+            break
+        if variable is None:
+            constant += factor
+        else:
+            coefficients[variable] = coefficients.get(variable, Fraction(0)) + factor
+        sign = 1
+        expect_term = False
+    if expect_term:
+        raise ConstraintParseError('Missing term')
+    return coefficients, constant
+
+
+# Parse one inequality "lhs op rhs" (possibly with a chain "a op b op c")
+def parse_inequalities(text):
+    tokens = tokenize(text)
+    # Split on the comparison operators
+    sides = [[]]
+    operators = []
+    for token in tokens:
+        if token[0] == 'sym' and token[1] in OPERATORS:
+            operators.append(token[1])
+            sides.append([])
+        else:
+            sides[-1].append(token)
+    if not operators:
+        raise ConstraintParseError('No comparison operator in "' + text + '"')
+    terms = [parse_linear_term(side) for side in sides]
+    inequalities = []
+    for k, operator in enumerate(operators):
+        (lhs_coefficients, lhs_constant), (rhs_coefficients, rhs_constant) = terms[k], terms[k + 1]
+        normalized_operator, sign = OPERATORS[operator]
+        coefficients = {}
+        for name in set(lhs_coefficients) | set(rhs_coefficients):
+            coefficient = sign * (lhs_coefficients.get(name, 0) - rhs_coefficients.get(name, 0))
+            if coefficient != 0:
+                coefficients[name] = coefficient
+        inequalities.append((coefficients, sign * (lhs_constant - rhs_constant), normalized_operator))
+    return inequalities
+
+
+# Parse a constraint as printed by IMITATOR (disjuncts separated by "OR", inequalities separated by "&")
+# cache: optional dictionary text => parsed inequalities, shared between calls (e.g., for the tiles of a cartography, which share most of their inequalities)
+# NOTE: with a cache, the parsed inequalities are shared and must not be modified
+def parse_constraint(text, cache=None):
+    text = text.strip()
+    disjuncts = []
+    for disjunct_text in re.split(r'\s+OR\s+', text):
+        disjunct_text = disjunct_text.strip()
+        if disjunct_text == 'False':
+            continue
+        disjunct = []
+        for inequality_text in disjunct_text.split('&'):
+            inequality_text = inequality_text.strip()
+            if inequality_text in ('', 'True'):
+                continue
+            if cache is None:
+                disjunct.extend(parse_inequalities(inequality_text))
+            else:
+                if inequality_text not in cache:
+                    cache[inequality_text] = parse_inequalities(inequality_text)
+                disjunct.extend(cache[inequality_text])
+        disjuncts.append(disjunct)
+    return disjuncts
+
+
+# Parameters appearing in a constraint, in alphabetical order
+def constraint_parameters(constraint):
+    names = set()
+    for disjunct in constraint:
+        for coefficients, _, _ in disjunct:
+            names.update(coefficients)
+    return sorted(names)
+
+
+# Check whether a valuation (dictionary parameter => number) satisfies an inequality
+def satisfies_inequality(inequality, valuation):
+    coefficients, constant, operator = inequality
+    value = constant + sum(coefficient * valuation[name] for name, coefficient in coefficients.items())
+    if operator == OP_GT:
+        return value > 0
+    if operator == OP_GE:
+        return value >= 0
+    return value == 0
+
+
+# Check whether a valuation satisfies a constraint
+def satisfies(constraint, valuation):
+    return any(all(satisfies_inequality(inequality, valuation) for inequality in disjunct) for disjunct in constraint)
+
+
+# Interval (lower bound, upper bound) of a parameter in a disjunct when all other parameters are fixed by the valuation; None is an infinite bound; returns None if empty
+# NOTE: strictness is ignored, i.e., the closure of the interval is returned
+def parameter_interval(disjunct, parameter, valuation):
+    lower, upper = None, None
+    for coefficients, constant, operator in disjunct:
+        coefficient = coefficients.get(parameter, 0)
+        value = constant + sum(c * valuation[name] for name, c in coefficients.items() if name != parameter)
+        if coefficient == 0:
+            if (operator == OP_GT and value <= 0) or (operator == OP_GE and value < 0) or (operator == OP_EQ and value != 0):
+                return None
+            continue
+        bound = -value / coefficient
+        if operator == OP_EQ or coefficient > 0:
+            lower = bound if lower is None else max(lower, bound)
+        if operator == OP_EQ or coefficient < 0:
+            upper = bound if upper is None else min(upper, bound)
+    if lower is not None and upper is not None and lower > upper:
+        return None
+    return (lower, upper)
+
+
+# ************************************************************
+# PARSING STATE SPACES (.states FILES)
+# ************************************************************
+
+# Output of -states-description: a header, then one block per state, then the transitions
+#   /************************************************************/
+#   INITIAL
+#   STATE 0:
+#   pta1: l1, pta2: l2, i = 0 ==>
+# & x >= 0
+#
+#   Projection onto the parameters:
+#   p >= 0
+#
+#   /************************************************************/
+#   DESCRIPTION OF THE TRANSITIONS
+#   s_0 -> s_1 via "a"
+
+STATES_SEPARATOR = '/' + '*' * 60 + '/'
+STATE_PATTERN = re.compile(r'^\s*STATE (\d+):\s*$')
+TRANSITION_PATTERN = re.compile(r'^\s*s_(\d+) -> s_(\d+)(?: via "(.*)")?\s*$')
+
+
+# Split on the commas that are not inside brackets (e.g., in the values of arrays or lists)
+def split_top_level(text, separator=','):
+    items = []
+    depth = 0
+    current = ''
+    for character in text:
+        if character in '([{':
+            depth += 1
+        elif character in ')]}':
+            depth -= 1
+        if character == separator and depth == 0:
+            items.append(current.strip())
+            current = ''
+        else:
+            current += character
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+# Parse the line of a global location into (list of (automaton, location), list of (discrete variable, value))
+def parse_global_location(line):
+    line = line.strip()
+    if line.endswith('==>'):
+        line = line[:-3].rstrip()
+    locations = []
+    discretes = []
+    for item in split_top_level(line):
+        if ': ' in item and ' = ' not in item.split(': ', 1)[0]:
+            automaton, location = item.split(': ', 1)
+            locations.append((automaton, location))
+        elif ' = ' in item:
+            name, value = item.split(' = ', 1)
+            discretes.append((name, value))
+    return locations, discretes
+
+
+# A state of a .states file
+#   offset, length: position of its block in the file (in bytes)
+class StateDescription:
+    def __init__(self, state_id, offset, initial):
+        self.id = state_id
+        self.offset = offset
+        self.length = 0
+        self.initial = initial
+        self.locations = []
+        self.discretes = []
+        self.constraint = ''
+        self.projection = ''
+
+
+# Read a .states file (opened in binary mode) in one pass; yields the StateDescription of the states (with their constraints if with_constraints), then the transitions as triples (source, target, action or None)
+def iter_states_file(f, with_constraints=True):
+    offset = 0
+    block_offset = None
+    initial = False
+    state = None
+    section = None
+    in_transitions = False
+    for raw_line in f:
+        line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+        line_offset = offset
+        offset += len(raw_line)
+        stripped = line.strip()
+
+        if in_transitions:
+            m = TRANSITION_PATTERN.match(line)
+            if m:
+                yield (int(m.group(1)), int(m.group(2)), m.group(3))
+            continue
+
+        if stripped == STATES_SEPARATOR:
+            if state is not None:
+                state.length = line_offset - state.offset
+                yield state
+                state = None
+            block_offset = line_offset
+            initial = False
+            continue
+        if block_offset is None:
+            continue
+        if stripped == 'DESCRIPTION OF THE TRANSITIONS':
+            in_transitions = True
+            continue
+        if stripped == 'INITIAL':
+            initial = True
+            continue
+        m = STATE_PATTERN.match(line)
+        if m:
+            state = StateDescription(int(m.group(1)), block_offset, initial)
+            section = 'location'
+            continue
+        if state is None:
+            continue
+        if section == 'location':
+            state.locations, state.discretes = parse_global_location(line)
+            section = 'constraint'
+        elif stripped.startswith('Projection onto'):
+            section = 'projection' if stripped.startswith('Projection onto the parameters') else None
+        elif with_constraints and stripped and section == 'constraint':
+            # NOTE: the inequalities are separated by '&' at the beginning of the lines
+            inequality = stripped[1:].strip() if stripped.startswith('&') else stripped
+            if inequality:
+                state.constraint += ('\n& ' if state.constraint else '') + inequality
+        elif with_constraints and stripped and section == 'projection':
+            state.projection += ('\n' if state.projection else '') + stripped
+
+    if state is not None:
+        state.length = offset - state.offset
+        yield state
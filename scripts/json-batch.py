@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: batch conversion of a directory of JSON task sets to IMITATOR and MAST (json-parser-both.py), analysis of the IMITATOR models, and aggregated result table
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import imitator_utilities as iu
+
+# The JSON scheduling-model generator
+json_parser = iu.load_script('json-parser-both.py', 'json_parser_both')
+
+# Columns of the result table
+TABLE_COLUMNS = ['name', 'cpus', 'pipelines', 'tasks', 'parametric_tasks', 'max_utilization', 'conversion_time', 'model_size', 'status', 'wall_time', 'total_time', 'states', 'soundness', 'constraint', 'error']
+
+
+# ************************************************************
+# CONVERSION
+# ************************************************************
+
+# Convert one task set into its own directory <output_dir>/<name>/ (executed in a worker process); returns the row of the table
+def convert_task_set(input_file, output_dir, tid_list, prune, mast):
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    set_dir = os.path.join(output_dir, name)
+    row = {'name': name, 'status': 'not converted'}
+    start = time.time()
+    try:
+        with open(input_file) as f:
+            data = json.load(f)
+        cpu_list = json_parser.create_cpus(data['CPUS'])
+        pipeline_list = json_parser.create_pipelines(data['PIPELINES'])
+        tasks = [task for pipeline in pipeline_list for task in pipeline.task_list]
+        if not tid_list:
+            tid_list = json_parser.default_tid_list(pipeline_list)
+
+        os.makedirs(set_dir, exist_ok=True)
+        base_name = os.path.join(set_dir, name)
+        json_parser.write_chunks(base_name + '.imi', json_parser.imitator_model(cpu_list, pipeline_list, tid_list, prune))
+        json_parser.write_chunks(base_name + '.v0', json_parser.imitator_v0(pipeline_list, tid_list))
+        with open(base_name + '.imiprop', 'w') as f:
+            f.write(json_parser.SCHEDULABILITY_PROPERTY)
+        if mast:
+            json_parser.write_chunks(base_name + '.txt', json_parser.mast_model(cpu_list, pipeline_list))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        row['error'] = '%s: %s' % (type(e).__name__, e)
+        return row
+
+    row.update({
+        'cpus': len(cpu_list),
+        'pipelines': len(pipeline_list),
+        'tasks': len(tasks),
+        'parametric_tasks': ' '.join(str(tid) for tid in tid_list),
+        'max_utilization': round(max_utilization(cpu_list, pipeline_list), 4),
+        'conversion_time': round(time.time() - start, 3),
+        'model_size': os.path.getsize(base_name + '.imi'),
+        'status': 'converted',
+    })
+    return row
+
+
+# Largest utilization of a CPU at the nominal WCETs
+def max_utilization(cpu_list, pipeline_list):
+    utilization = {cpu.id: 0.0 for cpu in cpu_list}
+    for pipeline in pipeline_list:
+        for task in pipeline.task_list:
+            utilization[task.cpu] = utilization.get(task.cpu, 0.0) + float(task.wcet) / pipeline.period
+    return max(utilization.values()) if utilization else 0.0
+
+
+# ************************************************************
+# ANALYSIS
+# ************************************************************
+
+# Run IMITATOR on the converted model of a task set, in its directory; updates the row of the table
+def analyze_task_set(row, output_dir, binary, timeout):
+    set_dir = os.path.join(output_dir, row['name'])
+    base_name = os.path.join(set_dir, row['name'])
+    execution = iu.run_imitator(set_dir, row['name'], model_file=base_name + '.imi', property_file=base_name + '.imiprop', binary=binary, timeout=timeout)
+    row['status'] = execution.status
+    row['wall_time'] = round(execution.wall_time, 3)
+    if execution.status == iu.STATUS_FAILED:
+        row['error'] = (execution.stderr or '').strip().replace('\n', ' ')[-300:]
+    result = execution.result() if execution.status == iu.STATUS_OK else None
+    if result is not None:
+        row['total_time'] = result['total_time']
+        row['states'] = result['states']
+        row['soundness'] = result['soundness']
+        if result['constraint'] is not None:
+            row['constraint'] = ' '.join(result['constraint'].split())
+    print('%s: %s (%.1f s)' % (row['name'], execution.status, execution.wall_time), flush=True)
+    return row
+
+
+def write_table(table_file, rows):
+    with open(table_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS, delimiter=';', restval='')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Converts a directory of JSON task sets to IMITATOR and MAST, and analyzes them with IMITATOR')
+    parser.add_argument('inputdir', help='Directory of the JSON task sets')
+    parser.add_argument('--output-dir', default=None, help='Output directory, with one subdirectory per task set (default: <inputdir>-batch)')
+    parser.add_argument('--tasks', type=int, nargs=2, default=None, help='Ids of the two tasks with a parametric WCET (default: the first task of the first two pipelines)')
+    parser.add_argument('--prune', action='store_true', help='Only generate the reachable ready sets of the processors')
+    parser.add_argument('--no-mast', action='store_true', help='Do not produce the MAST models')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Number of conversion processes (default: number of CPUs)')
+    parser.add_argument('--analyses', type=int, default=1, help='Maximum number of concurrent IMITATOR runs (default: 1)')
+    parser.add_argument('--no-analysis', action='store_true', help='Only convert the task sets')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit for each IMITATOR run (in seconds)')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator, else from the PATH)')
+    parser.add_argument('--table', default=None, help='Result table (default: <output-dir>/results.csv)')
+    args = parser.parse_args()
+
+    input_files = sorted(os.path.join(args.inputdir, file_name) for file_name in os.listdir(args.inputdir) if file_name.endswith('.json'))
+    if not input_files:
+        print('No JSON file in ' + args.inputdir)
+        sys.exit(1)
+
+    output_dir = args.output_dir or os.path.normpath(args.inputdir) + '-batch'
+    os.makedirs(output_dir, exist_ok=True)
+    print('%d task set(s); %d conversion process(es), %d concurrent analysis(es)' % (len(input_files), args.jobs, args.analyses))
+
+    # The analyses start as soon as the conversions complete; the thread pool bounds the number of concurrent IMITATOR runs
+    with ProcessPoolExecutor(max_workers=args.jobs) as converters, ThreadPoolExecutor(max_workers=args.analyses) as analyzers:
+        conversions = [converters.submit(convert_task_set, input_file, output_dir, args.tasks, args.prune, not args.no_mast) for input_file in input_files]
+        rows = []
+        for conversion in conversions:
+            row = conversion.result()
+            if row['status'] == 'converted' and not args.no_analysis:
+                rows.append(analyzers.submit(analyze_task_set, row, output_dir, args.imitator, args.timeout))
+            else:
+                if row['status'] != 'converted':
+                    print('%s: %s' % (row['name'], row.get('error')), flush=True)
+                rows.append(row)
+        rows = [row if isinstance(row, dict) else row.result() for row in rows]
+
+    table_file = args.table or os.path.join(output_dir, 'results.csv')
+    write_table(table_file, rows)
+
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    print('')
+    print(', '.join('%d %s' % (count, status) for status, count in sorted(counts.items())))
+    print('Table written to ' + table_file)
+
+
+if __name__ == '__main__':
+    __main__()
@@ -1,40 +1,62 @@
 #!/usr/bin/python
 
+from __future__ import print_function
+
 import json
 import sys
 import argparse
 
-import time
 from datetime import date
 
 
 
 import itertools
 
-def string_to_int(s):
-	int_s = 0;
-	for i in range(0,len(s)) :
-		#print s[len(s)-1-i]
-		#print 2**i
-		#print int(s[i])
-		int_s = 2**i*int(s[len(s)-1-i]) + int_s
-	return int_s
-
-def norm_loc(loc,n) :
-	while len(loc) != n :
-		loc = '0' + loc
-	return loc
-
-getBin = lambda x: x >= 0 and str(bin(x))[2:] or "-" + str(bin(x))[3:]
-
-def kbits(n, k):
-    result = []
-    for bits in itertools.combinations(range(n), k):
-        s = ['0'] * n
-        for bit in bits:
-            s[bit] = '1'
-        result.append(''.join(s))
-    return result
+# Size (in bytes) of the output buffer of the generated files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# IMITATOR property synthesizing the parametric WCETs for which no deadline is missed
+SCHEDULABILITY_PROPERTY = "property := #synth AGnot(loc[observer] = ObserverNOK);\n"
+
+# A set of tasks on a CPU is encoded as an integer bitmask, in which the
+# i-th task of the CPU (in the order of the pipelines) is the bit
+# 2^(n-1-i); its location name is the bitmask written in binary on n digits
+def loc_name(mask, n) :
+    if n == 0 :
+        return ""
+    return format(mask, "0{0}b".format(n))
+
+# All bitmasks over n tasks, by increasing number of tasks, and in the
+# lexicographic order of the location names for a given number of tasks
+def all_masks(n) :
+    bits = [1 << (n - 1 - i) for i in range(n)]
+    for k in range(0, n + 1) :
+        for combination in itertools.combinations(bits, k) :
+            yield sum(combination)
+
+# The bitmasks over the tasks of task_on_cpu_list in which no two tasks
+# belong to the same pipeline, in the same order as all_masks
+# NOTE: the tasks of a pipeline are activated in sequence, so that at most
+# one of them is ready at a time; the other bitmasks are not reachable
+def reachable_masks(task_on_cpu_list, bits, pipeline_of) :
+    masks_of_pipeline = {}
+    for i, task in enumerate(task_on_cpu_list) :
+        masks_of_pipeline.setdefault(pipeline_of[id(task)].id, [0]).append(bits[i])
+    masks = [sum(choice) for choice in itertools.product(*masks_of_pipeline.values())]
+    masks.sort(key=lambda mask : (bin(mask).count("1"), -mask))
+    return masks
+
+# The task with the highest priority among the tasks of the bitmask (the
+# first one in case of equality), or None if no task has a priority
+# higher than min_prio
+def highest_priority_task(mask, task_on_cpu_list, bits, min_prio) :
+    task_running = None
+    max_prio = min_prio
+    for i, task in enumerate(task_on_cpu_list) :
+        if (mask & bits[i]) and task.prio > max_prio :
+            max_prio = task.prio
+            task_running = task
+    return task_running
     
  
 class CPU :
@@ -99,451 +121,321 @@ def get_scheduler(t, cpulist) :
             elif cpu.type == "nonpreemptive" : return "Non_Preemptible_FP_policy"
     return "none"
 
-def create_mast_file(cpu_list, pipeline_list) :
-    print "-- Real-Time System Model\n" 
-    print "Model ("
-    print "    Model_Name => MyModel,"
-    print "    Model_Date => " + date.today().strftime("%Y-%m-%d") + ");\n"
-    print "-- Resources\n"
+# The text of the MAST model, as a sequence of strings
+def mast_model(cpu_list, pipeline_list) :
+    yield "-- Real-Time System Model\n\n"
+    yield "Model (\n"
+    yield "    Model_Name => MyModel,\n"
+    yield "    Model_Date => " + date.today().strftime("%Y-%m-%d") + ");\n\n"
+    yield "-- Resources\n\n"
     for cpu in cpu_list :
-        print "Processing_Resource (" 
+        yield "Processing_Resource (\n"
         if cpu.type == "preemptive" :
-            print "    Type => Fixed_Priority_Processor,"
+            yield "    Type => Fixed_Priority_Processor,\n"
         elif cpu.type == "nonpreemptive" :
-            print "    Type => Fixed_Priority_Network,"
-        print "    Name => CPU_" + str(cpu.id) + ","
+            yield "    Type => Fixed_Priority_Network,\n"
+        yield "    Name => CPU_" + str(cpu.id) + ",\n"
         if cpu.type == "preemptive" :
-            print "    Max_Priority => 100,"
-            print "    Min_Priority => 1,"
-            print "    Max_Interrupt_Priority => 101,"
-            print "    Min_Interrupt_Priority  => 101,"
-            print "    Worst_Context_Switch => 0,"
-            print "    Avg_Context_Switch => 0,"
-            print "    Best_Context_Switch => 0,"
-            print "    System_Timer            =>"  
-            print "        (Type               => Ticker,"
-            print "         Worst_Overhead     => 0,"
-            print "         Period             => 1)"
+            yield "    Max_Priority => 100,\n"
+            yield "    Min_Priority => 1,\n"
+            yield "    Max_Interrupt_Priority => 101,\n"
+            yield "    Min_Interrupt_Priority  => 101,\n"
+            yield "    Worst_Context_Switch => 0,\n"
+            yield "    Avg_Context_Switch => 0,\n"
+            yield "    Best_Context_Switch => 0,\n"
+            yield "    System_Timer            =>\n"
+            yield "        (Type               => Ticker,\n"
+            yield "         Worst_Overhead     => 0,\n"
+            yield "         Period             => 1)\n"
         else :
-            print "    Packet_Worst_Overhead   => 0,"
-            print "    Packet_Avg_Overhead     => 0,"
-            print "    Packet_Best_Overhead    => 0,"
-            print "    Max_Packet_Transmission_Time => 100,"
-            print "    Min_Packet_Transmission_Time => 100"
+            yield "    Packet_Worst_Overhead   => 0,\n"
+            yield "    Packet_Avg_Overhead     => 0,\n"
+            yield "    Packet_Best_Overhead    => 0,\n"
+            yield "    Max_Packet_Transmission_Time => 100,\n"
+            yield "    Min_Packet_Transmission_Time => 100\n"
 
-        print ");\n"
+        yield ");\n\n"
 
     # Now, for each task one operation
     for p in pipeline_list :
         for t in p.task_list :
-            print "Operation ("
-            print "    Type     => Simple,"
-            print "    Name     => Proc_" + str(p.id) + "_" + str(t.id) + "," 
-            print "    Worst_Case_Execution_Time  => " + str(t.wcet) + ","
-            print "    Avg_Case_Execution_Time    => " + str(t.wcet) + ","
-            print "    Best_Case_Execution_Time   => " + str(t.wcet) + ");\n"
+            yield "Operation (\n"
+            yield "    Type     => Simple,\n"
+            yield "    Name     => Proc_" + str(p.id) + "_" + str(t.id) + ",\n"
+            yield "    Worst_Case_Execution_Time  => " + str(t.wcet) + ",\n"
+            yield "    Avg_Case_Execution_Time    => " + str(t.wcet) + ",\n"
+            yield "    Best_Case_Execution_Time   => " + str(t.wcet) + ");\n\n"
 
     # Now, one scheduling server per each task 
     for p in pipeline_list :
         for t in p.task_list :
-            print "Scheduling_Server ("
-            print "    Type => Fixed_Priority,"
-            print "    Name => T_" + str(p.id) + "_" + str(t.id) + ","
-            print "    Server_Sched_Parameters 	=> ("
-            print "        Type => " + get_scheduler(t, cpu_list) + ","
-            print "        The_Priority => " + str(t.prio) + ","
-            print "        Preassigned => Yes),"
-            print "    Server_Processing_Resource => CPU_" + str(t.cpu) + ");\n" 
+            yield "Scheduling_Server (\n"
+            yield "    Type => Fixed_Priority,\n"
+            yield "    Name => T_" + str(p.id) + "_" + str(t.id) + ",\n"
+            yield "    Server_Sched_Parameters 	=> (\n"
+            yield "        Type => " + get_scheduler(t, cpu_list) + ",\n"
+            yield "        The_Priority => " + str(t.prio) + ",\n"
+            yield "        Preassigned => Yes),\n"
+            yield "    Server_Processing_Resource => CPU_" + str(t.cpu) + ");\n\n"
 
 
-    print "-- Transactions" 
+    yield "-- Transactions\n"
     for p in pipeline_list :
-        print "Transaction ("
-        print "    Type => Regular,"
-        print "    Name => Trans_" + str(p.id) + ","
-        print "    External_Events => ("
-        print "        (Type    => Periodic,"
-        print "         Name   => EP" + str(p.id) + ","
-        print "         Period => " + str(p.period) + ","
-        print "         Max_Jitter => 0,"
-        print "         Phase => 0)),"
-        print "    Internal_Events => ("
+        yield "Transaction (\n"
+        yield "    Type => Regular,\n"
+        yield "    Name => Trans_" + str(p.id) + ",\n"
+        yield "    External_Events => (\n"
+        yield "        (Type    => Periodic,\n"
+        yield "         Name   => EP" + str(p.id) + ",\n"
+        yield "         Period => " + str(p.period) + ",\n"
+        yield "         Max_Jitter => 0,\n"
+        yield "         Phase => 0)),\n"
+        yield "    Internal_Events => (\n"
         for t in p.task_list :
-            print "        (Type  => Regular,"
+            yield "        (Type  => Regular,\n"
             if t.seq != (len(p.task_list) - 1) :
-                print "         Name  => e" + str(p.id) + str(t.seq) + "),"
+                yield "         Name  => e" + str(p.id) + str(t.seq) + "),\n"
             else :
-                print "         Name  => Exit" + str(p.id) + ","
-                print "         Timing_Requirements => ("
-                print "             Type => Hard_Global_Deadline,"
-                print "             Deadline => " + str(p.dline) + ","
-                print "             Referenced_Event => EP" + str(p.id) + " ))),"
-        print "    Event_Handlers => (" 
+                yield "         Name  => Exit" + str(p.id) + ",\n"
+                yield "         Timing_Requirements => (\n"
+                yield "             Type => Hard_Global_Deadline,\n"
+                yield "             Deadline => " + str(p.dline) + ",\n"
+                yield "             Referenced_Event => EP" + str(p.id) + " ))),\n"
+        yield "    Event_Handlers => (\n"
         for t in p.task_list :
-            print "          (Type => Activity,"
+            yield "          (Type => Activity,\n"
             if t.seq == 0 :
-                print "           Input_Event    => EP" + str(p.id)  + ","
+                yield "           Input_Event    => EP" + str(p.id)  + ",\n"
             else :
-                print "           Input_Event    => e" + str(p.id) + str((t.seq-1)) +  ","
+                yield "           Input_Event    => e" + str(p.id) + str((t.seq-1)) +  ",\n"
 
             if t.seq == (len(p.task_list) - 1) :
-                print "           Output_Event   => Exit" + str(p.id) + ","
+                yield "           Output_Event   => Exit" + str(p.id) + ",\n"
             else :
-                print "           Output_Event   => e" + str(p.id) + str(t.seq) +  ","
-            print "           Activity_Operation => Proc_" + str(p.id) + "_" + str(t.id) + ","
-            print "           Activity_Server => T_" + str(p.id) + "_" + str(t.id), 
+                yield "           Output_Event   => e" + str(p.id) + str(t.seq) +  ",\n"
+            yield "           Activity_Operation => Proc_" + str(p.id) + "_" + str(t.id) + ",\n"
+            yield "           Activity_Server => T_" + str(p.id) + "_" + str(t.id) + " "
             if t.seq == (len(p.task_list) - 1) :
-                print ")"
+                yield ")\n"
             else :
-                print "),"
-        print "    )"
-        print ");"
+                yield "),\n"
+        yield "    )\n"
+        yield ");\n"
+
+# Print the MAST model on the standard output
+def create_mast_file(cpu_list, pipeline_list) :
+    sys.stdout.writelines(mast_model(cpu_list, pipeline_list))
     return
 
-def create_imitator_file(cpu_list, pipeline_list,input_file_name, tid_list) :
-	print("EHI!!")
-	print(tid_list)
-
-
-	imitator_file_name = ""
-	v0_file_name = ""
-	flag = 0;
-	for letter in input_file_name :
-		if letter is '.':
-			flag = 1
-		if flag == 0 :
-			imitator_file_name = imitator_file_name + letter
-	v0_file_name = imitator_file_name + ".v0"
-	imitator_file_name = imitator_file_name + ".imi"
-	file = open(imitator_file_name,"w");
-	# Write down all the variables
-	file.write("var \n");
-	count = 0
-	for pipeline in pipeline_list :
-		file.write("\tt_asap_{0}:clock;\n".format(pipeline.id));
-		file.write("\tt_pipeline_{0}:clock;\n".format(pipeline.id));
-		file.write("\tT_pipeline_{0}={1}:parameter;\n".format(pipeline.id,pipeline.period));
-		file.write("\tD_pipeline_{0}={1}:parameter;\n".format(pipeline.id,pipeline.dline));
-		for task in pipeline.task_list :
-			file.write("\tt_task_{0}:clock;\n".format(task.id));
-			if task.id in tid_list :
-				file.write("\tC_task_{0}:parameter;\n".format(task.id));
-			else :
-				file.write("\tC_task_{0}={1}:parameter;\n".format(task.id,task.wcet));				
-			file.write("\tToken_{0}:discrete;\n".format(task.id));
-	file.write("\n\n");
-	#The observer
-	file.write("automaton observer\n".format(pipeline.id));
-	file.write("\tsynclabs:")
-	i=0;
-	for cpu in cpu_list :
-		if i==0:
-			file.write("DEADLINE_MISSED_{0}".format(cpu.id))
-			i=i+1;
-		else:
-			file.write(",DEADLINE_MISSED_{0}".format(cpu.id))
-	file.write(";\n\n")
-	file.write("\nloc ObserverOK: invariant True\n")
-	for cpu in cpu_list :
-		file.write("\t\twhen True sync DEADLINE_MISSED_{0} goto ObserverNOK;\n".format(cpu.id));
-	file.write("\nloc ObserverNOK: invariant True\n")
-	file.write("\nend\n\n")
-		
-	#Time to deal with the pipelines
-	for pipeline in pipeline_list :
-		# Write down the pipeline starters
-		#file.write("automaton pipeline_starter_{0}\n".format(pipeline.id));
-		#file.write("\t synclabs: start_pipeline_{0};\n\n".format(pipeline.id));
-		#file.write("\t loc starter: invariant t_starter_pipeline_{0} <= T_pipeline_{0}\n".format(pipeline.id));
-		#file.write("\t\t when t_starter_pipeline_{0} = T_pipeline_{0} sync start_pipeline_{0} do ".format(pipeline.id));
-		#file.write("{t_starter_pipeline_");
-		#file.write("{0}\ := 0".format(pipeline.id));
-		#file.write("} goto starter;\n");
-		#file.write("end\n\n");
-		#Write down the pipelines
-		file.write("automaton pipeline_{0}\n".format(pipeline.id));
-		file.write("\tsynclabs:pipeline_restart_{0}".format(pipeline.id));
-		i=0;
-		for task in pipeline.task_list :
-			#if i==0 :
-				#file.write("task_{0}_act,task_{0}_done".format(task.id))
-				#i = i+1
-			#else:
-			file.write(",task_{0}_act,task_{0}_done".format(task.id))
-
-		file.write(";\n\n");
-		#file.write("\tloc P{0}_1: invariant True\n".format(pipeline.id));
-		#file.write("\t\t when True sync start_pipeline_{0} do ".format(pipeline.id));
-		#file.write("{t_pipeline_");
-		#file.write("{0}\ := 0".format(pipeline.id));
-		#file.write("}");
-		#file.write("goto P{0}_2;\n".format(pipeline.id));
-		i=0
-		count = 0
-		for task in pipeline.task_list :
-			i = i +1;
-			count = count + 1;
-			for cpu in cpu_list:
-				if cpu.id == task.cpu:
-					if cpu.type == 'nonpreemptive':
-						flag = 0;
-					else:
-						flag = 1;
-			#if flag ==1:
-			file.write("\tloc P{0}_{1}: invariant t_asap_{0} <= 0\n".format(pipeline.id,i));
-			file.write("\t\t when t_asap_{1}=0 sync task_{0}_act goto P{1}_{2};\n".format(task.id,pipeline.id,i+1));
-			#else:
-				#file.write("\tloc P{0}_{1}: invariant t_pipeline_{0} <= D_pipeline_{0}\n".format(pipeline.id,i));
-				#file.write("\t\t when True sync task_{0}_act goto P{1}_{2};\n".format(task.id,pipeline.id,i+1));
-			
-			i=i+1;
-			file.write("\tloc P{0}_{1}: invariant t_pipeline_{0} <= D_pipeline_{0}\n".format(pipeline.id,i));
-			#if count == len(pipeline.task_list) :
-			#file.write("\t\t when True sync task_{0}_done do {t_asap_{1} := 0} goto P{1}_1;\n".format(task.id,pipeline.id));
-			#else: 
-			file.write("\t\t when t_pipeline_{1} <= D_pipeline_{1} sync task_{0}_done do".format(task.id,pipeline.id));
-			file.write(" {");
-			file.write("t_asap_{0}\ := 0".format(pipeline.id));
-			file.write("} ");
-			file.write("goto P{0}_{1};\n".format(pipeline.id,i+1));
-			#file.write("\t\t when t_pipeline_{0} = D_pipeline_{0} + 1 sync DEADLINE_MISS_{0} goto DEADLINE_MISSED;\n".format(pipeline.id));
-			
-		file.write("\tloc P{0}_{1}: invariant t_pipeline_{0} <= T_pipeline_{0}\n".format(pipeline.id,i+1));
-		file.write("\t\t when t_pipeline_{0} = T_pipeline_{0} do".format(pipeline.id));
-		file.write(" {");
-		file.write("t_pipeline_{0}\ := 0,t_asap_{0}\ := 0".format(pipeline.id));
-		file.write("} ");
-		file.write("sync pipeline_restart_{1} goto P{1}_{2};\n".format(task.id,pipeline.id,1));
-		#file.write("\tloc DEADLINE_MISSED: invariant True\n");
-		file.write("end\n\n");
-
-	#We need CPUs in here
-	for cpu in cpu_list :
-		if cpu.type == "preemptive" :
-			file.write("automaton proc_{0}\n".format(cpu.id))
-			file.write("\t synclabs: DEADLINE_MISSED_{0}, ".format(cpu.id))
-			task_on_cpu_list = []
-			for pipeline in pipeline_list :
-				for task in pipeline.task_list :
-					if task.cpu == cpu.id :
-						task_on_cpu_list.append(task)
-			i=0
-			for task in task_on_cpu_list:
-				if i==0 :
-					file.write("task_{0}_act,task_{0}_done".format(task.id))
-					i = i+1
-				else:
-					file.write(",task_{0}_act,task_{0}_done".format(task.id))
-			file.write(";\n\n")
-			file.write("\tloc DEADLINE_MISS: invariant True\n");
-
-			n=len(task_on_cpu_list)
-			for i in range(0,n+1) :
-				list_loc = kbits(n,i)
-				for loc in list_loc :
-					file.write("\tloc proc_{0}_{1}: invariant ".format(task.cpu,loc))
-					task_running = -1;
-					max_prio = -1;
-					for i in range(0,n) :
-						if ((loc[i] is "1")&(task_on_cpu_list[i].prio > max_prio)) :
-							max_prio = task_on_cpu_list[i].prio
-							task_running = task_on_cpu_list[i].id
-					if task_running == -1 :
-						file.write("True ")
-					else :
-						file.write("t_task_{0} <= C_task_{0} ".format(task_running))
-					file.write("stop {")
-					compt = 0
-					for task in task_on_cpu_list :
-						if ((compt == 0)&(task.id != task_running)) :
-							file.write("t_task_{0}".format(task.id))
-							compt = compt + 1
-						elif task.id != task_running: 
-							file.write(",t_task_{0}".format(task.id))
-					file.write("}\n")
-					if task_running == -1 :
-						compt = 0;
-						#for pipeline in pipeline_list:
-							#file.write("\t\twhen t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED goto DEADLINE_MISS;\n".format(task.id,pipeline.id));
-						for task in task_on_cpu_list :
-							compt = compt +1;
-							file.write("\t\twhen True sync task_{0}_act do ".format(task.id))
-							file.write("{")
-							file.write("t_task_{0}\ := 0".format(task.id))
-							file.write("} goto ")
-							file.write("proc_{0}_{1};\n".format(task.cpu,norm_loc(str(getBin(string_to_int(loc)+2**(n-compt))),n)))
-					else :
-						compt = 0;
-						#for pipeline in pipeline_list:
-						for i in range(0,n) :
-							if ((loc[i] is "1")):
-								for pipeline in pipeline_list:
-									if task_on_cpu_list[i] in pipeline.task_list:
-										file.write("\t\twhen t_task_{0} < C_task_{0} & t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED_{2} goto DEADLINE_MISS;\n".format(task_on_cpu_list[i].id,pipeline.id,cpu.id));
-						for task in task_on_cpu_list :
-							compt = compt +1;
-							if loc[compt-1] is "0" :
-								file.write("\t\twhen t_task_{1} < C_task_{1} sync task_{0}_act do ".format(task.id,task_running))
-								file.write("{")
-								file.write("t_task_{0}\ := 0".format(task.id))
-								file.write("} goto ")
-								file.write("proc_{0}_{1};\n".format(task.cpu,norm_loc(str(getBin(string_to_int(loc)+2**(n-compt))),n)))
-							else :
-								file.write("\t\twhen t_task_{0} = C_task_{0} sync task_{0}_done goto ".format(task.id))
-								file.write("proc_{0}_{1};\n".format(task.cpu,norm_loc(str(getBin(string_to_int(loc)-2**(n-compt))),n)))
-			file.write("end\n\n")
-		else:
-			file.write("automaton proc_{0}\n".format(cpu.id))
-			file.write("\t synclabs: DEADLINE_MISSED_{0},".format(cpu.id))
-			task_on_cpu_list = []
-			for pipeline in pipeline_list :
-				for task in pipeline.task_list :
-					if task.cpu == cpu.id :
-						task_on_cpu_list.append(task)
-			i=0
-			for task in task_on_cpu_list:
-				if i==0 :
-					file.write("task_{0}_act,task_{0}_done".format(task.id))
-					i = i+1
-				else:
-					file.write(",task_{0}_act,task_{0}_done".format(task.id))
-			file.write(";\n\n")
-			file.write("\t loc idle: invariant True stop");
-			file.write("{");
-			compt = 0
-			for task in task_on_cpu_list :
-				if ((compt == 0)&(task.id != task_running)) :
-					file.write("t_task_{0}".format(task.id))
-					compt = compt + 1
-				elif task.id != task_running: 
-					file.write(",t_task_{0}".format(task.id))
-			file.write("}\n")
-			#for pipeline in pipeline_list:
-				#file.write("\t\twhen t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED_{1} goto DEADLINE_MISS;\n".format(task.id,pipeline.id));
-			for task in task_on_cpu_list :
-				file.write("\t\twhen True sync task_{0}_act do".format(task.id));
-				file.write("{Token_");
-				file.write("{0}\ := 1".format(task.id));
-				file.write("}");
-				file.write("goto t_{0}_running;\n".format(task.id));
-			file.write("\n");
-			file.write("\tloc DEADLINE_MISS: invariant True\n");
-			for task in task_on_cpu_list :
-				file.write("\tloc t_{0}_running: invariant t_task_{0} <= C_task_{0} ".format(task.id));
-				task_running = task.id;
-				file.write("stop {")
-				compt = 0
-				for task2 in task_on_cpu_list :
-					if ((compt == 0)&(task2.id != task_running)) :
-						file.write("t_task_{0}".format(task2.id))
-						compt = compt + 1
-					elif task2.id != task_running: 
-						file.write(",t_task_{0}".format(task2.id))
-				file.write("}\n")
-				for pipeline in pipeline_list:
-					if (task in pipeline.task_list) :
-						file.write("\t\twhen t_task_{0} < C_task_{0} & t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED_{2} goto DEADLINE_MISS;\n".format(task.id,pipeline.id,cpu.id));
-				for task2 in task_on_cpu_list :
-					file.write("\t\t when t_task_{0} <= 0 sync task_{1}_act do".format(task.id,task2.id));
-					file.write("{Token_");
-					file.write("{0}\ := 1".format(task2.id));
-					file.write("}");
-					if (task.prio > task2.prio):
-						file.write("goto t_{0}_running;\n".format(task.id));
-					else:
-						file.write("goto t_{0}_running;\n".format(task2.id));
-					file.write("\t\t when t_task_{0} > 0 sync task_{1}_act do".format(task.id,task2.id));
-					file.write("{Token_");
-					file.write("{0}\ := 1".format(task2.id));
-					file.write("}");
-					file.write("goto t_{0}_running;\n".format(task.id));
-				n = len(task_on_cpu_list)-1;
-				for i in range(0,n+1) :
-					list_loc = kbits(n,i)
-					for loc in list_loc :
-						file.write("\t\twhen t_task_{0} = C_task_{0}".format(task.id));
-						j=0;
-						for task2 in task_on_cpu_list:
-							if (task2.id != task.id):
-								file.write(" & Token_{0}={1} ".format(task2.id,loc[j]));
-								j = j + 1;
-						max_prio = 0;
-						task_running = -1;
-						k=0;
-						
-						for task2 in task_on_cpu_list:
-							if (task2.id != task.id):
-								if (task2.prio > max_prio)&(loc[k] == "1"):
-									max_prio = task2.prio
-									task_running = task2.id
-								k = k + 1;
-							
-						file.write("sync task_{0}_done do".format(task.id));
-						file.write("{");
-						
-						if (task_running != -1):
-							file.write("t_task_{0}\ := 0,".format(task_running));
-						file.write("Token_{0} := 0".format(task.id));
-						file.write("}");
-						if (task_running != -1):
-							file.write(" goto t_{0}_running;\n".format(task_running));
-						else: 
-							file.write(" goto idle;\n".format(task_running));
-			file.write("end\n\n");
-					
-	# Write down the init region
-	#file.write("var init:region;\n")
-	file.write("init := loc[observer] = ObserverOK &\n")
-	#The locations
-	for cpu in cpu_list :
-		task_on_cpu_list = []
-		for pipeline in pipeline_list :
-			for task in pipeline.task_list :
-				if task.cpu == cpu.id :
-					task_on_cpu_list.append(task)
-		n=len(task_on_cpu_list)
-		if cpu.type == "preemptive":
-			file.write("\tloc[proc_{0}]= proc_{0}_{1} &\n".format(cpu.id,norm_loc("0",n)));
-		else:
-			file.write("\tloc[proc_{0}]= idle &\n".format(cpu.id));
-	for pipeline in pipeline_list :
-		#file.write("\tloc[pipeline_starter_{0}]=starter &\n".format(pipeline.id));
-		file.write("\tloc[pipeline_{0}]=P{0}_1 &\n".format(pipeline.id));
-	#The clocks
-	for pipeline in pipeline_list :
-		file.write("\tt_asap_{0} = 0 &\n".format(pipeline.id))
-		file.write("\tt_pipeline_{0} = 0 &\n".format(pipeline.id))
-		for task in pipeline.task_list :
-			file.write("\tt_task_{0} = 0 & \n".format(task.id));
-	#The parameters
-	for pipeline in pipeline_list :
-		#file.write("\tT_pipeline_{0} = {1} &\n".format(pipeline.id,pipeline.period))
-		#file.write("\tD_pipeline_{0} = {1} &\n".format(pipeline.id,pipeline.dline))
-		for task in pipeline.task_list :
-			#file.write("\tC_task_{0} = {1} & \n".format(task.id,task.wcet));
-			file.write("\tToken_{0} = 0 & \n".format(task.id));
-	file.write("\tTrue;")
-	#file.write("\nbad := exists_location loc[observer] = ObserverNOK;\n");
-
-	v0_file = open(v0_file_name,"w");
-	#The parameters
-	compt_p = 0;
-	length_p = len(pipeline_list)
-	counter = 0
-	for pipeline in pipeline_list :
-		compt_p = compt_p +1
-		#v0_file.write("\tT_pipeline_{0} = {1} &\n".format(pipeline.id,pipeline.period))
-		#v0_file.write("\tD_pipeline_{0} = {1} &\n".format(pipeline.id,pipeline.dline))
-		compt_t = 0
-		length_t = len(pipeline.task_list)
-		for task in pipeline.task_list :
-			compt_t = compt_t + 1
-			if task.id in tid_list : 
-				counter = counter + 1
-				if (counter == 2) :
-					v0_file.write("\tC_task_{0} = 1..{1}".format(task.id,task.wcet));
-				else :
-					v0_file.write("\tC_task_{0} = 1..{1} & \n".format(task.id,task.wcet));
+def get_tasks_on_cpu(cpu, pipeline_list) :
+    task_on_cpu_list = []
+    for pipeline in pipeline_list :
+        for task in pipeline.task_list :
+            if task.cpu == cpu.id :
+                task_on_cpu_list.append(task)
+    return task_on_cpu_list
+
+def get_synclabs(task_on_cpu_list) :
+    return ",".join("task_{0}_act,task_{0}_done".format(task.id) for task in task_on_cpu_list)
+
+def get_stopped_clocks(task_on_cpu_list, task_running) :
+    return ",".join("t_task_{0}".format(task.id) for task in task_on_cpu_list if task is not task_running)
+
+# The text of the IMITATOR model, as a sequence of strings
+# If prune is set, only the ready sets reachable given the pipelines are generated
+def imitator_model(cpu_list, pipeline_list, tid_list, prune=False) :
+    # Pipeline of each task
+    pipeline_of = {}
+    for pipeline in pipeline_list :
+        for task in pipeline.task_list :
+            pipeline_of[id(task)] = pipeline
+
+    # Write down all the variables
+    yield "var \n"
+    for pipeline in pipeline_list :
+        yield "\tt_asap_{0}:clock;\n".format(pipeline.id)
+        yield "\tt_pipeline_{0}:clock;\n".format(pipeline.id)
+        yield "\tT_pipeline_{0}={1}:parameter;\n".format(pipeline.id,pipeline.period)
+        yield "\tD_pipeline_{0}={1}:parameter;\n".format(pipeline.id,pipeline.dline)
+        for task in pipeline.task_list :
+            yield "\tt_task_{0}:clock;\n".format(task.id)
+            if task.id in tid_list :
+                yield "\tC_task_{0}:parameter;\n".format(task.id)
+            else :
+                yield "\tC_task_{0}={1}:parameter;\n".format(task.id,task.wcet)
+            yield "\tToken_{0}:discrete;\n".format(task.id)
+    yield "\n\n"
+
+    #The observer
+    yield "automaton observer\n"
+    yield "\tsynclabs:" + ",".join("DEADLINE_MISSED_{0}".format(cpu.id) for cpu in cpu_list) + ";\n\n"
+    yield "\nloc ObserverOK: invariant True\n"
+    for cpu in cpu_list :
+        yield "\t\twhen True sync DEADLINE_MISSED_{0} goto ObserverNOK;\n".format(cpu.id)
+    yield "\nloc ObserverNOK: invariant True\n"
+    yield "\nend\n\n"
+
+    #Time to deal with the pipelines
+    for pipeline in pipeline_list :
+        yield "automaton pipeline_{0}\n".format(pipeline.id)
+        yield "\tsynclabs:pipeline_restart_{0}".format(pipeline.id) + "".join(",task_{0}_act,task_{0}_done".format(task.id) for task in pipeline.task_list) + ";\n\n"
+        i = 0
+        for task in pipeline.task_list :
+            i = i + 1
+            yield "\tloc P{0}_{1}: invariant t_asap_{0} <= 0\n".format(pipeline.id,i)
+            yield "\t\t when t_asap_{1}=0 sync task_{0}_act goto P{1}_{2};\n".format(task.id,pipeline.id,i+1)
+            i = i + 1
+            yield "\tloc P{0}_{1}: invariant t_pipeline_{0} <= D_pipeline_{0}\n".format(pipeline.id,i)
+            yield "\t\t when t_pipeline_{1} <= D_pipeline_{1} sync task_{0}_done do {{t_asap_{1}\\ := 0}} goto P{1}_{2};\n".format(task.id,pipeline.id,i+1)
+        yield "\tloc P{0}_{1}: invariant t_pipeline_{0} <= T_pipeline_{0}\n".format(pipeline.id,i+1)
+        yield "\t\t when t_pipeline_{0} = T_pipeline_{0} do {{t_pipeline_{0}\\ := 0,t_asap_{0}\\ := 0}} sync pipeline_restart_{0} goto P{0}_1;\n".format(pipeline.id)
+        yield "end\n\n"
+
+    #We need CPUs in here
+    for cpu in cpu_list :
+        task_on_cpu_list = get_tasks_on_cpu(cpu, pipeline_list)
+        n = len(task_on_cpu_list)
+        bits = [1 << (n - 1 - i) for i in range(n)]
+        if cpu.type == "preemptive" :
+            yield "automaton proc_{0}\n".format(cpu.id)
+            yield "\t synclabs: DEADLINE_MISSED_{0}, ".format(cpu.id) + get_synclabs(task_on_cpu_list) + ";\n\n"
+            yield "\tloc DEADLINE_MISS: invariant True\n"
+
+            # Strings that do not depend on the location
+            act_idle = ["\t\twhen True sync task_{0}_act do {{t_task_{0}\\ := 0}} goto proc_{1}_".format(task.id,cpu.id) for task in task_on_cpu_list]
+            deadline_missed = ["\t\twhen t_task_{0} < C_task_{0} & t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED_{2} goto DEADLINE_MISS;\n".format(task.id,pipeline_of[id(task)].id,cpu.id) for task in task_on_cpu_list]
+            done = ["\t\twhen t_task_{0} = C_task_{0} sync task_{0}_done goto proc_{1}_".format(task.id,cpu.id) for task in task_on_cpu_list]
+            # Tasks that cannot be activated in a ready set: those of the pipelines of the tasks of the ready set
+            same_pipeline = [sum(bits[j] for j, task2 in enumerate(task_on_cpu_list) if prune and pipeline_of[id(task2)] is pipeline_of[id(task)]) for task in task_on_cpu_list]
+
+            if prune :
+                masks = reachable_masks(task_on_cpu_list, bits, pipeline_of)
+            else :
+                masks = all_masks(n)
+            for mask in masks :
+                lines = []
+                task_running = highest_priority_task(mask, task_on_cpu_list, bits, -1)
+                lines.append("\tloc proc_{0}_{1}: invariant ".format(cpu.id,loc_name(mask, n)))
+                if task_running is None :
+                    lines.append("True ")
+                else :
+                    lines.append("t_task_{0} <= C_task_{0} ".format(task_running.id))
+                lines.append("stop {" + get_stopped_clocks(task_on_cpu_list, task_running) + "}\n")
+                if task_running is None :
+                    for i in range(n) :
+                        if not (mask & same_pipeline[i]) :
+                            lines.append(act_idle[i] + loc_name(mask + bits[i], n) + ";\n")
+                else :
+                    for i in range(n) :
+                        if mask & bits[i] :
+                            lines.append(deadline_missed[i])
+                    act_running = "\t\twhen t_task_{0} < C_task_{0} sync task_".format(task_running.id)
+                    for i, task in enumerate(task_on_cpu_list) :
+                        if mask & bits[i] :
+                            lines.append(done[i] + loc_name(mask - bits[i], n) + ";\n")
+                        elif not (mask & same_pipeline[i]) :
+                            lines.append(act_running + "{0}_act do {{t_task_{0}\\ := 0}} goto proc_{1}_{2};\n".format(task.id,cpu.id,loc_name(mask + bits[i], n)))
+                yield "".join(lines)
+            yield "end\n\n"
+        else:
+            yield "automaton proc_{0}\n".format(cpu.id)
+            yield "\t synclabs: DEADLINE_MISSED_{0},".format(cpu.id) + get_synclabs(task_on_cpu_list) + ";\n\n"
+            yield "\t loc idle: invariant True stop{" + get_stopped_clocks(task_on_cpu_list, None) + "}\n"
+            for task in task_on_cpu_list :
+                yield "\t\twhen True sync task_{0}_act do{{Token_{0}\\ := 1}}goto t_{0}_running;\n".format(task.id)
+            yield "\n"
+            yield "\tloc DEADLINE_MISS: invariant True\n"
+            for task in task_on_cpu_list :
+                yield "\tloc t_{0}_running: invariant t_task_{0} <= C_task_{0} stop {{".format(task.id) + get_stopped_clocks(task_on_cpu_list, task) + "}\n"
+                yield "\t\twhen t_task_{0} < C_task_{0} & t_pipeline_{1} = D_pipeline_{1} sync DEADLINE_MISSED_{2} goto DEADLINE_MISS;\n".format(task.id,pipeline_of[id(task)].id,cpu.id)
+                for task2 in task_on_cpu_list :
+                    # NOTE: no task of the pipeline of the running task can be activated
+                    if prune and pipeline_of[id(task2)] is pipeline_of[id(task)] :
+                        continue
+                    if (task.prio > task2.prio):
+                        winner = task
+                    else:
+                        winner = task2
+                    yield "\t\t when t_task_{0} <= 0 sync task_{1}_act do{{Token_{1}\\ := 1}}goto t_{2}_running;\n".format(task.id,task2.id,winner.id)
+                    yield "\t\t when t_task_{0} > 0 sync task_{1}_act do{{Token_{1}\\ := 1}}goto t_{0}_running;\n".format(task.id,task2.id)
+                # One transition for each valuation of the tokens of the other tasks
+                other_tasks = [task2 for task2 in task_on_cpu_list if task2 is not task]
+                m = len(other_tasks)
+                other_bits = [1 << (m - 1 - j) for j in range(m)]
+                token_guards = [(" & Token_{0}=0 ".format(task2.id), " & Token_{0}=1 ".format(task2.id)) for task2 in other_tasks]
+                guard = "\t\twhen t_task_{0} = C_task_{0}".format(task.id)
+                if prune :
+                    # NOTE: the tasks of the pipeline of the running task have no token
+                    masks = [mask for mask in reachable_masks(other_tasks, other_bits, pipeline_of) if not any(mask & other_bits[j] and pipeline_of[id(task2)] is pipeline_of[id(task)] for j, task2 in enumerate(other_tasks))]
+                else :
+                    masks = all_masks(m)
+                for mask in masks :
+                    lines = [guard]
+                    for j in range(m) :
+                        lines.append(token_guards[j][1 if mask & other_bits[j] else 0])
+                    lines.append("sync task_{0}_done do{{".format(task.id))
+                    task_running = highest_priority_task(mask, other_tasks, other_bits, 0)
+                    if task_running is not None :
+                        lines.append("t_task_{0}\\ := 0,Token_{1} := 0}} goto t_{0}_running;\n".format(task_running.id,task.id))
+                    else :
+                        lines.append("Token_{0} := 0}} goto idle;\n".format(task.id))
+                    yield "".join(lines)
+            yield "end\n\n"
+
+    # Write down the init region
+    yield "init := loc[observer] = ObserverOK &\n"
+    #The locations
+    for cpu in cpu_list :
+        if cpu.type == "preemptive":
+            yield "\tloc[proc_{0}]= proc_{0}_{1} &\n".format(cpu.id,loc_name(0, len(get_tasks_on_cpu(cpu, pipeline_list))))
+        else:
+            yield "\tloc[proc_{0}]= idle &\n".format(cpu.id)
+    for pipeline in pipeline_list :
+        yield "\tloc[pipeline_{0}]=P{0}_1 &\n".format(pipeline.id)
+    #The clocks
+    for pipeline in pipeline_list :
+        yield "\tt_asap_{0} = 0 &\n".format(pipeline.id)
+        yield "\tt_pipeline_{0} = 0 &\n".format(pipeline.id)
+        for task in pipeline.task_list :
+            yield "\tt_task_{0} = 0 & \n".format(task.id)
+    #The discrete variables
+    for pipeline in pipeline_list :
+        for task in pipeline.task_list :
+            yield "\tToken_{0} = 0 & \n".format(task.id)
+    yield "\tTrue;"
+
+# The text of the V0 (the domain of the parametric WCETs), as a sequence of strings
+def imitator_v0(pipeline_list, tid_list) :
+    counter = 0
+    for pipeline in pipeline_list :
+        for task in pipeline.task_list :
+            if task.id in tid_list :
+                counter = counter + 1
+                if (counter == 2) :
+                    yield "\tC_task_{0} = 1..{1}".format(task.id,task.wcet)
+                else :
+                    yield "\tC_task_{0} = 1..{1} & \n".format(task.id,task.wcet)
+
+# Default parametric tasks: the first task of the first two pipelines (or the first two tasks)
+def default_tid_list(pipeline_list) :
+    firsts = [pipeline.task_list[0].id for pipeline in pipeline_list if pipeline.task_list]
+    if len(firsts) >= 2 :
+        return firsts[:2]
+    return [task.id for pipeline in pipeline_list for task in pipeline.task_list][:2]
+
+# The names of the IMITATOR model and of the V0 for an input file name
+def get_imitator_file_names(input_file_name) :
+    prefix = input_file_name.split(".")[0]
+    return (prefix + ".imi", prefix + ".v0")
+
+def write_chunks(file_name, chunks) :
+    with open(file_name, "w", OUTPUT_BUFFER_SIZE) as file :
+        file.writelines(chunks)
+
+def create_imitator_file(cpu_list, pipeline_list,input_file_name, tid_list, prune=False) :
+	imitator_file_name, v0_file_name = get_imitator_file_names(input_file_name)
+	write_chunks(imitator_file_name, imitator_model(cpu_list, pipeline_list, tid_list, prune))
+	write_chunks(v0_file_name, imitator_v0(pipeline_list, tid_list))
 	return
 
 
@@ -556,6 +448,7 @@ def main() :
     parser.add_argument("--mast",  help="Produce mast output (default)", action="store_true")
     parser.add_argument("--imitator",  help="Produce imitator output", action="store_true")
     parser.add_argument("--rtscan",  help="Produce rtscan output", action="store_true")
+    parser.add_argument("--prune",  help="Only generate the ready sets of the processors that are reachable given the pipelines (imitator output)", action="store_true")
     
     args = parser.parse_args()
     
@@ -563,7 +456,7 @@ def main() :
     json_data = file.read() 
     data = json.loads(json_data)
 
-    for k,v in data.iteritems() :
+    for k,v in data.items() :
         if k == "CPUS" :
             cpu_list = create_cpus(v)
 
@@ -579,7 +472,7 @@ def main() :
     if args.mast:
         create_mast_file(cpu_list, pipeline_list)
     elif args.imitator:
-        create_imitator_file(cpu_list, pipeline_list,args.inputfile, [int(args.var1), int(args.var2)])
+        create_imitator_file(cpu_list, pipeline_list,args.inputfile, [int(args.var1), int(args.var2)], args.prune)
     elif args.rtscan:
         create_rtscan_file(cpu_list, pipeline_list)
 
@@ -0,0 +1,464 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: offline auto-tuner of the performance options of IMITATOR (merging, comparison, exploration order, extrapolation, pruning, lookahead): successive halving over a sample of configurations on the benchmarks of each model family, with early cut-off of the bad configurations and check that the synthesized constraints remain equivalent to those of the default configuration; outputs a recommended configuration for each family
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import shlex
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import imitator_utilities as iu
+
+constraint_diff = iu.load_script('constraint-diff.py', 'constraint_diff')
+imitator_race = iu.load_script('imitator-race.py', 'imitator_race')
+imitator_server = iu.load_script('imitator-server.py', 'imitator_server')
+
+
+# ************************************************************
+# OPTION SPACE
+# ************************************************************
+
+# Tuned options: option => possible values (None: option not given; True: flag given)
+MERGE_ON = ['yes', 'onthefly', 'reconstruct']
+OPTION_SPACE = [
+    ('-merge', [None, 'none'] + MERGE_ON),
+    ('-merge-candidates', [None, 'queue', 'visited', 'ordered']),
+    ('-merge-update', [None, 'merge', 'candidates']),
+    ('-comparison', [None, 'none', 'equality', 'inclusion', 'including', 'doubleinclusion']),
+    ('-expl-order', [None, 'queueBFS', 'queueBFSRS', 'queueBFSPRIOR']),
+    ('-extrapolation', [None, 'M', 'Mglobal', 'LU', 'LUglobal']),
+    ('-no-cumulative-pruning', [None, True]),
+    ('-no-lookahead', [None, True]),
+]
+
+# Options only meaningful with another option: option => (option, values)
+OPTION_DEPENDENCIES = {
+    '-merge-candidates': ('-merge', MERGE_ON),
+    '-merge-update': ('-merge', MERGE_ON),
+}
+
+# Options only meaningful for some properties (the lookahead is specific to NDFS)
+OPTION_PROPERTIES = {
+    '-no-lookahead': imitator_race.CYCLE_PROPERTIES,
+}
+
+DEFAULT_CONFIGURATION = ()
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'imitator-tuner.json')
+
+# Penalty factor of a timeout in the score (PAR-2)
+TIMEOUT_PENALTY = 2
+
+# Number of samples when comparing two constraints
+EQUIVALENCE_SAMPLES = 20000
+
+
+# All the configurations of the option space (tuples of (option, value) with a given value)
+def all_configurations():
+    names = [option for option, _ in OPTION_SPACE]
+    for values in itertools.product(*[values for _, values in OPTION_SPACE]):
+        chosen = dict(zip(names, values))
+        if any(chosen[option] is not None and chosen[required] not in required_values for option, (required, required_values) in OPTION_DEPENDENCIES.items()):
+            continue
+        yield tuple((option, value) for option, value in zip(names, values) if value is not None)
+
+
+# The default configuration followed by a random sample of the other configurations
+def sample_configurations(nb_configurations, rng):
+    configurations = [configuration for configuration in all_configurations() if configuration != DEFAULT_CONFIGURATION]
+    return [DEFAULT_CONFIGURATION] + rng.sample(configurations, min(nb_configurations - 1, len(configurations)))
+
+
+def configuration_name(configuration):
+    return ' '.join(option if value is True else option + ' ' + value for option, value in configuration) or 'default'
+
+
+# Command-line options of a configuration for a benchmark (the options irrelevant for its property are removed)
+def configuration_options(configuration, benchmark):
+    options = []
+    for option, value in configuration:
+        if option in OPTION_PROPERTIES and benchmark.keyword not in OPTION_PROPERTIES[option]:
+            continue
+        options += [option] if value is True else [option, value]
+    return options
+
+
+# ************************************************************
+# BENCHMARKS
+# ************************************************************
+
+# Comparator options in the current version of IMITATOR (the options tuned here and the output options are not kept)
+# HACK: copied from comparator.py
+COMPARATOR_PATH = os.path.join(iu.IMITATOR_PATH, 'comparator', 'comparator_data.py')
+COMPARATOR_SYNTAX = {
+    11: '-no-var-autoremove',   # OPT_NO_VAR_AUTOREMOVE
+}
+# NOTE: the modes of the old versions have no option in IMITATOR 3, where the analysis is given by the property; an entry with a mode is kept only if its property file (else the .imiprop of its model) synthesizes with one of these keywords
+COMPARATOR_MODE_KEYWORDS = {
+    4: ['BCcover', 'BClearn', 'BCshuffle', 'BCrandom', 'BCrandomseq', 'BCborder', 'PRPC'],    # OPT_MODE_COVER
+    5: ['EF', 'EFpmin', 'EFpmax', 'EFtmin'],                                                # OPT_MODE_EF
+    10: ['PRP', 'PRPC'],                                                                    # OPT_PRP
+}
+BENCHMARKS_PATH = os.path.join(iu.IMITATOR_PATH, 'benchmarks')
+
+
+class Benchmark:
+    def __init__(self, name, model_file, property_file, family, options):
+        self.name = name
+        self.model_file = model_file
+        self.property_file = property_file
+        self.family = family
+        self.options = options
+        self.keyword = imitator_race.property_keyword(property_file)
+        with open(model_file) as f:
+            self.model_text = f.read()
+        self.property_text = None
+        if property_file is not None:
+            with open(property_file) as f:
+                self.property_text = f.read()
+
+
+# Family of a model: its directory under benchmarks/ (or its own directory)
+def model_family(model_file):
+    directory = os.path.dirname(os.path.abspath(model_file))
+    relative = os.path.relpath(directory, BENCHMARKS_PATH)
+    if not relative.startswith('..'):
+        return relative.split(os.sep)[0]
+    return os.path.basename(directory)
+
+
+# Benchmarks from a JSON file: list of {"name", "model", "property" (optional), "family" (optional), "options" (optional, not tuned)}
+def read_benchmarks(benchmarks_file):
+    base = os.path.dirname(os.path.abspath(benchmarks_file))
+    with open(benchmarks_file) as f:
+        items = json.load(f)
+    benchmarks = []
+    for item in items:
+        model_file = os.path.join(base, item['model'])
+        property_file = os.path.join(base, item['property']) if item.get('property') else None
+        benchmarks.append(Benchmark(item.get('name', os.path.basename(model_file)), model_file, property_file, item.get('family') or model_family(model_file), shlex.split(item.get('options', ''))))
+    return benchmarks
+
+
+# Benchmarks of the comparator (comparator/comparator_data.py) whose files exist
+def comparator_benchmarks():
+    namespace = {}
+    with open(COMPARATOR_PATH) as f:
+        exec(f.read(), namespace)
+    benchmarks = []
+    for item in namespace['data']:
+        files = [os.path.join(BENCHMARKS_PATH, file_name) for file_name in item['input_files']]
+        missing = [file_name for file_name in files if not os.path.isfile(file_name)]
+        if missing:
+            print('Warning: benchmark %s skipped (missing %s)' % (item['benchmark_name'], ', '.join(missing)))
+            continue
+        property_file = files[1] if len(files) > 1 else None
+        modes = [option for option in item['options'] if option in COMPARATOR_MODE_KEYWORDS]
+        if modes and property_file is None:
+            paired_file = os.path.splitext(files[0])[0] + '.imiprop'
+            property_file = paired_file if os.path.isfile(paired_file) else None
+        keyword = imitator_race.property_keyword(property_file)
+        if property_file is not None and keyword is None:
+            print('Warning: benchmark %s skipped (%s is not an IMITATOR 3 property)' % (item['benchmark_name'], property_file))
+            continue
+        unsupported = [mode for mode in modes if keyword not in COMPARATOR_MODE_KEYWORDS[mode]]
+        if unsupported:
+            print('Warning: benchmark %s skipped (no IMITATOR 3 property for its mode%s)' % (item['benchmark_name'], '' if property_file is None else ' in ' + property_file))
+            continue
+        options = []
+        for option in item['options']:
+            if option in COMPARATOR_SYNTAX:
+                options += COMPARATOR_SYNTAX[option].split()
+        benchmarks.append(Benchmark(item['benchmark_name'], files[0], property_file, model_family(files[0]), options))
+    return benchmarks
+
+
+# ************************************************************
+# MEASUREMENTS
+# ************************************************************
+
+# Measurement of one configuration on one benchmark: {'status', 'wall_time', 'budget', 'soundness', 'constraint'}
+# NOTE: a completed (or failed) run is final; a timeout is final for any budget up to its own
+class Measurements:
+    def __init__(self, history_file, binary, work_dir):
+        self.history_file = history_file
+        self.binary = iu.find_binary(binary)
+        self.work_dir = work_dir
+        self.records = imitator_race.read_history(history_file) if history_file else {}
+        self.nb_runs = 0
+        self.lock = threading.Lock()
+
+    def key(self, benchmark, options):
+        return imitator_server.cache_key(benchmark.model_text, benchmark.property_text, benchmark.options + options, self.binary)
+
+    # Recorded measurement still valid for this budget, or None
+    def lookup(self, benchmark, options, budget):
+        with self.lock:
+            record = self.records.get(self.key(benchmark, options))
+        if record is None or (record['status'] == iu.STATUS_TIMEOUT and record['budget'] < budget):
+            return None
+        return record
+
+    def measure(self, benchmark, options, budget):
+        record = self.lookup(benchmark, options, budget)
+        if record is not None:
+            return record
+        with self.lock:
+            self.nb_runs += 1
+            name = 'run%d' % self.nb_runs
+        execution = iu.run_imitator(self.work_dir, name, model_file=benchmark.model_file, property_file=benchmark.property_file, options=benchmark.options + options, binary=self.binary, timeout=budget)
+        record = {'status': execution.status, 'wall_time': execution.wall_time, 'budget': budget, 'soundness': None, 'constraint': None}
+        if execution.status == iu.STATUS_OK:
+            try:
+                result = execution.result()
+            except OSError:
+                record['status'] = iu.STATUS_FAILED
+            else:
+                record['soundness'] = result['soundness']
+                record['constraint'] = result['constraint']
+        for extension in [iu.RES_EXTENSION, '.log']:
+            if os.path.exists(os.path.join(self.work_dir, name + extension)):
+                os.remove(os.path.join(self.work_dir, name + extension))
+        with self.lock:
+            self.records[self.key(benchmark, options)] = record
+        return record
+
+    def save(self):
+        if self.history_file:
+            imitator_race.write_history(self.history_file, self.records)
+
+
+# ************************************************************
+# EQUIVALENCE OF THE RESULTS
+# ************************************************************
+
+# Comparisons already made: (constraint, constraint) => equal?
+equivalence_cache = {}
+
+
+def same_result(record, reference):
+    if record['constraint'] is None or reference['constraint'] is None:
+        return record['constraint'] == reference['constraint'] and record['soundness'] == reference['soundness']
+    # NOTE: a constraint with good and bad valuations is compared on its good part
+    first = record['constraint'].split('<good|bad>')[0]
+    second = reference['constraint'].split('<good|bad>')[0]
+    if first == second:
+        return True
+    if (first, second) not in equivalence_cache:
+        try:
+            equivalence_cache[first, second] = constraint_diff.compare_constraints(first, second, nb_samples=EQUIVALENCE_SAMPLES)['equal']
+        except (ValueError, iu.ConstraintParseError):
+            equivalence_cache[first, second] = False
+    return equivalence_cache[first, second]
+
+
+# Reference result of a benchmark: the result of the default configuration; if it never completed, the most frequent exact result on the largest budget
+def reference_result(records, final):
+    default = records.get(DEFAULT_CONFIGURATION)
+    if default is not None and default['status'] == iu.STATUS_OK:
+        return default
+    if not final:
+        return None
+    completed = [record for record in records.values() if record['status'] == iu.STATUS_OK and record['soundness'] == 'exact']
+    if not completed:
+        return None
+    constraints = [record['constraint'] for record in completed]
+    return max(completed, key=lambda record: constraints.count(record['constraint']))
+
+
+# ************************************************************
+# SUCCESSIVE HALVING
+# ************************************************************
+
+# Tuning of one family
+class FamilyTuner:
+    def __init__(self, family, benchmarks, configurations, measurements, eta, jobs, verbose):
+        self.family = family
+        self.benchmarks = benchmarks
+        self.configurations = configurations
+        self.measurements = measurements
+        self.eta = eta
+        self.jobs = jobs
+        self.verbose = verbose
+        # Configuration => benchmark name => record
+        self.records = {configuration: {} for configuration in configurations}
+        # Disqualified configurations => reason
+        self.disqualified = {}
+        self.rungs = []
+        self.lock = threading.Lock()
+
+    # PAR-2 score of a configuration on the benchmarks run so far (infinite if disqualified)
+    def score(self, configuration, budget):
+        if configuration in self.disqualified:
+            return math.inf
+        total = 0.0
+        for record in self.records[configuration].values():
+            # NOTE: a recorded run may have completed with a larger time limit
+            total += TIMEOUT_PENALTY * budget if record['status'] == iu.STATUS_TIMEOUT or record['wall_time'] > budget else record['wall_time']
+        return total
+
+    def run_configuration(self, configuration, budget, cutoff):
+        for benchmark in self.benchmarks:
+            # Early cut-off: stop as soon as the partial score exceeds the score needed to survive the rung
+            # NOTE: the default configuration is never cut off, as it is the reference of the results and of the speedup
+            if configuration != DEFAULT_CONFIGURATION and self.score(configuration, budget) > cutoff['score']:
+                with self.lock:
+                    self.disqualified.setdefault(configuration, 'cut off after %d benchmark(s)' % len(self.records[configuration]))
+                return
+            record = self.measurements.measure(benchmark, configuration_options(configuration, benchmark), budget)
+            with self.lock:
+                self.records[configuration][benchmark.name] = record
+                if record['status'] == iu.STATUS_FAILED:
+                    self.disqualified.setdefault(configuration, 'failed on ' + benchmark.name)
+                    return
+        with self.lock:
+            cutoff['scores'].append(self.score(configuration, budget))
+            cutoff['scores'].sort()
+            if len(cutoff['scores']) >= cutoff['keep']:
+                cutoff['score'] = cutoff['scores'][cutoff['keep'] - 1]
+
+    # Disqualify the configurations with a result different from the reference
+    # NOTE: the check waits for the result of the default configuration (which survives all the rungs), except on the largest budget
+    def check_results(self, final):
+        for benchmark in self.benchmarks:
+            records = {configuration: self.records[configuration][benchmark.name] for configuration in self.configurations if benchmark.name in self.records[configuration]}
+            reference = reference_result(records, final)
+            if reference is None:
+                continue
+            for configuration, record in records.items():
+                if record['status'] == iu.STATUS_OK and configuration not in self.disqualified and not same_result(record, reference):
+                    self.disqualified[configuration] = 'different result on ' + benchmark.name
+
+    def run(self, min_time, max_time):
+        survivors = list(self.configurations)
+        budget = min_time
+        while True:
+            keep = max(1, math.ceil(len(survivors) / self.eta))
+            for configuration in survivors:
+                self.records[configuration] = {}
+            cutoff = {'keep': keep, 'scores': [], 'score': math.inf}
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(self.run_configuration, configuration, budget, cutoff) for configuration in survivors]
+                for future in futures:
+                    future.result()
+            final = budget >= max_time
+            self.check_results(final)
+            ranking = sorted(survivors, key=lambda configuration: self.score(configuration, budget))
+            ranked = [configuration for configuration in ranking if configuration not in self.disqualified]
+            self.rungs.append({'budget': budget, 'configurations': len(survivors), 'kept': min(keep, len(ranked))})
+            if self.verbose:
+                print('  [%s] budget %.1f s: %d configuration(s), %d cut off or disqualified' % (self.family, budget, len(survivors), len([configuration for configuration in survivors if configuration in self.disqualified])))
+            if final or len(ranked) <= 1:
+                self.budget = budget
+                self.ranking = ranked
+                return ranked
+            survivors = ranked[:keep]
+            # NOTE: the default configuration always survives, to measure the speedup on the largest budget
+            if DEFAULT_CONFIGURATION not in survivors and DEFAULT_CONFIGURATION in self.configurations and DEFAULT_CONFIGURATION not in self.disqualified:
+                survivors.append(DEFAULT_CONFIGURATION)
+            budget = min(max_time, budget * self.eta)
+
+    # Recommendation of the family (dictionary)
+    def recommendation(self):
+        best = self.ranking[0] if self.ranking else None
+        if best is not None:
+            # NOTE: the options irrelevant for all the properties of the family are not recommended
+            best_options = tuple((option, value) for option, value in best if option not in OPTION_PROPERTIES or any(benchmark.keyword in OPTION_PROPERTIES[option] for benchmark in self.benchmarks))
+        default_score = self.score(DEFAULT_CONFIGURATION, self.budget) if DEFAULT_CONFIGURATION in self.records and DEFAULT_CONFIGURATION not in self.disqualified else None
+        recommendation = {
+            'family': self.family,
+            'benchmarks': [benchmark.name for benchmark in self.benchmarks],
+            'budget': self.budget,
+            'rungs': self.rungs,
+            'options': configuration_name(best_options) if best is not None else None,
+            'score': self.score(best, self.budget) if best is not None else None,
+            'default_score': default_score,
+            'solved': len([record for record in self.records[best].values() if record['status'] == iu.STATUS_OK]) if best is not None else 0,
+            'ranking': [{'options': configuration_name(configuration), 'score': self.score(configuration, self.budget)} for configuration in self.ranking[:10]],
+            'disqualified': {configuration_name(configuration): reason for configuration, reason in self.disqualified.items() if not reason.startswith('cut off')},
+        }
+        if best is not None and default_score:
+            recommendation['speedup'] = default_score / recommendation['score'] if recommendation['score'] else math.inf
+        return recommendation
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Auto-tuner of the performance options of IMITATOR by successive halving, with a recommended configuration for each model family')
+    parser.add_argument('benchmarks', nargs='?', default=None, help='JSON file of the benchmarks: list of {"name", "model", "property", "family", "options"} (default: the benchmarks of the comparator)')
+    parser.add_argument('--families', nargs='+', default=None, help='Only tune these families')
+    parser.add_argument('--configurations', type=int, default=81, help='Number of configurations in the first rung, including the default one (default: 81)')
+    parser.add_argument('--eta', type=int, default=3, help='Factor of successive halving: 1/eta of the configurations survive each rung, with an eta times larger time limit (default: 3)')
+    parser.add_argument('--min-time', type=float, default=2.0, help='Time limit of each run in the first rung (in seconds; default: 2)')
+    parser.add_argument('--max-time', type=float, default=120.0, help='Largest time limit of each run (in seconds; default: 120)')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of concurrent IMITATOR runs (default: 1, for reliable times)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the sample of configurations (default: 0)')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator)')
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help='File of the recorded measurements, reused across tunings (default: %s; empty: none)' % DEFAULT_HISTORY_PATH)
+    parser.add_argument('--output', default='option-tuning.json', help='Recommendations (JSON; default: option-tuning.json)')
+    parser.add_argument('--quiet', action='store_true', help='Only print the recommendations')
+    args = parser.parse_args()
+
+    if args.eta < 2:
+        print('Error: eta must be at least 2')
+        sys.exit(2)
+    benchmarks = read_benchmarks(args.benchmarks) if args.benchmarks else comparator_benchmarks()
+    families = {}
+    for benchmark in benchmarks:
+        if args.families is None or benchmark.family in args.families:
+            families.setdefault(benchmark.family, []).append(benchmark)
+    if not families:
+        print('Error: no benchmark to tune')
+        sys.exit(2)
+
+    configurations = sample_configurations(args.configurations, random.Random(args.seed))
+    work_dir = iu.create_sandbox('imitator_tuner_')
+    measurements = Measurements(args.history, args.imitator, work_dir)
+    recommendations = []
+    try:
+        for family, family_benchmarks in sorted(families.items()):
+            if not args.quiet:
+                print('Tuning %s (%d benchmark(s), %d configuration(s))' % (family, len(family_benchmarks), len(configurations)))
+            tuner = FamilyTuner(family, family_benchmarks, configurations, measurements, args.eta, args.jobs, not args.quiet)
+            tuner.run(args.min_time, args.max_time)
+            recommendations.append(tuner.recommendation())
+            # NOTE: saved after each family, so that an interrupted tuning is not lost
+            measurements.save()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(recommendations, f, indent=1)
+    for recommendation in recommendations:
+        if recommendation['options'] is None:
+            print('%s: no valid configuration' % recommendation['family'])
+            continue
+        speedup = ' (speedup %.2f over the default)' % recommendation['speedup'] if 'speedup' in recommendation else ''
+        print('%s: %s%s; %d / %d benchmark(s) solved in %.1f s' % (recommendation['family'], recommendation['options'], speedup, recommendation['solved'], len(recommendation['benchmarks']), recommendation['score']))
+    print('Recommendations written to %s (%d run(s))' % (args.output, measurements.nb_runs))
+
+
+if __name__ == '__main__':
+    __main__()
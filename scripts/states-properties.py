@@ -0,0 +1,354 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: evaluation of batches of properties (reachability, safety, unavoidability of locations and values of the discrete variables) over a state space exported by IMITATOR (.states file), without exploring the model again; reports the union of the constraints of the states satisfying each property
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import json
+import os
+import re
+import sys
+from array import array
+from collections import deque
+from fractions import Fraction
+
+import imitator_utilities as iu
+
+# Properties: keyword => description
+PROPERTIES = {
+    'EF': 'some reachable state satisfies the condition',
+    'AGnot': 'no reachable state satisfies the condition',
+    'AF': 'all the maximal paths from the initial state reach a state satisfying the condition',
+}
+
+COMPARISON_PATTERN = re.compile(r'^\s*([^\s<>=]+)\s*(<>|<=|>=|==|=|<|>)\s*(.+?)\s*$')
+LOCATION_PATTERN = re.compile(r'^\s*loc\[\s*([^\]\s]+)\s*\]\s*==?\s*(\S+)\s*$')
+
+
+# ************************************************************
+# STATE SPACE
+# ************************************************************
+
+# State space as arrays: the states are numbered from 0 (index) in the order of the file
+#   successors of the state i : targets[offsets[i]:offsets[i + 1]] (CSR)
+#   predecessors of the state i : sources[reverse_offsets[i]:reverse_offsets[i + 1]]
+#   global location of the state i : global_locations[global_location_ids[i]] (locations and values of the discrete variables)
+#   constraint of the state i : constraints[constraint_ids[i]] (projection onto the parameters)
+class StateSpace:
+    def __init__(self):
+        self.state_ids = array('l')
+        self.initial = []
+        self.global_location_ids = array('l')
+        self.global_locations = []
+        self.constraint_ids = array('l')
+        self.constraints = []
+        self.offsets = array('l')
+        self.targets = array('l')
+        self.reverse_offsets = array('l')
+        self.sources = array('l')
+
+    def nb_states(self):
+        return len(self.state_ids)
+
+    def nb_transitions(self):
+        return len(self.targets)
+
+    def successors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def predecessors(self, i):
+        return self.sources[self.reverse_offsets[i]:self.reverse_offsets[i + 1]]
+
+
+# Compressed sparse rows of the edges (source, target) (the edges are sorted by source)
+def make_csr(nb_states, edge_sources, edge_targets):
+    offsets = array('l', [0] * (nb_states + 1))
+    for source in edge_sources:
+        offsets[source + 1] += 1
+    for i in range(nb_states):
+        offsets[i + 1] += offsets[i]
+    position = array('l', offsets[:nb_states])
+    targets = array('l', [0] * len(edge_targets))
+    for source, target in zip(edge_sources, edge_targets):
+        targets[position[source]] = target
+        position[source] += 1
+    return offsets, targets
+
+
+# Load a .states file in one pass
+def load_state_space(states_file):
+    space = StateSpace()
+    # Indexes of the states, global locations and constraints
+    state_indexes = {}
+    global_location_indexes = {}
+    constraint_indexes = {}
+    edge_sources = array('l')
+    edge_targets = array('l')
+    with open(states_file, 'rb') as f:
+        for item in iu.iter_states_file(f):
+            if isinstance(item, tuple):
+                source, target, _ = item
+                # NOTE: transitions from or to unknown states (truncated file) are ignored
+                if source in state_indexes and target in state_indexes:
+                    edge_sources.append(state_indexes[source])
+                    edge_targets.append(state_indexes[target])
+                continue
+            index = len(space.state_ids)
+            state_indexes[item.id] = index
+            space.state_ids.append(item.id)
+            if item.initial:
+                space.initial.append(index)
+            global_location = (tuple(item.locations), tuple(item.discretes))
+            if global_location not in global_location_indexes:
+                global_location_indexes[global_location] = len(space.global_locations)
+                space.global_locations.append(global_location)
+            space.global_location_ids.append(global_location_indexes[global_location])
+            constraint = item.projection or item.constraint
+            if constraint not in constraint_indexes:
+                constraint_indexes[constraint] = len(space.constraints)
+                space.constraints.append(constraint)
+            space.constraint_ids.append(constraint_indexes[constraint])
+    if not space.initial and space.state_ids:
+        space.initial.append(0)
+    space.offsets, space.targets = make_csr(space.nb_states(), edge_sources, edge_targets)
+    space.reverse_offsets, space.sources = make_csr(space.nb_states(), edge_targets, edge_sources)
+    return space
+
+
+# ************************************************************
+# CONDITIONS
+# ************************************************************
+
+# Value of a discrete variable as a number if possible (integers, rationals a/b, decimals), else as a string
+def parse_value(text):
+    try:
+        return Fraction(text.strip())
+    except (ValueError, ZeroDivisionError):
+        return text.strip()
+
+
+# Atom of a condition: ('location', automaton, location) or ('value', variable, operator, value)
+def parse_atom(text):
+    m = LOCATION_PATTERN.match(text)
+    if m:
+        return ('location', m.group(1), m.group(2))
+    m = COMPARISON_PATTERN.match(text)
+    if m:
+        operator = '=' if m.group(2) == '==' else m.group(2)
+        return ('value', m.group(1), operator, parse_value(m.group(3)))
+    if ':' in text:
+        automaton, location = text.split(':', 1)
+        return ('location', automaton.strip(), location.strip())
+    raise ValueError('Cannot parse the condition "' + text.strip() + '"')
+
+
+# Condition in disjunctive normal form: list (disjunction) of lists (conjunctions) of atoms
+#   atoms: loc[automaton] = location, automaton:location, variable OP value with OP in =, <>, <, <=, >, >=
+def parse_condition(text):
+    return [[parse_atom(atom) for atom in conjunction.split('&')] for conjunction in text.split('|')]
+
+
+def compare(value, operator, reference):
+    if operator in ['=', '<>']:
+        return (value == reference) == (operator == '=')
+    if not isinstance(value, Fraction) or not isinstance(reference, Fraction):
+        return False
+    return {'<': value < reference, '<=': value <= reference, '>': value > reference, '>=': value >= reference}[operator]
+
+
+def atom_holds(atom, locations, discretes):
+    if atom[0] == 'location':
+        return locations.get(atom[1]) == atom[2]
+    _, variable, operator, reference = atom
+    if variable not in discretes:
+        return False
+    return compare(parse_value(discretes[variable]), operator, reference)
+
+
+# Array (of booleans) of the states satisfying the condition
+# NOTE: the condition is evaluated once per global location, not once per state
+def matching_states(space, condition):
+    global_location_holds = []
+    for locations, discretes in space.global_locations:
+        locations = dict(locations)
+        discretes = dict(discretes)
+        global_location_holds.append(any(all(atom_holds(atom, locations, discretes) for atom in conjunction) for conjunction in condition))
+    return bytearray(1 if global_location_holds[g] else 0 for g in space.global_location_ids)
+
+
+# ************************************************************
+# PROPERTIES
+# ************************************************************
+
+# States reachable from the initial state(s)
+def reachable_states(space):
+    reached = bytearray(space.nb_states())
+    queue = deque(space.initial)
+    for i in space.initial:
+        reached[i] = 1
+    while queue:
+        i = queue.popleft()
+        for j in space.successors(i):
+            if not reached[j]:
+                reached[j] = 1
+                queue.append(j)
+    return reached
+
+
+# States from which all the maximal paths reach a matching state (least fixpoint, using the predecessors)
+# NOTE: a deadlock state that does not match avoids the condition
+# NOTE: this only considers the graph: in a parametric state space, a state whose successors only exist for some parameter valuations is a deadlock for the other ones, so the result over-approximates the states from which the condition is unavoidable for all valuations
+def unavoidable_states(space, matching):
+    winning = bytearray(matching)
+    # Number of successors not yet winning
+    remaining = array('l', (space.offsets[i + 1] - space.offsets[i] for i in range(space.nb_states())))
+    queue = deque(i for i in range(space.nb_states()) if winning[i])
+    while queue:
+        i = queue.popleft()
+        for j in space.predecessors(i):
+            if winning[j]:
+                continue
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                winning[j] = 1
+                queue.append(j)
+    return winning
+
+
+# Union of the (distinct) constraints of the states
+def constraint_union(space, states):
+    constraint_ids = sorted(set(space.constraint_ids[i] for i in states))
+    constraints = [space.constraints[c] for c in constraint_ids if space.constraints[c] != 'False']
+    if 'True' in constraints:
+        return ['True']
+    return constraints
+
+
+# Evaluate a property: keyword (EF, AGnot, AF) and condition
+def evaluate(space, keyword, condition_text, reached=None):
+    if keyword not in PROPERTIES:
+        raise ValueError('Unknown property "' + keyword + '" (expected: ' + ', '.join(PROPERTIES) + ')')
+    condition = parse_condition(condition_text)
+    if reached is None:
+        reached = reachable_states(space)
+    matching = matching_states(space, condition)
+    states = [i for i in range(space.nb_states()) if matching[i] and reached[i]]
+    result = {'property': keyword + ' ' + condition_text.strip(), 'matching_states': len(states)}
+    if keyword == 'EF':
+        result['holds'] = bool(states)
+        result['constraint'] = constraint_union(space, states)
+    elif keyword == 'AGnot':
+        result['holds'] = not states
+        # NOTE: the union of the constraints of the bad states (the property holds outside)
+        result['violation_constraint'] = constraint_union(space, states)
+    else:
+        winning = unavoidable_states(space, matching)
+        result['holds'] = all(winning[i] for i in space.initial)
+        # NOTE: "holds" means that AF holds on the graph, which does not imply that it holds for all the parameter valuations (see unavoidable_states)
+        result['graph_over_approximation'] = True
+        result['constraint'] = constraint_union(space, states)
+        avoiding = [i for i in range(space.nb_states()) if reached[i] and not winning[i] and space.offsets[i + 1] == space.offsets[i]]
+        result['avoiding_deadlocks'] = [space.state_ids[i] for i in avoiding[:10]]
+    result['example_states'] = [space.state_ids[i] for i in states[:10]]
+    return result
+
+
+COMMENT_PATTERN = re.compile(r'\(\*.*?\*\)', re.DOTALL)
+
+
+# Property "KEYWORD condition" (also accepts the IMITATOR syntax "property := #synth KEYWORD(condition);")
+def parse_property(text):
+    text = text.strip()
+    m = re.match(r'^(?:property\s*:=\s*)?(?:#synth\s+|#witness\s+|#exhibit\s+)?(EF|AGnot|AF)\s*(.*?)\s*;?\s*$', text)
+    if not m:
+        raise ValueError('Cannot parse the property "' + text + '"')
+    condition = m.group(2)
+    if condition.startswith('(') and condition.endswith(')'):
+        condition = condition[1:-1]
+    return m.group(1), condition
+
+
+# Properties of a file (one per line); the comments (* ... *) and the blank lines are ignored
+def read_properties(properties_file):
+    with open(properties_file) as f:
+        text = COMMENT_PATTERN.sub('', f.read())
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def format_constraint(constraints):
+    if not constraints:
+        return 'False'
+    return '\n  OR\n'.join('  ' + constraint.replace('\n', '\n  ') for constraint in constraints)
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Evaluation of properties over a state space exported by IMITATOR (-mode statespace -states-description)')
+    parser.add_argument('states_file', help='State space (.states file)')
+    parser.add_argument('properties', nargs='*', help='Properties, e.g. "EF loc[pta] = l2 & i >= 1", "AGnot obs:nok", "AF pta:done"')
+    parser.add_argument('--file', default=None, help='File of properties (one per line)')
+    parser.add_argument('--json', default=None, help='Also write the results in this JSON file')
+    parser.add_argument('--quiet', action='store_true', help='Do not print the constraints')
+    args = parser.parse_args()
+
+    properties = list(args.properties)
+    if args.file is not None:
+        properties += read_properties(args.file)
+    if not properties:
+        print('No property to evaluate')
+        sys.exit(1)
+    if not os.path.isfile(args.states_file):
+        print('Error: ' + args.states_file + ' is not a file')
+        sys.exit(1)
+
+    space = load_state_space(args.states_file)
+    print('%d states, %d transitions, %d global locations, %d distinct constraints' % (space.nb_states(), space.nb_transitions(), len(space.global_locations), len(space.constraints)))
+    reached = reachable_states(space)
+
+    results = []
+    for text in properties:
+        try:
+            keyword, condition = parse_property(text)
+            result = evaluate(space, keyword, condition, reached)
+        except ValueError as e:
+            print('Error: %s' % e)
+            results.append({'property': text, 'error': str(e)})
+            continue
+        results.append(result)
+        print('')
+        verdict = 'holds' if result['holds'] else 'does not hold'
+        if result.get('graph_over_approximation'):
+            verdict += ' on the graph (parametric deadlocks not considered)'
+        print('%s: %s (%d matching state(s))' % (result['property'], verdict, result['matching_states']))
+        if args.quiet:
+            continue
+        if 'constraint' in result:
+            print(' Union of the constraints of the matching states:')
+            print(format_constraint(result['constraint']))
+        else:
+            print(' Union of the constraints of the violating states:')
+            print(format_constraint(result['violation_constraint']))
+        if result.get('avoiding_deadlocks'):
+            print(' Deadlock states avoiding the condition: ' + ', '.join(str(state) for state in result['avoiding_deadlocks']))
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == '__main__':
+    __main__()
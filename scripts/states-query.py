@@ -0,0 +1,411 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: queries over a state space in the .states format (option -states-description): the file is read once and indexed (states, locations, values of the discrete variables, transitions) in a database next to it, so that the queries never read the whole file again
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import os
+import sqlite3
+import sys
+
+import imitator_utilities as iu
+
+# Version of the database schema (the index is rebuilt if it differs)
+INDEX_VERSION = '1'
+
+# Number of rows inserted at once when building the index
+BATCH_SIZE = 10000
+
+SCHEMA = '''
+CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE states (id INTEGER PRIMARY KEY, offset INTEGER, length INTEGER, initial INTEGER);
+CREATE TABLE locations (id INTEGER PRIMARY KEY, automaton TEXT, location TEXT);
+CREATE TABLE state_locations (location INTEGER, state INTEGER);
+CREATE TABLE discrete_values (id INTEGER PRIMARY KEY, name TEXT, value TEXT);
+CREATE TABLE state_discrete_values (discrete_value INTEGER, state INTEGER);
+CREATE TABLE transitions (source INTEGER, target INTEGER, action TEXT);
+'''
+
+# NOTE: the indexes are created after the insertions (faster than maintaining them)
+INDEXES = '''
+CREATE UNIQUE INDEX locations_index ON locations (automaton, location);
+CREATE INDEX state_locations_index ON state_locations (location, state);
+CREATE UNIQUE INDEX discrete_values_index ON discrete_values (name, value);
+CREATE INDEX state_discrete_values_index ON state_discrete_values (discrete_value, state);
+CREATE INDEX transitions_source_index ON transitions (source);
+CREATE INDEX transitions_target_index ON transitions (target);
+'''
+
+
+# ************************************************************
+# INDEX
+# ************************************************************
+
+def default_index_file(states_file):
+    return states_file + '.index'
+
+
+# Identification of the indexed file (the index is rebuilt when it changes)
+def file_signature(states_file):
+    status = os.stat(states_file)
+    return {'version': INDEX_VERSION, 'size': str(status.st_size), 'mtime': str(int(status.st_mtime))}
+
+
+def index_is_valid(index_file, states_file):
+    if not os.path.isfile(index_file):
+        return False
+    try:
+        connection = sqlite3.connect(index_file)
+        try:
+            info = dict(connection.execute('SELECT key, value FROM info'))
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return False
+    return all(info.get(key) == value for key, value in file_signature(states_file).items()) and info.get('complete') == '1'
+
+
+# Read the .states file once and fill the database
+def build_index(states_file, index_file, verbose=True):
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    connection = sqlite3.connect(index_file)
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.executescript(SCHEMA)
+
+    # Identifiers of the (automaton, location) and (variable, value) pairs
+    location_ids = {}
+    discrete_value_ids = {}
+    rows = {'states': [], 'state_locations': [], 'state_discrete_values': [], 'transitions': []}
+    queries = {
+        'states': 'INSERT INTO states VALUES (?, ?, ?, ?)',
+        'state_locations': 'INSERT INTO state_locations VALUES (?, ?)',
+        'state_discrete_values': 'INSERT INTO state_discrete_values VALUES (?, ?)',
+        'transitions': 'INSERT INTO transitions VALUES (?, ?, ?)',
+    }
+
+    def flush(table):
+        connection.executemany(queries[table], rows[table])
+        rows[table] = []
+
+    nb_states = 0
+    nb_transitions = 0
+    with open(states_file, 'rb') as f:
+        for item in iu.iter_states_file(f, with_constraints=False):
+            if isinstance(item, tuple):
+                rows['transitions'].append(item)
+                nb_transitions += 1
+                if len(rows['transitions']) >= BATCH_SIZE:
+                    flush('transitions')
+                continue
+            rows['states'].append((item.id, item.offset, item.length, 1 if item.initial else 0))
+            for pair in item.locations:
+                rows['state_locations'].append((location_ids.setdefault(pair, len(location_ids)), item.id))
+            for pair in item.discretes:
+                rows['state_discrete_values'].append((discrete_value_ids.setdefault(pair, len(discrete_value_ids)), item.id))
+            nb_states += 1
+            if len(rows['states']) >= BATCH_SIZE:
+                for table in ['states', 'state_locations', 'state_discrete_values']:
+                    flush(table)
+            if verbose and nb_states % 100000 == 0:
+                print('  %d states read' % nb_states, flush=True)
+    for table in rows:
+        flush(table)
+
+    connection.executemany('INSERT INTO locations VALUES (?, ?, ?)', ((location_id, automaton, location) for (automaton, location), location_id in location_ids.items()))
+    connection.executemany('INSERT INTO discrete_values VALUES (?, ?, ?)', ((value_id, name, value) for (name, value), value_id in discrete_value_ids.items()))
+    connection.executescript(INDEXES)
+    info = file_signature(states_file)
+    info.update({'states': str(nb_states), 'transitions': str(nb_transitions), 'complete': '1'})
+    connection.executemany('INSERT INTO info VALUES (?, ?)', info.items())
+    connection.commit()
+    connection.close()
+    if verbose:
+        print('Index built: %d states, %d transitions' % (nb_states, nb_transitions))
+
+
+# ************************************************************
+# QUERIES
+# ************************************************************
+
+class StateSpaceIndex:
+    def __init__(self, states_file, index_file=None, rebuild=False, verbose=True):
+        self.states_file = states_file
+        self.index_file = index_file or default_index_file(states_file)
+        if rebuild or not index_is_valid(self.index_file, states_file):
+            if verbose:
+                print('Indexing ' + states_file + '...', flush=True)
+            build_index(states_file, self.index_file, verbose)
+        self.connection = sqlite3.connect(self.index_file)
+        self.file = open(states_file, 'rb')
+
+    def close(self):
+        self.connection.close()
+        self.file.close()
+
+    def info(self):
+        return dict(self.connection.execute('SELECT key, value FROM info'))
+
+    def exists(self, state):
+        return self.connection.execute('SELECT 1 FROM states WHERE id = ?', (state,)).fetchone() is not None
+
+    # Text of the description of a state (read at its position in the file), or None if it does not exist
+    def state_text(self, state):
+        row = self.connection.execute('SELECT offset, length FROM states WHERE id = ?', (state,)).fetchone()
+        if row is None:
+            return None
+        self.file.seek(row[0])
+        return self.file.read(row[1]).decode('utf-8', errors='replace').rstrip()
+
+    def initial_states(self):
+        return [row[0] for row in self.connection.execute('SELECT id FROM states WHERE initial = 1 ORDER BY id')]
+
+    # List of (target, action or None)
+    def successors(self, state):
+        return self.connection.execute('SELECT target, action FROM transitions WHERE source = ? ORDER BY target', (state,)).fetchall()
+
+    # List of (source, action or None)
+    def predecessors(self, state):
+        return self.connection.execute('SELECT source, action FROM transitions WHERE target = ? ORDER BY source', (state,)).fetchall()
+
+    # States satisfying all the conditions: ('location', automaton, location) or ('value', variable, value)
+    def find(self, conditions):
+        queries = []
+        parameters = []
+        for kind, name, value in conditions:
+            if kind == 'location':
+                queries.append('SELECT state_locations.state FROM state_locations JOIN locations ON locations.id = state_locations.location WHERE locations.automaton = ? AND locations.location = ?')
+            else:
+                queries.append('SELECT state_discrete_values.state FROM state_discrete_values JOIN discrete_values ON discrete_values.id = state_discrete_values.discrete_value WHERE discrete_values.name = ? AND discrete_values.value = ?')
+            parameters += [name, value]
+        if not queries:
+            return []
+        return [row[0] for row in self.connection.execute(' INTERSECT '.join(queries) + ' ORDER BY 1', parameters)]
+
+    def locations(self, automaton=None):
+        if automaton is None:
+            return self.connection.execute('SELECT automaton, location FROM locations ORDER BY automaton, location').fetchall()
+        return self.connection.execute('SELECT automaton, location FROM locations WHERE automaton = ? ORDER BY location', (automaton,)).fetchall()
+
+
+# Condition 'automaton:location' or 'variable=value'
+def parse_condition(text):
+    if '=' in text:
+        name, value = text.split('=', 1)
+        return ('value', name.strip(), value.strip())
+    if ':' in text:
+        automaton, location = text.split(':', 1)
+        return ('location', automaton.strip(), location.strip())
+    raise ValueError('Condition "' + text + '" is neither automaton:location nor variable=value')
+
+
+# Edge in the DOT format
+def dot_edge(source, target, action):
+    return 's_%d -> s_%d%s;' % (source, target, '' if action is None else '[label="' + action + '"]')
+
+
+def write_dot(dot_file, edges):
+    with open(dot_file, 'w') as f:
+        f.write('digraph {\n')
+        for edge in sorted(set(edges), key=lambda edge: (edge[0], edge[1], edge[2] or '')):
+            f.write(dot_edge(*edge) + '\n')
+        f.write('}\n')
+
+
+# ************************************************************
+# DISPLAY
+# ************************************************************
+
+def print_states(states):
+    print('%d state(s)' % len(states))
+    if states:
+        print(' '.join(str(state) for state in states))
+
+
+def print_transitions(state, transitions, successors):
+    for other, action in transitions:
+        edge = (state, other) if successors else (other, state)
+        print('s_%d -> s_%d' % edge + ('' if action is None else ' via "' + action + '"'))
+
+
+def show_state(index, state):
+    text = index.state_text(state)
+    print('State %d does not exist' % state if text is None else text)
+
+
+# One command of the command line or of the interactive mode; returns the edges to log (for paths)
+def run_command(index, words):
+    command, arguments = words[0], words[1:]
+    if command == 'state':
+        for state in arguments:
+            show_state(index, int(state))
+    elif command in ['succ', 'pred']:
+        edges = []
+        for state in map(int, arguments):
+            if not index.exists(state):
+                print('State %d does not exist' % state)
+                continue
+            transitions = index.successors(state) if command == 'succ' else index.predecessors(state)
+            print_transitions(state, transitions, command == 'succ')
+            edges += [(state, other, action) if command == 'succ' else (other, state, action) for other, action in transitions]
+        return edges
+    elif command == 'initial':
+        print_states(index.initial_states())
+    elif command == 'find':
+        print_states(index.find([parse_condition(text) for text in arguments]))
+    elif command == 'locations':
+        for automaton, location in index.locations(arguments[0] if arguments else None):
+            print(automaton + ': ' + location)
+    elif command == 'path':
+        # Path given by the sequence of its states
+        states = [int(state) for state in arguments[1:]]
+        edges = []
+        for source, target in zip(states, states[1:]):
+            actions = [action for other, action in index.successors(source) if other == target]
+            if not actions:
+                print('No transition from s_%d to s_%d' % (source, target))
+                return []
+            edges += [(source, target, action) for action in actions]
+        write_dot(arguments[0], edges)
+        print('Path written to ' + arguments[0])
+    elif command == 'info':
+        for key, value in sorted(index.info().items()):
+            print(key + ': ' + value)
+    else:
+        raise ValueError('Unknown command "' + command + '"')
+    return []
+
+
+MENU = [
+    'Display state from number',
+    'Successors of a state',
+    'Predecessors of a state',
+    'Log a path',
+    'Display states from location',
+    'Display states from variable value',
+    'Quit',
+]
+
+PATH_MENU = [
+    'Find predecessors',
+    'Find successors',
+    'Display a state on screen',
+    'End path generation',
+]
+
+
+def choose(options):
+    for i, option in enumerate(options):
+        print('%d) %s' % (i + 1, option))
+    try:
+        return input('#? ').strip()
+    except EOFError:
+        return str(len(options))
+
+
+def read_state():
+    return input('State number? ').strip()
+
+
+# Interactive mode, with the menu of the former queries.sh
+def interactive(index):
+    while True:
+        reply = choose(MENU)
+        try:
+            if reply == '1':
+                run_command(index, ['state', read_state()])
+            elif reply == '2':
+                run_command(index, ['succ', read_state()])
+            elif reply == '3':
+                run_command(index, ['pred', read_state()])
+            elif reply == '4':
+                log_path(index)
+            elif reply == '5':
+                automaton = input('Automaton? ').strip()
+                location = input('Location? ').strip()
+                print_states(index.find([('location', automaton, location)]))
+            elif reply == '6':
+                variable = input('Variable? ').strip()
+                value = input('Value? ').strip()
+                print_states(index.find([('value', variable, value)]))
+            elif reply in [str(len(MENU)), 'q', '']:
+                return
+        except ValueError as e:
+            print(e)
+        except EOFError:
+            return
+
+
+# Log the transitions found from the successors and predecessors of the states into a DOT file
+def log_path(index):
+    dot_file = input('Path file name (.dot)? ').strip()
+    edges = []
+    while True:
+        reply = choose(PATH_MENU)
+        if reply == '1':
+            edges += run_command(index, ['pred', read_state()])
+        elif reply == '2':
+            edges += run_command(index, ['succ', read_state()])
+        elif reply == '3':
+            run_command(index, ['state', read_state()])
+        elif reply == '4':
+            write_dot(dot_file, edges)
+            print('Path written to ' + dot_file)
+            return
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+COMMANDS_HELP = '''commands (interactive mode if none):
+  state N...                  description of states
+  succ N... / pred N...       successors / predecessors of states
+  initial                     initial state(s)
+  find COND...                states satisfying all the conditions automaton:location or variable=value
+  locations [AUTOMATON]       locations of the state space
+  path FILE.dot N1 N2...      write the path N1 -> N2 -> ... in the DOT format
+  info                        size of the state space
+'''
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Queries over a state space generated by IMITATOR (.states file)', epilog=COMMANDS_HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('states_file', help='State space (.states file)')
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='Command and its arguments')
+    parser.add_argument('--index', default=None, help='Index file (default: the .states file with extension .index)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index even if it is up to date')
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.states_file):
+        print('Error: ' + args.states_file + ' is not a file')
+        sys.exit(1)
+
+    index = StateSpaceIndex(args.states_file, args.index, args.rebuild)
+    try:
+        if args.command:
+            try:
+                run_command(index, args.command)
+            except (ValueError, IndexError) as e:
+                print('Error: ' + (str(e) or 'missing argument'))
+                sys.exit(1)
+        else:
+            interactive(index)
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: generator of random real-time task sets (JSON format of json-parser-both.py), with a controlled utilization per CPU (UUniFast)
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+
+import imitator_utilities as iu
+
+# The JSON scheduling-model generator
+json_parser = iu.load_script('json-parser-both.py', 'json_parser_both')
+
+CPU_PREEMPTIVE = 'preemptive'
+CPU_NONPREEMPTIVE = 'nonpreemptive'
+
+
+# ************************************************************
+# GENERATION
+# ************************************************************
+
+# UUniFast [Bini & Buttazzo, 2005]: n utilizations uniformly distributed among those summing to total_utilization
+def uunifast(rng, n, total_utilization):
+    utilizations = []
+    remaining = total_utilization
+    for i in range(1, n):
+        next_remaining = remaining * rng.random() ** (1.0 / (n - i))
+        utilizations.append(remaining - next_remaining)
+        remaining = next_remaining
+    utilizations.append(remaining)
+    return utilizations
+
+
+# Random task set as a dictionary in the JSON format of json-parser-both.py
+#   nb_cpus          : number of CPUs
+#   nb_nonpreemptive : number of non-preemptive CPUs among them (the last ones)
+#   nb_pipelines     : number of pipelines
+#   tasks_per_pipeline: pair (min, max) of the number of tasks of each pipeline
+#   utilization      : total utilization of each CPU
+#   periods          : pair (min, max) of the periods (log-uniform)
+#   deadline_ratio   : relative deadline of each pipeline, as a ratio of its period
+# NOTE: the priorities are rate monotonic on each CPU (the higher the number, the higher the priority)
+def generate_task_set(rng, nb_cpus, nb_nonpreemptive, nb_pipelines, tasks_per_pipeline, utilization, periods, deadline_ratio=1.0):
+    cpus = [{'id': str(cpu_id), 'type': CPU_NONPREEMPTIVE if cpu_id > nb_cpus - nb_nonpreemptive else CPU_PREEMPTIVE} for cpu_id in range(1, nb_cpus + 1)]
+
+    # Structure of the pipelines
+    min_period, max_period = periods
+    pipelines = []
+    for pipeline_id in range(1, nb_pipelines + 1):
+        period = int(round(math.exp(rng.uniform(math.log(min_period), math.log(max_period)))))
+        nb_tasks = rng.randint(tasks_per_pipeline[0], tasks_per_pipeline[1])
+        pipelines.append({'id': pipeline_id, 'period': period, 'dline': max(1, int(period * deadline_ratio)), 'cpus': [rng.randint(1, nb_cpus) for _ in range(nb_tasks)]})
+
+    # NOTE: task ids are <pipeline id><rank in the pipeline>, as in the existing task sets
+    id_factor = 10 ** len(str(tasks_per_pipeline[1]))
+
+    # Utilization of the tasks of each CPU
+    tasks = []
+    for cpu_id in range(1, nb_cpus + 1):
+        cpu_tasks = [(pipeline, seq) for pipeline in pipelines for seq, task_cpu in enumerate(pipeline['cpus']) if task_cpu == cpu_id]
+        # Rate monotonic: the lowest priority for the longest period
+        by_period = sorted(cpu_tasks, key=lambda pipeline_seq: (-pipeline_seq[0]['period'], pipeline_seq[0]['id'], pipeline_seq[1]))
+        priority = {(pipeline['id'], seq): rank + 1 for rank, (pipeline, seq) in enumerate(by_period)}
+        for (pipeline, seq), task_utilization in zip(cpu_tasks, uunifast(rng, len(cpu_tasks), utilization)):
+            tasks.append((pipeline['id'], seq, {
+                'id': str(pipeline['id'] * id_factor + seq + 1),
+                'wcet': str(max(1, int(round(task_utilization * pipeline['period'])))),
+                'prio': str(priority[(pipeline['id'], seq)]),
+                'cpu': str(cpu_id),
+                'seq': str(seq),
+            }))
+    tasks.sort(key=lambda task: (task[0], task[1]))
+
+    return {
+        'CPUS': cpus,
+        'PIPELINES': [{
+            'id': str(pipeline['id']),
+            'period': str(pipeline['period']),
+            'dline': str(pipeline['dline']),
+            'TASKS': [task for pipeline_id, _, task in tasks if pipeline_id == pipeline['id']],
+        } for pipeline in pipelines],
+    }
+
+
+# Add the parser arguments describing the shape of the task sets (shared with the scripts calling generate_task_set)
+def add_generation_arguments(parser):
+    parser.add_argument('--cpus', type=int, default=2, help='Number of CPUs (default: 2)')
+    parser.add_argument('--nonpreemptive', type=int, default=0, help='Number of non-preemptive CPUs among them (default: 0)')
+    parser.add_argument('--pipelines', type=int, default=3, help='Number of pipelines (default: 3)')
+    parser.add_argument('--min-tasks', type=int, default=1, help='Minimum number of tasks per pipeline (default: 1)')
+    parser.add_argument('--max-tasks', type=int, default=3, help='Maximum number of tasks per pipeline (default: 3)')
+    parser.add_argument('--utilization', type=float, default=0.5, help='Utilization of each CPU (default: 0.5)')
+    parser.add_argument('--min-period', type=int, default=10, help='Minimum period (default: 10)')
+    parser.add_argument('--max-period', type=int, default=1000, help='Maximum period (default: 1000)')
+    parser.add_argument('--deadline-ratio', type=float, default=1.0, help='Relative deadline of the pipelines, as a ratio of the period (default: 1)')
+
+
+def check_generation_arguments(args):
+    errors = []
+    if args.cpus < 1:
+        errors.append('at least one CPU is needed')
+    if not 0 <= args.nonpreemptive <= args.cpus:
+        errors.append('the number of non-preemptive CPUs must be between 0 and the number of CPUs')
+    if args.pipelines < 1:
+        errors.append('at least one pipeline is needed')
+    if not 1 <= args.min_tasks <= args.max_tasks:
+        errors.append('the numbers of tasks per pipeline must satisfy 1 <= min <= max')
+    if args.utilization <= 0:
+        errors.append('the utilization must be positive')
+    if not 1 <= args.min_period <= args.max_period:
+        errors.append('the periods must satisfy 1 <= min <= max')
+    return errors
+
+
+def generate_from_arguments(rng, args):
+    return generate_task_set(rng, args.cpus, args.nonpreemptive, args.pipelines, (args.min_tasks, args.max_tasks), args.utilization, (args.min_period, args.max_period), args.deadline_ratio)
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Generates random real-time task sets (JSON), and optionally converts them to IMITATOR and MAST')
+    add_generation_arguments(parser)
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--count', type=int, default=1, help='Number of task sets (default: 1)')
+    parser.add_argument('--output-dir', default='.', help='Directory of the generated files (default: current directory)')
+    parser.add_argument('--prefix', default='taskset', help='Prefix of the generated files (default: taskset)')
+    parser.add_argument('--imitator', action='store_true', help='Also produce the IMITATOR model (.imi, .v0)')
+    parser.add_argument('--mast', action='store_true', help='Also produce the MAST model (.txt)')
+    parser.add_argument('--prune', action='store_true', help='Only generate the reachable ready sets of the processors (IMITATOR model)')
+    args = parser.parse_args()
+
+    errors = check_generation_arguments(args)
+    if errors:
+        parser.error('; '.join(errors))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    rng = random.Random(args.seed)
+
+    for index in range(args.count):
+        task_set = generate_from_arguments(rng, args)
+        base_name = os.path.join(args.output_dir, '%s_%d' % (args.prefix, index))
+        with open(base_name + '.json', 'w') as f:
+            json.dump(task_set, f, indent=4)
+        print(base_name + '.json')
+
+        if args.imitator or args.mast:
+            cpu_list = json_parser.create_cpus(task_set['CPUS'])
+            pipeline_list = json_parser.create_pipelines(task_set['PIPELINES'])
+            if args.imitator:
+                tid_list = json_parser.default_tid_list(pipeline_list)
+                # NOTE: not get_imitator_file_names, which cuts the name at its first dot (e.g., in './taskset_0')
+                imitator_file_name, v0_file_name = base_name + '.imi', base_name + '.v0'
+                json_parser.write_chunks(imitator_file_name, json_parser.imitator_model(cpu_list, pipeline_list, tid_list, args.prune))
+                json_parser.write_chunks(v0_file_name, json_parser.imitator_v0(pipeline_list, tid_list))
+            if args.mast:
+                # NOTE: create_mast_file prints the model
+                with open(base_name + '.txt', 'w') as f, contextlib.redirect_stdout(f):
+                    json_parser.create_mast_file(cpu_list, pipeline_list)
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: parametric-WCET sensitivity sweep: for each subset of tasks of a JSON task set, make their WCETs parametric, synthesize the schedulable WCETs with IMITATOR, and rank the tasks by slack
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import imitator_utilities as iu
+
+# The JSON scheduling-model generator
+json_parser = iu.load_script('json-parser-both.py', 'json_parser_both')
+
+
+# ************************************************************
+# FUNCTIONS
+# ************************************************************
+
+def load_task_set(input_file):
+    with open(input_file) as f:
+        data = json.load(f)
+    return json_parser.create_cpus(data['CPUS']), json_parser.create_pipelines(data['PIPELINES'])
+
+
+# Run IMITATOR for one subset of parametric tasks; returns the entry of the report
+def run_job(cpu_list, pipeline_list, tid_list, args, keep_dir):
+    name = 'wcet_' + '_'.join(str(tid) for tid in tid_list)
+    model_text = ''.join(json_parser.imitator_model(cpu_list, pipeline_list, tid_list, args.prune))
+
+    sandbox_dir = iu.create_sandbox(prefix='wcet_sweep_')
+    try:
+        execution = iu.run_imitator(sandbox_dir, name, model_text=model_text, property_text=json_parser.SCHEDULABILITY_PROPERTY, binary=args.imitator, timeout=args.timeout)
+        result = execution.result() if execution.status == iu.STATUS_OK else None
+        if keep_dir is not None:
+            for file_name in os.listdir(sandbox_dir):
+                shutil.copy(os.path.join(sandbox_dir, file_name), keep_dir)
+    finally:
+        shutil.rmtree(sandbox_dir)
+
+    entry = {
+        'tasks': tid_list,
+        'status': execution.status,
+        'wall_time': round(execution.wall_time, 3),
+    }
+    if execution.status == iu.STATUS_FAILED:
+        entry['error'] = (execution.stderr or '').strip()[-500:]
+    if result is not None:
+        entry['constraint'] = result['constraint']
+        entry['soundness'] = result['soundness']
+        entry['total_time'] = result['total_time']
+    print('[%s] %s (%.1f s)' % (', '.join(str(tid) for tid in tid_list), execution.status, execution.wall_time), flush=True)
+    return entry
+
+
+# Slack of a task: how much its WCET can grow from its nominal value with the other parametric WCETs at their nominal values, while remaining in the constraint
+# Returns None if the task set is not schedulable at the nominal WCETs, and float('inf') if the WCET can grow unboundedly
+def compute_slack(constraint, task, nominal_valuation):
+    parameter = 'C_task_' + str(task.id)
+    wcet = nominal_valuation[parameter]
+    intervals = [interval for interval in (iu.parameter_interval(disjunct, parameter, nominal_valuation) for disjunct in constraint) if interval is not None]
+
+    # Grow from the nominal WCET through the (closed) intervals containing the current bound
+    current = None
+    if any((lower is None or lower <= wcet) and (upper is None or wcet <= upper) for lower, upper in intervals):
+        current = wcet
+    if current is None:
+        return None
+    extended = True
+    while extended:
+        extended = False
+        for lower, upper in intervals:
+            if (lower is None or lower <= current) and (upper is None or upper > current):
+                if upper is None:
+                    return float('inf')
+                current = upper
+                extended = True
+    return float(current - wcet)
+
+
+# Compute the slack of each task of each run, and the ranking of the tasks by their smallest slack
+def rank_tasks(entries, tasks_by_id):
+    slacks = {}
+    for entry in entries:
+        if entry.get('constraint') is None:
+            continue
+        try:
+            constraint = iu.parse_constraint(entry['constraint'])
+        except iu.ConstraintParseError as e:
+            entry['parse_error'] = str(e)
+            continue
+        nominal_valuation = {'C_task_' + str(tid): tasks_by_id[tid].wcet for tid in entry['tasks']}
+        entry['slack'] = {}
+        for tid in entry['tasks']:
+            slack = compute_slack(constraint, tasks_by_id[tid], nominal_valuation)
+            entry['slack'][str(tid)] = slack_to_json(slack)
+            slacks.setdefault(tid, []).append(slack)
+
+    ranking = []
+    for tid, task_slacks in slacks.items():
+        # NOTE: an unschedulable nominal valuation counts as the smallest slack
+        smallest = min(task_slacks, key=lambda slack: float('-inf') if slack is None else slack)
+        ranking.append((tid, smallest, len(task_slacks)))
+    ranking.sort(key=lambda row: float('-inf') if row[1] is None else row[1])
+    return [{'task': tid, 'wcet': tasks_by_id[tid].wcet, 'min_slack': slack_to_json(slack), 'runs': nb_runs} for tid, slack, nb_runs in ranking]
+
+
+def slack_to_json(slack):
+    if slack is None:
+        return 'unschedulable'
+    if slack == float('inf'):
+        return 'unbounded'
+    return slack
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Parametric-WCET sensitivity sweep for a JSON task set')
+    parser.add_argument('inputfile', help='The JSON task set')
+    parser.add_argument('--tasks', type=int, nargs='+', help='Ids of the tasks to consider (default: all)')
+    parser.add_argument('--size', type=int, default=2, help='Number of parametric WCETs in each run (default: 2)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Maximum number of concurrent IMITATOR runs (default: number of CPUs)')
+    parser.add_argument('--timeout', type=float, default=None, help='Time limit for each IMITATOR run (in seconds)')
+    parser.add_argument('--imitator', default=None, help='IMITATOR binary (default: bin/imitator, else from the PATH)')
+    parser.add_argument('--prune', action='store_true', help='Only generate the reachable ready sets of the processors')
+    parser.add_argument('--keep', default=None, help='Directory in which to keep the models and the result files')
+    parser.add_argument('--output', default=None, help='Report file (JSON; default: <inputfile>-wcet-sweep.json)')
+    args = parser.parse_args()
+
+    cpu_list, pipeline_list = load_task_set(args.inputfile)
+    tasks_by_id = {task.id: task for pipeline in pipeline_list for task in pipeline.task_list}
+
+    tids = args.tasks if args.tasks else sorted(tasks_by_id)
+    unknown = [tid for tid in tids if tid not in tasks_by_id]
+    if unknown:
+        print('Unknown task(s): ' + ', '.join(str(tid) for tid in unknown))
+        sys.exit(1)
+    if not 1 <= args.size <= len(tids):
+        print('The size of the subsets must be between 1 and the number of tasks')
+        sys.exit(1)
+
+    subsets = [list(subset) for subset in itertools.combinations(tids, args.size)]
+    print('%d run(s) with %d worker(s)' % (len(subsets), args.jobs))
+
+    if args.keep is not None:
+        os.makedirs(args.keep, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        entries = list(executor.map(lambda subset: run_job(cpu_list, pipeline_list, subset, args, args.keep), subsets))
+
+    ranking = rank_tasks(entries, tasks_by_id)
+
+    output = args.output or os.path.splitext(args.inputfile)[0] + '-wcet-sweep.json'
+    with open(output, 'w') as f:
+        json.dump({'input': args.inputfile, 'size': args.size, 'ranking': ranking, 'runs': entries}, f, indent=1)
+
+    print('')
+    print('task; WCET; smallest slack; runs')
+    for row in ranking:
+        print('%s; %s; %s; %s' % (row['task'], row['wcet'], row['min_slack'], row['runs']))
+    print('Report written to ' + output)
+
+
+__main__()
@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: Benchmark of the scaling of model parsing and converting (imitator -mode checksyntax) along separate dimensions of the model: number of automata, locations per automaton, length of guards, number of discrete variables, depth of expressions
+#
+# File contributors : Étienne André
+# Created           : 2026/10/18
+# Last modified     : 2026/10/18
+# ************************************************************
+
+import argparse
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Phases timed by IMITATOR (with -statistics): key => name of the counter
+PHASES = {
+    'parsing': 'model parsing',
+    'converting': 'model converting',
+}
+
+
+# ************************************************************
+# MODELS
+# ************************************************************
+
+# Model with the given declarations, automata (list of (name, list of locations)) and initial discrete assignments
+def make_model(declarations, automata, discrete_init=()):
+    text = 'var\n' + declarations + '\n'
+    for name, locations in automata:
+        text += '\nautomaton ' + name + '\n' + ''.join(locations) + 'end\n'
+    text += '\ninit := {\n\tdiscrete =\n'
+    text += ''.join('\t\tloc[' + name + '] := ' + name + '_l0,\n' for name, _ in automata)
+    text += ''.join('\t\t' + assignment + ',\n' for assignment in discrete_init)
+    text += '\t;\n\tcontinuous =\n\t\t& x = 0\n\t\t& p >= 0\n\t;\n}\n\nend\n'
+    return text
+
+
+CLOCK_AND_PARAMETER = '\tx : clock;\n\tp : parameter;\n'
+
+
+def location(automaton, k, invariant, transitions):
+    return 'loc ' + automaton + '_l' + str(k) + ': invariant ' + invariant + '\n' + ''.join('\t' + transition + '\n' for transition in transitions)
+
+
+# n automata with two locations
+def model_automata(n):
+    automata = []
+    for a in range(n):
+        name = 'a' + str(a)
+        automata.append((name, [
+            location(name, 0, 'x <= p', ['when x >= ' + str(a % 10) + ' goto ' + name + '_l1;']),
+            location(name, 1, 'True', []),
+        ]))
+    return make_model(CLOCK_AND_PARAMETER, automata)
+
+
+# One automaton with n locations in a cycle
+def model_locations(n):
+    name = 'a'
+    locations = [location(name, k, 'x <= ' + str(k % 10 + 1), ['when x >= 1 do {x := 0} goto ' + name + '_l' + str((k + 1) % n) + ';']) for k in range(n)]
+    return make_model(CLOCK_AND_PARAMETER, [(name, locations)])
+
+
+# One transition guarded by a conjunction of n linear inequalities
+def model_guard(n):
+    guard = ' & '.join(('x >= ' if k % 2 == 0 else 'x + p >= ') + str(k % 10) for k in range(n))
+    name = 'a'
+    return make_model(CLOCK_AND_PARAMETER, [(name, [location(name, 0, 'True', ['when ' + guard + ' goto a_l1;']), location(name, 1, 'True', [])])])
+
+
+# n discrete variables, each initialized and updated
+def model_discretes(n):
+    names = ['d' + str(k) for k in range(n)]
+    declarations = CLOCK_AND_PARAMETER + '\t' + ', '.join(names) + ' : int;\n'
+    updates = ', '.join(name + ' := ' + name + ' + 1' for name in names)
+    name = 'a'
+    return make_model(declarations, [(name, [location(name, 0, 'True', ['when x >= 1 do {' + updates + '} goto a_l1;']), location(name, 1, 'True', [])])], [name + ' := 0' for name in names])
+
+
+# One update with an arithmetic expression of depth n
+def model_depth(n):
+    expression = 'd'
+    for k in range(n):
+        expression = '(' + expression + (' + 1' if k % 2 == 0 else ' * 1') + ')'
+    name = 'a'
+    declarations = CLOCK_AND_PARAMETER + '\td : int;\n'
+    return make_model(declarations, [(name, [location(name, 0, 'True', ['when x >= 1 do {d := ' + expression + '} goto a_l1;']), location(name, 1, 'True', [])])], ['d := 0'])
+
+
+DIMENSIONS = {
+    'automata': model_automata,
+    'locations': model_locations,
+    'guard': model_guard,
+    'discretes': model_discretes,
+    'depth': model_depth,
+}
+
+
+# ************************************************************
+# TIMING
+# ************************************************************
+
+def create_sandbox():
+    return tempfile.mkdtemp(prefix='benchmark_parser_scaling_')
+
+
+# Check the syntax of a model; returns a dictionary with the wall time and the times of the phases, or None on error or timeout
+def check_syntax(sandbox_dir, binary, model_text, timeout):
+    model_file = os.path.join(sandbox_dir, 'model.imi')
+    with open(model_file, 'w') as f:
+        f.write(model_text)
+    start = time.time()
+    try:
+        result = subprocess.run([binary, model_file, '-mode', 'checksyntax', '-statistics'], cwd=sandbox_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    wall_time = time.time() - start
+    if result.returncode != 0 or 'ERROR' in result.stderr:
+        print(result.stderr.strip()[-500:])
+        return None
+    times = {'wall': wall_time}
+    for phase, counter in PHASES.items():
+        m = re.search('^' + counter + r'\s*:\s*([0-9.]+) second', result.stdout + result.stderr, re.MULTILINE)
+        times[phase] = float(m.group(1)) if m else None
+    return times
+
+
+# Best (smallest) times of several runs
+def best_times(sandbox_dir, binary, model_text, timeout, repeat):
+    runs = []
+    for _ in range(repeat):
+        times = check_syntax(sandbox_dir, binary, model_text, timeout)
+        if times is None:
+            return None
+        runs.append(times)
+    return {key: min((run[key] for run in runs if run[key] is not None), default=None) for key in runs[0]}
+
+
+# Degree b of the fit time = a * n^b (least squares in log-log scale), or None if fewer than 3 points
+def fitted_degree(points):
+    points = [(n, t) for n, t in points if t is not None and t > 0]
+    if len(points) < 3:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+
+def format_time(value):
+    return '-' if value is None else '%.3f' % value
+
+
+# ************************************************************
+# MAIN
+# ************************************************************
+
+def __main__():
+    parser = argparse.ArgumentParser(description='Benchmark of the scaling of model parsing and converting (imitator -mode checksyntax)')
+    parser.add_argument('--imitator', default='imitator', help='IMITATOR binary (default: imitator)')
+    parser.add_argument('--dimensions', nargs='+', choices=sorted(DIMENSIONS), default=sorted(DIMENSIONS), help='Dimensions to benchmark (default: all)')
+    parser.add_argument('--min-size', type=int, default=64, help='Smallest size (default: 64)')
+    parser.add_argument('--max-size', type=int, default=4096, help='Largest size; the sizes double from the smallest one (default: 4096)')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs of each model; the best time is kept (default: 3)')
+    parser.add_argument('--timeout', type=float, default=60, help='Time limit for each run, in seconds (default: 60)')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Degree above which the cost is reported as superlinear (default: 1.2)')
+    args = parser.parse_args()
+
+    sizes = []
+    size = args.min_size
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 2
+
+    sandbox_dir = create_sandbox()
+    superlinear = []
+    try:
+        # Startup latency: smallest model
+        startup = best_times(sandbox_dir, args.imitator, model_automata(1), args.timeout, args.repeat)
+        if startup is None:
+            print('Could not run ' + args.imitator)
+            sys.exit(1)
+        print('Startup latency (1 automaton): %s s' % format_time(startup['wall']))
+
+        for dimension in args.dimensions:
+            print('')
+            print('Dimension: ' + dimension)
+            print('size; wall (s); parsing (s); converting (s); model size (bytes)')
+            points = {key: [] for key in ['wall'] + list(PHASES)}
+            for size in sizes:
+                model_text = DIMENSIONS[dimension](size)
+                times = best_times(sandbox_dir, args.imitator, model_text, args.timeout, args.repeat)
+                if times is None:
+                    print('%d; failed or timed out' % size)
+                    break
+                print('%d; %s; %s; %s; %d' % (size, format_time(times['wall']), format_time(times['parsing']), format_time(times['converting']), len(model_text)))
+                # NOTE: the startup latency is not part of the scaling of the wall time
+                points['wall'].append((size, times['wall'] - startup['wall']))
+                for phase in PHASES:
+                    points[phase].append((size, times[phase]))
+            for key, phase_points in points.items():
+                degree = fitted_degree(phase_points)
+                if degree is None:
+                    continue
+                print('  %s: time ~ n^%.2f' % (key, degree))
+                if degree > args.threshold:
+                    superlinear.append((dimension, key, degree))
+    finally:
+        shutil.rmtree(sandbox_dir)
+
+    print('')
+    if not superlinear:
+        print('No superlinear cost detected')
+    for dimension, key, degree in superlinear:
+        print('SUPERLINEAR: %s (%s): time ~ n^%.2f' % (dimension, key, degree))
+
+
+__main__()
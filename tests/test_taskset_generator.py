@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# ************************************************************
+#
+#                       IMITATOR
+#
+# Université Paris 13, LIPN, CNRS, France
+# Université de Lorraine, CNRS, Inria, LORIA, Nancy, France
+#
+# Script description: Test of scripts/taskset-generator.py: the IMITATOR files of several task sets generated in the current directory do not overwrite each other
+#
+# File contributors : Étienne André
+# Created           : 2026/10/19
+# Last modified     : 2026/10/19
+# ************************************************************
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts', 'taskset-generator.py')
+
+
+def test_two_task_sets_in_current_directory():
+    directory = tempfile.mkdtemp(prefix='imitator_taskset_')
+    try:
+        subprocess.run([sys.executable, GENERATOR, '--count', '2', '--imitator'], cwd=directory, check=True, stdout=subprocess.DEVNULL)
+        for index in range(2):
+            for extension in ['.json', '.imi', '.v0']:
+                file_name = os.path.join(directory, 'taskset_%d%s' % (index, extension))
+                assert os.path.isfile(file_name), 'missing ' + file_name
+        # NOTE: the files cut at the first dot of './taskset_0'
+        assert not os.path.exists(os.path.join(directory, '.imi'))
+        assert not os.path.exists(os.path.join(directory, '.v0'))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    test_two_task_sets_in_current_directory()
+    print('OK')